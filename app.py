@@ -1,13 +1,59 @@
-from flask import Flask, request, jsonify
-import joblib
-import pandas as pd
+from flask import Flask, Response, g, request, jsonify
+import json
+import os
+import time
+
+from utils.metrics import METRICS_ENABLED, count, observe, render_prometheus, timer
+from utils.micro_batcher import MicroBatcher
+from utils.prediction_cache import get_cache
+from utils.serving import (
+    batch_error, load_artifacts, predict_record, prediction_response, score_records
+)
 
 app = Flask(__name__)
 
-# Load artifacts
-model = joblib.load("data/churn_model.pkl")
-scaler = joblib.load("data/scaler.pkl")
-model_columns = joblib.load("data/model_columns.pkl")
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+
+# Optional micro-batching of concurrent /predict calls
+MICRO_BATCHING = os.environ.get("CHURN_MICRO_BATCHING", "0") == "1"
+MICRO_BATCH_MAX_SIZE = int(os.environ.get("CHURN_MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.environ.get("CHURN_MICRO_BATCH_MAX_WAIT_MS", "5"))
+
+# Load artifacts at startup (see utils/serving.py, shared with asgi_app.py)
+load_artifacts()
+
+
+def read_batch_records():
+
+    if request.mimetype in NDJSON_MIMETYPES:
+        lines = request.get_data(as_text=True).splitlines()
+        return [json.loads(line) for line in lines if line.strip()]
+
+    payload = request.get_json()
+    if isinstance(payload, dict):
+        return payload.get("records")
+    return payload
+
+
+batcher = (
+    MicroBatcher(score_records, MICRO_BATCH_MAX_SIZE, MICRO_BATCH_MAX_WAIT_MS)
+    if MICRO_BATCHING else None
+)
+
+# Whole-request latency and request / byte counters per route
+if METRICS_ENABLED:
+
+    @app.before_request
+    def start_timer():
+        g.request_start = time.perf_counter()
+
+    @app.after_request
+    def record_request(response):
+        route = request.endpoint or "unknown"
+        observe(f"api.request.{route}", time.perf_counter() - g.request_start)
+        count("requests", route=route, status=response.status_code)
+        count("bytes_ingested", request.content_length or 0, source="api")
+        return response
 
 @app.route("/")
 def home():
@@ -16,33 +62,65 @@ def home():
 @app.route("/predict", methods=["POST"])
 def predict():
 
-    data = request.get_json()
+    with timer("api.parse"):
+        data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Body must be a JSON object"}), 400
+
+    # Coalesce with other in-flight requests when micro-batching is on
+    if batcher is not None:
+        prediction, probability = batcher.predict(data)
+    else:
+        prediction, probability = predict_record(data)
 
-    # Convert incoming JSON to DataFrame
-    input_df = pd.DataFrame([data])
+    return jsonify(prediction_response(prediction, probability))
 
-    # Apply same dummy encoding
-    input_df = pd.get_dummies(input_df)
+@app.route("/predict_batch", methods=["POST"])
+def predict_batch():
 
-    # Add missing columns
-    for col in model_columns:
-        if col not in input_df.columns:
-            input_df[col] = 0
+    try:
+        with timer("api.parse"):
+            records = read_batch_records()
+    except ValueError:
+        return jsonify({"error": "Body must be JSON or newline-delimited JSON"}), 400
 
-    # Ensure same column order
-    input_df = input_df[model_columns]
+    error = batch_error(records)
+    if error is not None:
+        return jsonify({"error": error[0]}), error[1]
 
-    # Scale
-    input_scaled = scaler.transform(input_df)
+    if not records:
+        return jsonify({"predictions": []})
 
-    # Predict
-    prediction = model.predict(input_scaled)[0]
-    probability = model.predict_proba(input_scaled)[0][1]
+    labels, probabilities = score_records(records)
 
     return jsonify({
-        "churn_prediction": int(prediction),
-        "churn_probability": float(probability)
+        "predictions": [
+            prediction_response(label, probability)
+            for label, probability in zip(labels, probabilities)
+        ]
     })
 
+@app.route("/batching_stats")
+def batching_stats():
+
+    if batcher is None:
+        return jsonify({"micro_batching": False})
+
+    return jsonify({"micro_batching": True, **batcher.stats()})
+
+@app.route("/cache_stats")
+def cache_stats():
+
+    prediction_cache = get_cache("api")
+    if prediction_cache is None:
+        return jsonify({"prediction_cache": False})
+
+    return jsonify({"prediction_cache": True, **prediction_cache.stats()})
+
+@app.route("/metrics")
+def metrics():
+    # Prometheus text exposition format
+    return Response(render_prometheus(), mimetype="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,246 @@
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, PlainTextResponse, Response
+from starlette.routing import Route
+
+from utils.metrics import METRICS_ENABLED, count, observe, render_prometheus, timer
+from utils.model_registry import model_info
+from utils.prediction_cache import get_cache
+from utils.serving import (
+    MODEL_PATH, artifacts_version, batch_error, load_artifacts, predict_record,
+    prediction_response, score_records
+)
+
+# ==============================
+# ASYNC PREDICTION API (ASGI)
+# ==============================
+# Same /predict and /predict_batch contract as app.py, for production
+# serving:  uvicorn asgi_app:app --host 0.0.0.0 --port 8000 --workers 4
+# (or python asgi_app.py).
+#   - request bodies are read and parsed on the event loop; encoding and
+#     the forest run in a bounded thread pool, so parsing of new requests
+#     overlaps with scoring of earlier ones (NumPy and sklearn's tree
+#     traversal release the GIL)
+#   - backpressure: at most MAX_IN_FLIGHT scoring requests are admitted
+#     per worker process; beyond that the API answers 503 with
+#     Retry-After at once instead of queueing without bound
+#   - artifacts load in the background at startup: /healthz answers as
+#     soon as the process is up, /readyz only once the model is loaded
+#     (point the load balancer's readiness probe there)
+
+INFERENCE_THREADS = int(
+    os.environ.get("CHURN_INFERENCE_THREADS", str(min(os.cpu_count() or 1, 8)))
+)
+MAX_IN_FLIGHT = int(os.environ.get("CHURN_MAX_IN_FLIGHT", "64"))
+RETRY_AFTER_SECONDS = 1
+
+HOST = os.environ.get("CHURN_API_HOST", "127.0.0.1")
+PORT = int(os.environ.get("CHURN_API_PORT", "8000"))
+WORKERS = int(os.environ.get("CHURN_API_WORKERS", "1"))
+
+NDJSON_MIMETYPES = ("application/x-ndjson", "application/jsonl")
+
+executor = ThreadPoolExecutor(max_workers=INFERENCE_THREADS, thread_name_prefix="inference")
+
+state = {"ready": False, "loading": False, "error": None, "in_flight": 0, "rejected": 0}
+
+
+# ==============================
+# STARTUP / ADMISSION
+# ==============================
+def _load():
+    try:
+        load_artifacts()
+        state["ready"], state["error"] = True, None
+    except Exception as exc:
+        state["error"] = f"{type(exc).__name__}: {exc}"
+    finally:
+        state["loading"] = False
+
+
+def _start_loading():
+    # Off the event loop; a failed load is retried by the next /readyz probe
+    if not state["loading"]:
+        state["loading"] = True
+        asyncio.get_running_loop().run_in_executor(executor, _load)
+
+
+@asynccontextmanager
+async def lifespan(app):
+    _start_loading()
+    yield
+    executor.shutdown(wait=False)
+
+
+def _unavailable(route):
+    if not state["ready"]:
+        return JSONResponse({"error": state["error"] or "Model is loading"}, status_code=503)
+    if state["in_flight"] >= MAX_IN_FLIGHT:
+        state["rejected"] += 1
+        count("requests_rejected", route=route)
+        return JSONResponse(
+            {"error": "Server is at capacity, retry shortly"}, status_code=503,
+            headers={"Retry-After": str(RETRY_AFTER_SECONDS)}
+        )
+    return None
+
+
+def _admitted(route, handler):
+
+    # A request holds its in-flight slot from admission until its response,
+    # body upload and 400s included. The check and the increment have no
+    # await between them, so on the event loop's single thread they need
+    # no lock
+    async def endpoint(request):
+        rejected = _unavailable(route)
+        if rejected is not None:
+            return rejected
+        state["in_flight"] += 1
+        try:
+            return await handler(request)
+        finally:
+            state["in_flight"] -= 1
+
+    return endpoint
+
+
+async def _score(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+
+
+def _observed(route, handler):
+
+    # Whole-request latency and request / byte counters, as in app.py
+    if not METRICS_ENABLED:
+        return handler
+
+    async def endpoint(request):
+        start = time.perf_counter()
+        response = await handler(request)
+        observe(f"api.request.{route}", time.perf_counter() - start)
+        count("requests", route=route, status=response.status_code)
+        count("bytes_ingested", int(request.headers.get("content-length", 0)), source="api")
+        return response
+
+    return endpoint
+
+
+# ==============================
+# ROUTES
+# ==============================
+async def home(request):
+    return PlainTextResponse("Churn Prediction API is Running!")
+
+
+async def predict(request):
+
+    try:
+        with timer("api.parse"):
+            data = json.loads(await request.body())
+    except ValueError:
+        return JSONResponse({"error": "Body must be a JSON object"}, status_code=400)
+    if not isinstance(data, dict):
+        return JSONResponse({"error": "Body must be a JSON object"}, status_code=400)
+
+    prediction, probability = await _score(predict_record, data)
+    return JSONResponse(prediction_response(prediction, probability))
+
+
+async def predict_batch(request):
+
+    body = await request.body()
+    try:
+        with timer("api.parse"):
+            if request.headers.get("content-type", "").split(";")[0] in NDJSON_MIMETYPES:
+                records = [json.loads(line) for line in body.decode().splitlines() if line.strip()]
+            else:
+                records = json.loads(body)
+                if isinstance(records, dict):
+                    records = records.get("records")
+    except ValueError:
+        return JSONResponse(
+            {"error": "Body must be JSON or newline-delimited JSON"}, status_code=400
+        )
+
+    error = batch_error(records)
+    if error is not None:
+        return JSONResponse({"error": error[0]}, status_code=error[1])
+
+    if not records:
+        return JSONResponse({"predictions": []})
+
+    labels, probabilities = await _score(score_records, records)
+
+    return JSONResponse({
+        "predictions": [
+            prediction_response(label, probability)
+            for label, probability in zip(labels, probabilities)
+        ]
+    })
+
+
+async def healthz(request):
+    # Liveness: the event loop is answering
+    return JSONResponse({"status": "ok"})
+
+
+async def readyz(request):
+
+    # Readiness: artifacts loaded and requests being admitted
+    if not state["ready"]:
+        if state["error"]:
+            _start_loading()
+        return JSONResponse(
+            {"ready": False, "error": state["error"] or "Model is loading"}, status_code=503
+        )
+
+    info = model_info(MODEL_PATH)
+    return JSONResponse({
+        "ready": True,
+        "model_version": artifacts_version(),
+        "model_loaded_at": info[0]["loaded_at"] if info else None,
+        "in_flight": state["in_flight"],
+        "max_in_flight": MAX_IN_FLIGHT,
+        "rejected": state["rejected"]
+    })
+
+
+async def cache_stats(request):
+
+    prediction_cache = get_cache("api")
+    if prediction_cache is None:
+        return JSONResponse({"prediction_cache": False})
+
+    return JSONResponse({"prediction_cache": True, **prediction_cache.stats()})
+
+
+async def metrics(request):
+    # Prometheus text exposition format
+    return Response(render_prometheus(), media_type="text/plain; version=0.0.4")
+
+
+app = Starlette(
+    routes=[
+        Route("/", home),
+        Route("/predict", _observed("predict", _admitted("predict", predict)),
+              methods=["POST"]),
+        Route("/predict_batch",
+              _observed("predict_batch", _admitted("predict_batch", predict_batch)),
+              methods=["POST"]),
+        Route("/healthz", healthz),
+        Route("/readyz", readyz),
+        Route("/cache_stats", cache_stats),
+        Route("/metrics", metrics)
+    ],
+    lifespan=lifespan
+)
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("asgi_app:app", host=HOST, port=PORT, workers=WORKERS, log_level="warning")
@@ -0,0 +1,138 @@
+import sys
+import time
+import warnings
+import numpy as np
+import pandas as pd
+
+from sklearn.preprocessing import StandardScaler
+
+sys.path.append(".")
+from benchmarks.synthetic import make_telco_customers
+from utils.encoding import CompiledEncoder, build_column_index, encode_records
+from utils.telco_data import clean_telco
+
+# ==============================
+# API FEATURE ENCODING BENCHMARK
+# The /predict encoding paths on Telco-shaped artifacts (model_columns and
+# scaler built as src/churn_model.py builds them):
+#   get_dummies  the old per-request path (get_dummies, add each missing
+#                column, reindex, scaler.transform)
+#   vectorized   encode_records + scaler.transform (the old batch path)
+#   compiled     CompiledEncoder, scaled straight into a NumPy row
+# Asserts all three give exactly the same matrix on API-style, full,
+# unknown and malformed records, then reports per-request latency and
+# batch rows/sec.
+# Run from the repo root: python benchmarks/bench_api_encoding.py [CALLS]
+# ==============================
+
+TELCO_ROWS = 7_043
+LEGACY_CALLS = 5
+PARITY_ROWS = 8
+BATCH_SIZES = [1, 100, 10_000]
+
+API_FIELDS = [
+    "Tenure Months", "Monthly Charges", "Total Charges",
+    "Contract", "Internet Service", "Payment Method"
+]
+
+DROP_COLUMNS = ["CustomerID", "Churn Label", "Churn Reason", "Churn Value", "Churn Score", "CLTV"]
+
+
+def legacy_encode(data, model_columns, scaler):
+
+    input_df = pd.DataFrame([data])
+    input_df = pd.get_dummies(input_df)
+    for col in model_columns:
+        if col not in input_df.columns:
+            input_df[col] = 0
+    input_df = input_df[model_columns]
+    return scaler.transform(input_df)
+
+
+def vectorized_encode(records, model_columns, index, scaler):
+    X = encode_records(records, index)
+    return scaler.transform(pd.DataFrame(X, columns=model_columns))
+
+
+def median_ms(fn, calls):
+    fn()
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+if __name__ == "__main__":
+
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    warnings.simplefilter("ignore")   # get_dummies path: fragmented-frame warnings
+
+    telco = clean_telco(make_telco_customers(TELCO_ROWS)).dropna(subset=["Total Charges"])
+    X = pd.get_dummies(telco.drop(columns=DROP_COLUMNS), drop_first=True).drop(columns="Churn")
+    model_columns = X.columns.tolist()
+    scaler = StandardScaler().fit(X)
+    print(f"{len(model_columns):,} model columns")
+
+    encoder = CompiledEncoder(model_columns, scaler)
+    index = build_column_index(model_columns)
+
+    # ==============================
+    # PARITY
+    # ==============================
+    sample = make_telco_customers(PARITY_ROWS, seed=7).drop(columns=DROP_COLUMNS)
+    sample["Total Charges"] = pd.to_numeric(sample["Total Charges"], errors="coerce").fillna(0)
+    cases = {
+        "api fields": sample[API_FIELDS].to_dict("records"),
+        "full record": sample.to_dict("records"),
+        "unknown values": [
+            {"Contract": "Three year", "Tenure Months": 3, "Referrer": "partner"},
+            {"Internet Service": "Satellite", "Monthly Charges": 20.5}
+        ],
+        "missing / odd": [
+            {"Partner": "Yes"},
+            {"Tenure Months": None, "Contract": "One year"},
+            {"Tenure Months": True, "Monthly Charges": 0}
+        ]
+    }
+
+    print(f"\n{'case':>16}{'records':>9}  max |diff| vs get_dummies (vectorized, compiled)")
+    for name, records in cases.items():
+        expected = np.vstack([legacy_encode(r, model_columns, scaler) for r in records])
+        vectorized = vectorized_encode(records, model_columns, index, scaler)
+        compiled = encoder.encode(records)
+        single = np.vstack([encoder.encode_one(r).copy() for r in records])
+        # Bit-for-bit: every path must give the get_dummies matrix exactly
+        assert np.array_equal(vectorized, expected), f"{name}: vectorized differs from get_dummies"
+        assert np.array_equal(compiled, expected), f"{name}: compiled differs from get_dummies"
+        assert np.array_equal(single, expected), f"{name}: encode_one differs from get_dummies"
+        print(f"{name:>16}{len(records):>9}  "
+              f"{np.abs(vectorized - expected).max():.1e}, {np.abs(compiled - expected).max():.1e}")
+
+    # ==============================
+    # LATENCY
+    # ==============================
+    record = cases["api fields"][0]
+    print("\nPer-request encode + scale (median):")
+    legacy = median_ms(lambda: legacy_encode(record, model_columns, scaler), LEGACY_CALLS)
+    vectorized = median_ms(lambda: vectorized_encode([record], model_columns, index, scaler), calls)
+    compiled = median_ms(lambda: encoder.encode_one(record), calls)
+    print(f"  get_dummies {legacy:>10.3f} ms")
+    print(f"  vectorized  {vectorized:>10.3f} ms")
+    print(f"  compiled    {compiled:>10.3f} ms  ({legacy / compiled:,.0f}x faster than get_dummies)")
+
+    start = time.perf_counter()
+    CompiledEncoder(model_columns, scaler)
+    print(f"  (compiling the encoder: {(time.perf_counter() - start) * 1000:.1f} ms, once per artifact)")
+
+    records = make_telco_customers(max(BATCH_SIZES), seed=11)[API_FIELDS]
+    records["Total Charges"] = pd.to_numeric(records["Total Charges"], errors="coerce").fillna(0)
+    records = records.to_dict("records")
+    print(f"\n{'batch':>8}{'vectorized rows/s':>20}{'compiled rows/s':>18}")
+    for n in BATCH_SIZES:
+        batch = records[:n]
+        runs = max(3, 1_000 // n)
+        v = median_ms(lambda: vectorized_encode(batch, model_columns, index, scaler), runs)
+        c = median_ms(lambda: encoder.encode(batch), runs)
+        print(f"{n:>8,}{n / v * 1000:>20,.0f}{n / c * 1000:>18,.0f}")
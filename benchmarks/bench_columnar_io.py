@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import tempfile
+import joblib
+
+sys.path.append(".")
+from benchmarks.synthetic import make_saas_customers, train_saas_pipeline
+
+# ==============================
+# CSV vs COLUMNAR I/O BENCHMARK
+# Wall time and peak RSS for the same 1M-customer file as CSV, Parquet and
+# Feather: reading the seven scoring columns (dashboard path) and the full
+# streamed bulk scoring run, input format in -> same format out (CSV for
+# Feather, which is not streamed). Each run is a fresh process, so peak RSS
+# is that run's own.
+# Run from the repo root: python benchmarks/bench_columnar_io.py [ROWS]
+# Linux only (reads VmHWM from /proc/self/status).
+# ==============================
+
+N_ESTIMATORS = 50
+
+RUNNER = """
+import sys, time
+import joblib
+sys.path.append(".")
+from utils.columnar import read_frame, total_rows
+from utils.schema import REQUIRED_COLUMNS, compact, validate
+from utils.scoring import score_file_in_chunks
+mode, path, fmt, model_path, out_path = sys.argv[1:6]
+start = time.perf_counter()
+if mode == "read":
+    df = compact(validate(read_frame(path, fmt, REQUIRED_COLUMNS))[0])
+    rows = len(df)
+else:
+    out_fmt = "csv" if fmt == "feather" else fmt
+    rows = score_file_in_chunks(
+        path, joblib.load(model_path), out_path, input_format=fmt,
+        output_format=out_fmt, total_rows=total_rows(path, fmt)
+    )["rows"]
+seconds = time.perf_counter() - start
+# VmHWM, not ru_maxrss: the latter carries over the parent's peak on fork
+peak_kb = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")][0]
+print(rows, seconds, int(peak_kb) / 1024)
+"""
+
+
+def run(mode, path, fmt, model_path, out_path):
+    output = subprocess.run(
+        [sys.executable, "-c", RUNNER, mode, path, fmt, model_path, out_path],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return int(output[0]), float(output[1]), float(output[2])
+
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Generating {n_rows:,} customers and a {N_ESTIMATORS}-tree model...")
+    df = make_saas_customers(n_rows)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "pipeline.pkl")
+        joblib.dump(train_saas_pipeline(df.head(50_000), N_ESTIMATORS), model_path)
+
+        paths = {
+            "csv": os.path.join(tmp, "customers.csv"),
+            "parquet": os.path.join(tmp, "customers.parquet"),
+            "feather": os.path.join(tmp, "customers.feather")
+        }
+        df.to_csv(paths["csv"], index=False)
+        df.to_parquet(paths["parquet"], index=False)
+        df.to_feather(paths["feather"])
+        del df
+
+        print(f"\n{'format':>8}{'file MB':>9}{'read s':>8}{'read MB':>9}"
+              f"{'score s':>9}{'score MB':>10}{'rows/s':>11}")
+
+        for fmt, path in paths.items():
+            _, read_s, read_mb = run("read", path, fmt, model_path, "")
+            rows, score_s, score_mb = run(
+                "score", path, fmt, model_path, os.path.join(tmp, f"scored.{fmt}")
+            )
+            print(f"{fmt:>8}{os.path.getsize(path) / 1e6:>9.1f}{read_s:>8.2f}{read_mb:>9.0f}"
+                  f"{score_s:>9.2f}{score_mb:>10.0f}{rows / score_s:>11,.0f}")
@@ -0,0 +1,102 @@
+import sys
+import time
+import numpy as np
+
+sys.path.append(".")
+from benchmarks.synthetic import FEATURES, make_saas_customers, train_saas_pipeline
+from utils.explain import EXPLAIN_MODES, choose_mode, get_explainer, get_sampled_explainer, shap_values
+from utils.inference import compile_forest
+
+# ==============================
+# EXPLAINER ACCURACY / SPEED BENCHMARK
+# Each explanation mode against exact TreeSHAP on the same rows:
+# explanations/sec, mean absolute error, per-row correlation of the
+# attribution vectors and of their rankings, and how often the top driver /
+# top-3 / top-5 drivers match. Fails when a mode drops below its floors.
+# Run from the repo root: python benchmarks/bench_explainers.py [ROWS]
+# ==============================
+
+TRAIN_ROWS = 20_000
+N_ESTIMATORS = 100
+BUDGET_SECONDS = 10
+
+# Minimum top-5 overlap and rank correlation against exact, per mode
+ACCURACY_FLOORS = {
+    "exact": {"top5": 1.0, "rank_corr": 1.0},
+    "sampled": {"top5": 0.85, "rank_corr": 0.88},
+    "path": {"top5": 0.8, "rank_corr": 0.8},
+}
+
+
+def row_correlation(a, b):
+    a = a - a.mean(axis=1, keepdims=True)
+    b = b - b.mean(axis=1, keepdims=True)
+    denom = np.sqrt((a ** 2).sum(axis=1) * (b ** 2).sum(axis=1))
+    return np.mean((a * b).sum(axis=1) / np.where(denom == 0, 1, denom))
+
+
+def rank_correlation(a, b):
+    # Spearman per row: the correlation of the attribution ranks
+    return row_correlation(
+        np.argsort(np.argsort(a, axis=1), axis=1).astype(float),
+        np.argsort(np.argsort(b, axis=1), axis=1).astype(float)
+    )
+
+
+def top_k_overlap(a, b, k):
+    top_a = np.argsort(-a, axis=1)[:, :k]
+    top_b = np.argsort(-b, axis=1)[:, :k]
+    return np.mean([len(set(x) & set(y)) / k for x, y in zip(top_a, top_b)])
+
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    print(f"Training {N_ESTIMATORS}-tree pipeline on {TRAIN_ROWS:,} rows...")
+    pipeline = train_saas_pipeline(make_saas_customers(TRAIN_ROWS), N_ESTIMATORS)
+    X = make_saas_customers(n_rows, seed=7)[FEATURES]
+
+    # Build cached explainers / flat arrays once, as a warm server would have
+    get_explainer(pipeline)
+    get_sampled_explainer(pipeline)
+    compile_forest(pipeline)
+
+    results = {}
+    for mode in EXPLAIN_MODES:
+        start = time.perf_counter()
+        results[mode] = (shap_values(pipeline, X, mode=mode), time.perf_counter() - start)
+
+    exact = results["exact"][0]
+
+    print(f"\n{n_rows:,} rows")
+    print(
+        f"{'mode':>8}{'seconds':>10}{'rows/s':>10}{'MAE':>10}{'corr':>8}{'rank':>8}"
+        f"{'top-1':>8}{'top-3':>8}{'top-5':>8}"
+    )
+
+    accuracy = {}
+    for mode, (values, seconds) in results.items():
+        accuracy[mode] = {
+            "top5": top_k_overlap(values, exact, 5),
+            "rank_corr": rank_correlation(values, exact),
+        }
+        print(
+            f"{mode:>8}{seconds:>10.3f}{n_rows / seconds:>10,.0f}"
+            f"{np.abs(values - exact).mean():>10.4f}"
+            f"{row_correlation(values, exact):>8.3f}"
+            f"{accuracy[mode]['rank_corr']:>8.3f}"
+            f"{top_k_overlap(values, exact, 1):>8.2f}"
+            f"{top_k_overlap(values, exact, 3):>8.2f}"
+            f"{accuracy[mode]['top5']:>8.2f}"
+        )
+
+    print(f"\nchoose_mode with a {BUDGET_SECONDS}s budget:")
+    for target_rows in [10, 100, 1_000, 100_000]:
+        mode = choose_mode(pipeline, X, BUDGET_SECONDS, n_rows=target_rows)
+        print(f"{target_rows:>9,} rows -> {mode}")
+
+    for mode, floors in ACCURACY_FLOORS.items():
+        for metric, floor in floors.items():
+            value = accuracy[mode][metric]
+            assert value >= floor - 1e-9, f"{mode} {metric} {value:.3f} below floor {floor}"
@@ -0,0 +1,43 @@
+import sys
+
+sys.path.append(".")
+from benchmarks.synthetic import make_saas_customers
+from utils.compression import (
+    compress_model, compression_summary, holdout_summary, serving_report
+)
+from utils.schema import REQUIRED_COLUMNS
+from utils.training import train_in_memory
+
+# ==============================
+# FOREST COMPRESSION BENCHMARK
+# Trains the Bulk Scoring pipeline (300 trees) on synthetic customers,
+# compresses it on the validation rows and compares size, load time,
+# latency and throughput on a separate test set.
+# Run from the repo root: python benchmarks/bench_forest_compression.py [ROWS]
+# ==============================
+
+TEST_ROWS = 50_000
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+    print(f"Training on {n_rows:,} customers...")
+    pipeline, report = train_in_memory(make_saas_customers(n_rows), n_jobs=-1)
+    compressed, table = compress_model(pipeline, *report["validation"])
+
+    print("\nCandidates within tolerance:")
+    print(table[table["within_tolerance"]].round(4).to_string(index=False))
+
+    summary = holdout_summary(
+        compression_summary(table), pipeline, compressed, *report["holdout"]
+    )
+    print(f"\nChosen: {summary['trees']} trees, max depth {summary['max_depth']} "
+          f"(holdout ROC-AUC {summary['auc']:.4f} vs {summary['full_auc']:.4f}, "
+          f"risk level agreement {summary['risk_agreement']:.1%})\n")
+
+    test = make_saas_customers(TEST_ROWS, seed=7)
+    print(serving_report(
+        {"full": pipeline, "compressed": compressed},
+        test[REQUIRED_COLUMNS], test["churn"] == "Yes"
+    ).round(4).to_string(index=False))
@@ -0,0 +1,55 @@
+import sys
+import time
+import numpy as np
+
+sys.path.append(".")
+from benchmarks.synthetic import FEATURES, make_saas_customers, train_saas_pipeline
+from utils.inference import scoring_model
+
+# ==============================
+# INFERENCE BACKEND BENCHMARK
+# sklearn predict_proba vs the flat NumPy forest vs "auto", on a 300-tree
+# SaaS pipeline, at several batch sizes. Also checks the probabilities
+# match sklearn.
+# Run from the repo root: python benchmarks/bench_inference_backends.py
+# ==============================
+
+TRAIN_ROWS = 20_000
+BATCH_SIZES = [1, 10, 100, 1_000, 10_000, 100_000]
+MIN_SECONDS = 1.0
+TOLERANCE = 1e-9
+
+
+def time_per_call(model, X):
+    calls, start = 0, time.perf_counter()
+    while True:
+        model.predict_proba(X)
+        calls += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_SECONDS:
+            return elapsed / calls
+
+
+print(f"Training 300-tree pipeline on {TRAIN_ROWS:,} rows...")
+pipeline = train_saas_pipeline(make_saas_customers(TRAIN_ROWS))
+pipeline.set_params(model__n_jobs=None)  # same single-core setting as the pages
+
+backends = {name: scoring_model(pipeline, name) for name in ["sklearn", "flat", "auto"]}
+
+data = make_saas_customers(max(BATCH_SIZES), seed=7)[FEATURES]
+
+print(f"\n{'batch':>8}" + "".join(f"{name + ' ms':>14}" for name in backends)
+      + f"{'flat rows/s':>14}{'sklearn rows/s':>16}{'max |diff|':>12}")
+
+for n in BATCH_SIZES:
+    X = data.head(n)
+
+    reference = pipeline.predict_proba(X)
+    diff = np.abs(backends["flat"].predict_proba(X) - reference).max()
+    assert diff <= TOLERANCE, f"flat backend differs from sklearn by {diff}"
+
+    seconds = {name: time_per_call(model, X) for name, model in backends.items()}
+
+    print(f"{n:>8,}" + "".join(f"{s * 1000:>14.2f}" for s in seconds.values())
+          + f"{n / seconds['flat']:>14,.0f}{n / seconds['sklearn']:>16,.0f}"
+          f"{diff:>12.1e}")
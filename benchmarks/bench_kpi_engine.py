@@ -0,0 +1,94 @@
+import os
+import subprocess
+import sys
+import tempfile
+import numpy as np
+
+sys.path.append(".")
+from benchmarks.synthetic import make_telco_customers
+
+# ==============================
+# KPI ENGINE BENCHMARK
+# Telco KPIs and risk sets (the src/kpi_analysis.py + src/risk_analysis.py
+# numbers) over a large CSV: the old way (whole file in memory, one pass
+# and one boolean-mask copy per KPI) vs the engine streaming the file in
+# chunks, and the engine over SHARDS shard files in worker processes.
+# Each run is a fresh process; peak RSS is that run's own.
+# Run from the repo root: python benchmarks/bench_kpi_engine.py [ROWS]
+# Linux only (reads VmHWM from /proc/self/status).
+# ==============================
+
+SHARDS = 4
+
+RUNNER = """
+import sys, time
+import pandas as pd
+sys.path.append(".")
+from utils.kpi_engine import aggregate_file, aggregate_files
+mode, paths = sys.argv[1], sys.argv[2:]
+start = time.perf_counter()
+if mode == "pandas":
+    df = pd.read_csv(paths[0])
+    df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
+    df = df.dropna(subset=["Total Charges"])
+    df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
+    high_value = df[df["CLTV"] > df["CLTV"].mean()]
+    high_risk = df[df["Churn Score"] > 80]
+    result = [
+        len(df), df["Total Charges"].sum(), df["Monthly Charges"].sum(),
+        df["Monthly Charges"].mean(), df["Churn"].mean() * 100, len(high_value),
+        len(high_risk), len(high_value[high_value["Churn Score"] > 80])
+    ]
+    df.groupby("Contract")[["Churn", "Monthly Charges", "Total Charges"]].agg(["sum", "mean"])
+    df.groupby("Payment Method")[["Churn", "Monthly Charges", "Total Charges"]].agg(["sum", "mean"])
+else:
+    kpis = aggregate_file(paths[0]) if mode == "engine" else aggregate_files(paths, n_workers=len(paths))
+    result = [kpis[k] for k in [
+        "customers", "total_revenue", "mrr", "arpu", "churn_rate_pct",
+        "high_value_customers", "high_risk_customers", "high_value_high_risk_customers"
+    ]]
+seconds = time.perf_counter() - start
+peak_kb = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")][0]
+print(seconds, int(peak_kb) / 1024, *result)
+"""
+
+
+def run(mode, paths):
+    output = subprocess.run(
+        [sys.executable, "-c", RUNNER, mode, *paths],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), float(output[1]), np.array(output[2:], dtype=float)
+
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    print(f"Generating {n_rows:,} Telco customers...")
+    df = make_telco_customers(n_rows)
+    # The engine works on cleaned data, as load_telco() returns it
+    df["Total Charges"] = df["Total Charges"].replace(" ", np.nan)
+    df = df.dropna(subset=["Total Charges"])
+    df["Churn"] = (df["Churn Label"] == "Yes").astype(int)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        full_path = os.path.join(tmp, "telco.csv")
+        df.to_csv(full_path, index=False)
+
+        shard_paths = []
+        for i, shard in enumerate(np.array_split(np.arange(len(df)), SHARDS)):
+            shard_paths.append(os.path.join(tmp, f"telco_{i}.csv"))
+            df.iloc[shard].to_csv(shard_paths[-1], index=False)
+        del df
+
+        baseline = None
+        print(f"\n{'mode':>26}{'seconds':>10}{'peak MB':>10}  matches pandas")
+        for label, mode, paths in [
+            ("pandas, separate passes", "pandas", [full_path]),
+            ("engine, chunked", "engine", [full_path]),
+            (f"engine, {SHARDS} shard workers", "shards", shard_paths)
+        ]:
+            seconds, peak_mb, result = run(mode, paths)
+            baseline = result if baseline is None else baseline
+            print(f"{label:>26}{seconds:>10.2f}{peak_mb:>10.0f}  {np.allclose(result, baseline)}")
@@ -0,0 +1,92 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import joblib
+import numpy as np
+
+sys.path.append(".")
+from benchmarks.synthetic import make_saas_customers, train_saas_pipeline
+from utils.flat_forest import save_flat_forest
+
+# ==============================
+# MODEL FORMAT BENCHMARK
+# Cold-start time and resident memory of a 300-tree SaaS pipeline saved as
+# an uncompressed joblib pickle, the same pickle opened with mmap_mode,
+# and a flat forest directory. Each load runs in a fresh process; WORKERS
+# processes load at once to show what is private vs shared.
+# Run from the repo root: python benchmarks/bench_model_formats.py
+# Linux only (reads /proc/self/status).
+# ==============================
+
+TRAIN_ROWS = 50_000
+WORKERS = 4
+
+LOADER = """
+import sys, time
+sys.path.append(".")
+import joblib
+import sklearn.pipeline
+from utils.flat_forest import load_flat_forest
+path, fmt = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if fmt == "flat":
+    model = load_flat_forest(path)
+    # touch every page so the mapping is resident, like a warm server
+    for array in model.arrays.values():
+        array.sum()
+elif fmt == "joblib-mmap":
+    model = joblib.load(path, mmap_mode="r")
+else:
+    model = joblib.load(path)
+seconds = time.perf_counter() - start
+status = dict(
+    line.split(":", 1) for line in open("/proc/self/status") if line.startswith("Rss")
+)
+print(seconds, status["RssAnon"].split()[0], status["RssFile"].split()[0])
+"""
+
+
+def run_workers(path, fmt):
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-c", LOADER, path, fmt],
+            stdout=subprocess.PIPE, text=True
+        )
+        for _ in range(WORKERS)
+    ]
+    rows = [list(map(float, p.communicate()[0].split())) for p in procs]
+    return np.array(rows)
+
+
+print(f"Training 300-tree pipeline on {TRAIN_ROWS:,} rows...")
+pipeline = train_saas_pipeline(make_saas_customers(TRAIN_ROWS))
+
+with tempfile.TemporaryDirectory() as tmp:
+    pkl_path = os.path.join(tmp, "pipeline.pkl")
+    flat_dir = os.path.join(tmp, "pipeline.flat")
+
+    start = time.perf_counter()
+    joblib.dump(pipeline, pkl_path)
+    print(f"joblib.dump        : {time.perf_counter() - start:.2f}s  "
+          f"{os.path.getsize(pkl_path) / 1e6:.1f} MB")
+
+    start = time.perf_counter()
+    save_flat_forest(pipeline, flat_dir)
+    flat_bytes = sum(
+        os.path.getsize(os.path.join(flat_dir, f)) for f in os.listdir(flat_dir)
+    )
+    print(f"save_flat_forest   : {time.perf_counter() - start:.2f}s  "
+          f"{flat_bytes / 1e6:.1f} MB")
+
+    print(f"\n{WORKERS} concurrent worker processes per format")
+    print(f"{'format':<14}{'load s (mean)':>15}{'private MB':>14}"
+          f"{'file-backed MB':>17}{'private total MB':>19}")
+
+    for fmt, path in [("joblib", pkl_path), ("joblib-mmap", pkl_path),
+                      ("flat", flat_dir)]:
+        results = run_workers(path, fmt)
+        seconds, anon_kb, file_kb = results.mean(axis=0)
+        print(f"{fmt:<14}{seconds:>15.3f}{anon_kb / 1024:>14.1f}"
+              f"{file_kb / 1024:>17.1f}{results[:, 1].sum() / 1024:>19.1f}")
@@ -0,0 +1,76 @@
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.append(".")
+from benchmarks.synthetic import make_saas_customers
+
+# ==============================
+# IN-MEMORY vs OUT-OF-CORE TRAINING BENCHMARK
+# Trains the SaaS pipeline from the same CSV twice: the Bulk Scoring
+# in-memory path (whole file -> DataFrame -> one fit) and the streamed
+# warm_start path. Each run is a fresh process, so peak RSS is its own.
+# AUC is on the run's own holdout and on a separate 100k-customer test
+# file drawn with another seed, so both paths are scored on the same rows.
+# Run from the repo root:
+#   python benchmarks/bench_out_of_core_training.py [ROWS] [TREES] [SHARD_ROWS]
+# Linux only (reads VmHWM from /proc/self/status).
+# ==============================
+
+TEST_ROWS = 100_000
+
+RUNNER = """
+import sys, time
+sys.path.append(".")
+from sklearn.metrics import roc_auc_score
+from utils.columnar import read_frame
+from utils.schema import REQUIRED_COLUMNS
+from utils.training import train_in_memory, train_out_of_core
+mode, path, test_path, trees, shard_rows = sys.argv[1:6]
+start = time.perf_counter()
+if mode == "in-memory":
+    pipeline, report = train_in_memory(
+        read_frame(path, "csv", REQUIRED_COLUMNS + ["churn"]), int(trees), n_jobs=-1
+    )
+else:
+    pipeline, report = train_out_of_core(
+        path, "csv", int(trees), shard_rows=int(shard_rows), n_jobs=-1
+    )
+seconds = time.perf_counter() - start
+peak_kb = [line.split()[1] for line in open("/proc/self/status") if line.startswith("VmHWM")][0]
+test = read_frame(test_path, "csv", REQUIRED_COLUMNS + ["churn"])
+test_auc = roc_auc_score(test["churn"] == "Yes", pipeline.predict_proba(test[REQUIRED_COLUMNS])[:, 1])
+print(seconds, int(peak_kb) / 1024, report["auc"], test_auc, report["shards"])
+"""
+
+
+def run(mode, path, test_path, trees, shard_rows):
+    output = subprocess.run(
+        [sys.executable, "-c", RUNNER, mode, path, test_path, str(trees), str(shard_rows)],
+        capture_output=True, text=True, check=True
+    ).stdout.split()
+    return float(output[0]), float(output[1]), float(output[2]), float(output[3]), int(output[4])
+
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    trees = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    shard_rows = int(sys.argv[3]) if len(sys.argv) > 3 else 200_000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "customers.csv")
+        test_path = os.path.join(tmp, "test.csv")
+        print(f"Generating {n_rows:,} training and {TEST_ROWS:,} test customers...")
+        make_saas_customers(n_rows).to_csv(path, index=False)
+        make_saas_customers(TEST_ROWS, seed=7).to_csv(test_path, index=False)
+
+        print(f"{trees} trees, {shard_rows:,}-row shards, {os.cpu_count()} CPUs\n")
+        print(f"{'mode':>12}{'shards':>8}{'seconds':>9}{'peak MB':>9}"
+              f"{'holdout AUC':>13}{'test AUC':>10}")
+
+        for mode in ["in-memory", "out-of-core"]:
+            seconds, peak_mb, auc, test_auc, shards = run(mode, path, test_path, trees, shard_rows)
+            print(f"{mode:>12}{shards:>8}{seconds:>9.1f}{peak_mb:>9.0f}"
+                  f"{auc:>13.4f}{test_auc:>10.4f}")
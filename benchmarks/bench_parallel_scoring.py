@@ -0,0 +1,55 @@
+import os
+import sys
+import tempfile
+import time
+import joblib
+import numpy as np
+
+sys.path.append(".")
+from benchmarks.synthetic import FEATURES, make_saas_customers, train_saas_pipeline
+from utils.parallel_scoring import predict_proba_parallel
+
+# ==============================
+# PARALLEL SCORING BENCHMARK
+# Scores SCORE_ROWS synthetic customers with 1..N worker processes and
+# reports wall time, rows/sec and speedup over one worker. Each worker
+# count is warmed up first so model loading is not counted.
+# Run from the repo root: python benchmarks/bench_parallel_scoring.py [N]
+# ==============================
+
+TRAIN_ROWS = 20_000
+SCORE_ROWS = 500_000
+
+if __name__ == "__main__":
+
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    worker_counts = sorted({1, max_workers} | {2 ** i for i in range(1, 7) if 2 ** i < max_workers})
+
+    print(f"Training 300-tree pipeline on {TRAIN_ROWS:,} rows...")
+    pipeline = train_saas_pipeline(make_saas_customers(TRAIN_ROWS))
+    pipeline.set_params(model__n_jobs=None)
+
+    X = make_saas_customers(SCORE_ROWS, seed=7)[FEATURES]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "pipeline.pkl")
+        joblib.dump(pipeline, model_path)
+
+        reference = None
+        baseline = None
+
+        print(f"\n{'workers':>8}{'seconds':>10}{'rows/sec':>14}{'speedup':>10}")
+
+        for n_workers in worker_counts:
+            predict_proba_parallel(X.head(100_000), model_path, n_workers)  # warm-up
+
+            start = time.perf_counter()
+            probabilities = predict_proba_parallel(X, model_path, n_workers)
+            seconds = time.perf_counter() - start
+
+            if reference is None:
+                reference, baseline = probabilities, seconds
+            assert np.array_equal(probabilities, reference), "Shard order mismatch"
+
+            print(f"{n_workers:>8}{seconds:>10.2f}{SCORE_ROWS / seconds:>14,.0f}"
+                  f"{baseline / seconds:>10.2f}x")
@@ -0,0 +1,100 @@
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import numpy as np
+
+sys.path.append(os.path.abspath("."))
+from benchmarks.suite import api_records, train_telco_artifacts
+from benchmarks.synthetic import make_telco_customers
+
+# ==============================
+# PREDICTION CACHE BENCHMARK
+# /predict (Flask test client, Telco artifacts) for a CRM-like pattern:
+# REQUESTS calls drawn from CUSTOMERS distinct payloads, with the cache
+# off vs on. Then checks that a second worker process sharing the SQLite
+# store gets hits for predictions it never made, and that retraining the
+# model (new artifact content) invalidates the cache.
+# Run from the repo root: python benchmarks/bench_prediction_cache.py
+# ==============================
+
+CUSTOMERS = 500
+REQUESTS = 5_000
+
+SECOND_WORKER = """
+import os, sys
+sys.path.append(sys.argv[1])
+import app as api
+from utils import serving
+client = api.app.test_client()
+from benchmarks.suite import api_records
+from benchmarks.synthetic import make_telco_customers
+for record in api_records(make_telco_customers(int(sys.argv[2]), seed=7), int(sys.argv[2])):
+    client.post("/predict", json=record)
+stats = serving.prediction_cache.stats()
+print(stats["hits"], stats["shared_hits"], stats["misses"])
+"""
+
+
+def run_requests(client, records, order):
+    timings = []
+    responses = []
+    for i in order:
+        start = time.perf_counter()
+        response = client.post("/predict", json=records[i])
+        timings.append(time.perf_counter() - start)
+        responses.append(response.json["churn_probability"])
+    return np.array(timings) * 1000, np.array(responses)
+
+
+if __name__ == "__main__":
+
+    repo = os.path.abspath(".")
+    order = np.random.default_rng(0).integers(0, CUSTOMERS, REQUESTS)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.makedirs(os.path.join(work_dir, "data"))
+        print("Training Telco artifacts...")
+        telco = make_telco_customers(7_043)
+        train_telco_artifacts(telco, os.path.join(work_dir, "data"))
+
+        db_path = os.path.join(work_dir, "prediction_cache.sqlite")
+        os.environ["CHURN_PREDICTION_CACHE_DB"] = db_path
+        os.chdir(work_dir)
+
+        import app as api
+        from utils import serving
+        client = api.app.test_client()
+        records = api_records(make_telco_customers(CUSTOMERS, seed=7), CUSTOMERS)
+        cache = serving.prediction_cache
+
+        serving.prediction_cache = None
+        off_ms, off_values = run_requests(client, records, order)
+        serving.prediction_cache = cache
+        on_ms, on_values = run_requests(client, records, order)
+
+        stats = cache.stats()
+        print(f"\n{REQUESTS:,} requests over {CUSTOMERS:,} customers")
+        print(f"{'cache':>6}{'p50 ms':>10}{'p99 ms':>10}{'total s':>10}")
+        for label, timings in [("off", off_ms), ("on", on_ms)]:
+            print(f"{label:>6}{np.percentile(timings, 50):>10.3f}"
+                  f"{np.percentile(timings, 99):>10.3f}{timings.sum() / 1000:>10.2f}")
+        print(f"hit rate {stats['hit_rate']:.1%}, same answers: {np.array_equal(off_values, on_values)}")
+
+        # A fresh worker process on the same shared store
+        output = subprocess.run(
+            [sys.executable, "-c", SECOND_WORKER, repo, str(CUSTOMERS)],
+            capture_output=True, text=True, check=True, cwd=work_dir
+        ).stdout.split()
+        print(f"\nSecond worker: {output[1]} shared-store hits, {output[2]} misses "
+              f"for {CUSTOMERS} customers it never scored")
+
+        # Retrain on other data: new artifact hashes, nothing cached is served
+        train_telco_artifacts(make_telco_customers(7_043, seed=1), "data")
+
+        before = cache.stats()
+        client.post("/predict", json=records[order[0]])
+        after = cache.stats()
+        print(f"After retraining: invalidations {before['invalidations']} -> "
+              f"{after['invalidations']}, misses +{after['misses'] - before['misses']}")
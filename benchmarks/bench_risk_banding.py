@@ -0,0 +1,44 @@
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(".")
+from utils.risk import risk_level
+
+# ==============================
+# RISK BANDING BENCHMARK
+# Run from the repo root: python benchmarks/bench_risk_banding.py
+# ==============================
+
+SIZES = [1_000_000, 10_000_000]
+
+
+def lambda_banding(probs):
+    return probs.apply(
+        lambda x: "High" if x > 0.7 else "Medium" if x > 0.4 else "Low"
+    )
+
+
+def timed(fn, probs):
+    start = time.perf_counter()
+    result = fn(probs)
+    return result, time.perf_counter() - start
+
+
+for n in SIZES:
+    rng = np.random.default_rng(42)
+    probs = pd.Series(rng.random(n), name="Churn Probability")
+    probs.iloc[:4] = [0.0, 0.4, 0.7, 1.0]  # exact boundaries
+
+    old, old_seconds = timed(lambda_banding, probs)
+    new, new_seconds = timed(risk_level, probs)
+
+    assert (old == new.astype(str)).all(), "Risk levels differ from lambda"
+
+    print(f"\nRows: {n:,}")
+    print(f"  lambda      : {old_seconds:8.3f}s  {n / old_seconds:14,.0f} rows/sec"
+          f"  {old.memory_usage(deep=True) / 1e6:8.1f} MB")
+    print(f"  risk_level  : {new_seconds:8.3f}s  {n / new_seconds:14,.0f} rows/sec"
+          f"  {new.memory_usage(deep=True) / 1e6:8.1f} MB")
+    print(f"  speedup     : {old_seconds / new_seconds:8.1f}x")
@@ -0,0 +1,57 @@
+import io
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+sys.path.append(".")
+from benchmarks.synthetic import make_saas_customers
+from utils.schema import REQUIRED_COLUMNS, compact, validate
+
+# ==============================
+# FEATURE SCHEMA BENCHMARK
+# Memory of the seven scoring columns as pandas infers them from CSV vs
+# after validate() + compact(), the time validation takes, and the bad-row
+# report for a file with a few corrupted values.
+# Run from the repo root: python benchmarks/bench_schema_memory.py [ROWS]
+# ==============================
+
+BAD_FRACTION = 0.001
+
+
+def frame_mb(df):
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = np.random.default_rng(0)
+
+    df = make_saas_customers(n_rows)[REQUIRED_COLUMNS]
+
+    # Corrupt a few values the way real exports do
+    n_bad = int(n_rows * BAD_FRACTION)
+    df["support_tickets"] = df["support_tickets"].astype(object)
+    df.loc[rng.choice(n_rows, n_bad, replace=False), "support_tickets"] = "unknown"
+    df.loc[rng.choice(n_rows, n_bad, replace=False), "plan_type"] = "Legacy"
+    df.loc[rng.choice(n_rows, n_bad, replace=False), "avg_weekly_usage_hours"] = -5
+
+    print(f"Writing {n_rows:,} rows to an in-memory CSV...")
+    csv = io.BytesIO(df.to_csv(index=False).encode("utf-8"))
+    del df
+
+    inferred = pd.read_csv(csv)
+    print(f"\npandas-inferred dtypes : {frame_mb(inferred):8.1f} MB  "
+          f"{dict(inferred.dtypes.astype(str))}")
+
+    start = time.perf_counter()
+    clean, bad_rows = validate(inferred)
+    seconds = time.perf_counter() - start
+    clean = compact(clean)
+
+    print(f"schema dtypes          : {frame_mb(clean):8.1f} MB  "
+          f"{dict(clean.dtypes.astype(str))}")
+    print(f"\nvalidate: {seconds:.2f}s ({n_rows / seconds:,.0f} rows/s), "
+          f"{bad_rows['row'].nunique():,} rows rejected")
+    print(bad_rows.groupby(["column", "problem"]).size().to_string())
@@ -0,0 +1,160 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+import numpy as np
+
+sys.path.append(os.path.abspath("."))
+from benchmarks.suite import api_records, train_telco_artifacts
+from benchmarks.synthetic import make_telco_customers
+
+# ==============================
+# SERVING LOAD TEST: Flask vs ASGI
+# Starts each server on Telco artifacts in a scratch directory and drives
+# /predict with N concurrent keep-alive clients (closed loop, asyncio, in
+# this process) for SECONDS per level. Reports throughput, p50/p99 latency
+# and 503s (ASGI backpressure; clients honour Retry-After). The
+# prediction cache is off so every request pays for the forest.
+#   flask  app.py on Werkzeug (threaded, without the debug reloader)
+#   asgi   asgi_app.py on uvicorn, one worker process
+# Run from the repo root: python benchmarks/bench_serving.py [SECONDS]
+# ==============================
+
+CONCURRENCY = [1, 8, 32, 128]
+PORTS = {"flask": 5055, "asgi": 8055}
+CUSTOMERS = 2_000
+STARTUP_TIMEOUT = 120
+
+SERVERS = {
+    "flask": [sys.executable, "-c",
+              f"import app; app.app.run(port={PORTS['flask']}, threaded=True)"],
+    "asgi": [sys.executable, "-m", "uvicorn", "asgi_app:app",
+             "--port", str(PORTS["asgi"]), "--log-level", "warning"]
+}
+
+
+def wait_for(url, timeout=STARTUP_TIMEOUT):
+    start = time.perf_counter()
+    while time.perf_counter() - start < timeout:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return time.perf_counter() - start
+        except (urllib.error.URLError, ConnectionError, OSError):
+            pass
+        time.sleep(0.05)
+    raise TimeoutError(url)
+
+
+async def post(connection, port, body):
+
+    # Minimal HTTP/1.1 POST on a reusable connection; reconnects when the
+    # server closes it (Werkzeug answers HTTP/1.0 without keep-alive)
+    if connection[0] is None:
+        connection[:] = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = connection
+    writer.write(
+        f"POST /predict HTTP/1.1\r\nHost: 127.0.0.1\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+
+    status_line = await reader.readline()
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode().partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    length = int(headers.get("content-length", 0))
+    if length:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+
+    if status_line.startswith(b"HTTP/1.0") or headers.get("connection", "").lower() == "close":
+        writer.close()
+        connection[:] = [None, None]
+    return int(status_line.split()[1]), float(headers.get("retry-after", 0))
+
+
+async def load(port, bodies, concurrency, seconds):
+
+    latencies, statuses = [], []
+    deadline = time.perf_counter() + seconds
+
+    async def client(offset):
+        connection = [None, None]
+        i = offset
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            retry_after = 0
+            try:
+                status, retry_after = await post(connection, port, bodies[i % len(bodies)])
+            except (ConnectionError, asyncio.IncompleteReadError):
+                connection[:] = [None, None]
+                status = 0
+            latencies.append(time.perf_counter() - start)
+            statuses.append(status)
+            i += concurrency
+            # Well-behaved clients back off when told to
+            if retry_after:
+                await asyncio.sleep(retry_after)
+        if connection[1] is not None:
+            connection[1].close()
+
+    await asyncio.gather(*(client(c) for c in range(concurrency)))
+    return np.array(latencies) * 1000, np.array(statuses)
+
+
+if __name__ == "__main__":
+
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    repo = os.path.abspath(".")
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.makedirs(os.path.join(work_dir, "data"))
+        print("Training Telco artifacts...")
+        train_telco_artifacts(make_telco_customers(7_043), os.path.join(work_dir, "data"))
+
+        records = api_records(make_telco_customers(CUSTOMERS, seed=7), CUSTOMERS)
+        bodies = [json.dumps(record).encode() for record in records]
+
+        env = dict(os.environ, PYTHONPATH=repo, CHURN_PREDICTION_CACHE_SIZE="0")
+
+        print(f"\n{'server':>7}{'clients':>9}{'req/s':>10}{'p50 ms':>10}{'p99 ms':>10}"
+              f"{'503s':>8}{'errors':>8}")
+
+        for name, command in SERVERS.items():
+            server = subprocess.Popen(
+                command, cwd=work_dir, env=env,
+                stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            try:
+                port = PORTS[name]
+                if name == "asgi":
+                    live = wait_for(f"http://127.0.0.1:{port}/healthz")
+                    ready = wait_for(f"http://127.0.0.1:{port}/readyz")
+                    startup = f"(live after {live:.2f}s, ready {live + ready:.2f}s)"
+                else:
+                    startup = f"(up after {wait_for(f'http://127.0.0.1:{port}/'):.2f}s)"
+                print(f"{name:>7}  {startup}")
+
+                asyncio.run(load(port, bodies, 4, 1))   # warm-up
+                for concurrency in CONCURRENCY:
+                    latencies, statuses = asyncio.run(load(port, bodies, concurrency, seconds))
+                    ok = statuses == 200
+                    p50, p99 = np.percentile(latencies[ok], [50, 99]) if ok.any() else (0, 0)
+                    print(f"{name:>7}{concurrency:>9}{ok.sum() / seconds:>10,.0f}{p50:>10.2f}"
+                          f"{p99:>10.2f}{(statuses == 503).sum():>8}"
+                          f"{(~ok & (statuses != 503)).sum():>8}")
+            finally:
+                server.terminate()
+                server.wait()
@@ -0,0 +1,64 @@
+import os
+import sys
+import tempfile
+import time
+import joblib
+import shap
+
+sys.path.append(".")
+from benchmarks.synthetic import FEATURES, make_saas_customers, train_saas_pipeline
+from utils.explain import (
+    PARALLEL_MIN_ROWS, get_explainer, shap_values, shap_values_parallel, transform
+)
+
+# ==============================
+# SHAP EXPLANATION BENCHMARK
+# Explanations/sec for the old per-click path (new TreeExplainer per call)
+# vs the cached explainer, at several batch sizes, and the worker-pool path
+# for a bulk file.
+# Run from the repo root: python benchmarks/bench_shap.py [N_WORKERS]
+# ==============================
+
+TRAIN_ROWS = 20_000
+N_ESTIMATORS = 100
+BATCH_SIZES = [1, 10, 100]
+BULK_ROWS = 1_000
+
+if __name__ == "__main__":
+
+    n_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+
+    print(f"Training {N_ESTIMATORS}-tree pipeline on {TRAIN_ROWS:,} rows...")
+    pipeline = train_saas_pipeline(make_saas_customers(TRAIN_ROWS), N_ESTIMATORS)
+    data = make_saas_customers(max(BATCH_SIZES + [BULK_ROWS]), seed=7)[FEATURES]
+
+    get_explainer(pipeline)  # build once, as a warm server would have
+
+    print(f"\n{'rows':>8}{'rebuild/call s':>16}{'cached s':>12}{'explanations/s':>16}")
+
+    for n in BATCH_SIZES:
+        X = data.head(n)
+
+        start = time.perf_counter()
+        shap.TreeExplainer(pipeline.named_steps["model"]).shap_values(transform(pipeline, X))
+        rebuild = time.perf_counter() - start
+
+        start = time.perf_counter()
+        shap_values(pipeline, X)
+        cached = time.perf_counter() - start
+
+        print(f"{n:>8,}{rebuild:>16.3f}{cached:>12.3f}{n / cached:>16,.0f}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = os.path.join(tmp, "pipeline.pkl")
+        joblib.dump(pipeline, model_path)
+
+        X = data.head(BULK_ROWS)
+        shap_values_parallel(X.head(PARALLEL_MIN_ROWS), model_path, n_workers)  # warm workers
+
+        start = time.perf_counter()
+        shap_values_parallel(X, model_path, n_workers)
+        seconds = time.perf_counter() - start
+
+        print(f"\nBulk {BULK_ROWS:,} rows on {n_workers} worker(s): {seconds:.2f}s "
+              f"({BULK_ROWS / seconds:,.0f} explanations/s)")
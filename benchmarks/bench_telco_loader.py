@@ -0,0 +1,44 @@
+import os
+import sys
+import tempfile
+import time
+import pandas as pd
+
+sys.path.append(".")
+from benchmarks.synthetic import make_telco_customers
+from utils.telco_data import build_cache, clean_telco, load_telco
+
+# ==============================
+# TELCO LOADER BENCHMARK
+# What each src/ script paid at startup (openpyxl parse + cleaning) vs a
+# load from the Parquet cache, on a workbook the size of the real one.
+# Run from the repo root: python benchmarks/bench_telco_loader.py [ROWS]
+# ==============================
+
+REPEATS = 5
+
+if __name__ == "__main__":
+
+    n_rows = int(sys.argv[1]) if len(sys.argv) > 1 else 7_043
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "Telco_customer_churn.xlsx")
+        make_telco_customers(n_rows).to_excel(source, index=False)
+
+        start = time.perf_counter()
+        clean_telco(pd.read_excel(source))
+        excel = time.perf_counter() - start
+
+        start = time.perf_counter()
+        build_cache(source)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(REPEATS):
+            load_telco(source)
+        cached = (time.perf_counter() - start) / REPEATS
+
+        print(f"{n_rows:,} rows")
+        print(f"read_excel + clean : {excel * 1000:8.1f} ms")
+        print(f"first load (build) : {build * 1000:8.1f} ms")
+        print(f"cached load        : {cached * 1000:8.1f} ms  ({excel / cached:,.0f}x faster)")
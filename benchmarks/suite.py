@@ -0,0 +1,474 @@
+import argparse
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+import joblib
+import numpy as np
+import pandas as pd
+
+# The API case imports app.py from a scratch directory (it loads data/*.pkl
+# relative to the working directory), so put the repo root on the path
+# as an absolute path
+sys.path.append(os.path.abspath("."))
+from benchmarks.synthetic import make_saas_customers, make_telco_customers
+
+# ==============================
+# BENCHMARK SUITE
+# Times the real code paths on synthetic data and writes one JSON file
+# per run; `compare` flags regressions between two runs.
+#
+#   api.predict          one /predict request (Flask test client, Telco artifacts)
+#   api.predict_batch    one /predict_batch request
+#   bulk.score           utils.scoring.score_file_in_chunks over a CSV upload
+#   dashboard.score      read + validate + score, as scored_frame does
+#   dashboard.aggregate  KPI engine + chart summaries over the scored frame
+#   explain.shap         utils.explain.shap_values, each explanation mode
+#   report.pdf           utils.pdf_report.generate_pdf (individual report)
+#   train.saas           utils.training.train_in_memory (Bulk Scoring model)
+#   train.telco          the src/churn_model.py steps (API artifacts)
+#
+# Fully offline and CPU only: no server is started and nothing is
+# downloaded. Stage breakdowns come from utils.metrics.
+#
+# Run from the repo root:
+#   python benchmarks/suite.py run [--size small|medium|large] [--only api,bulk]
+#   python benchmarks/suite.py compare BASE.json NEW.json [--threshold 0.15]
+# ==============================
+
+SIZES = {
+    "small": {
+        "rows": 20_000, "train_rows": 5_000, "telco_rows": 7_043,
+        "api_calls": 10, "api_batch": 100, "shap_rows": 50, "pdfs": 20, "repeat": 3
+    },
+    "medium": {
+        "rows": 200_000, "train_rows": 50_000, "telco_rows": 7_043,
+        "api_calls": 50, "api_batch": 1_000, "shap_rows": 200, "pdfs": 50, "repeat": 5
+    },
+    "large": {
+        "rows": 2_000_000, "train_rows": 200_000, "telco_rows": 50_000,
+        "api_calls": 200, "api_batch": 10_000, "shap_rows": 1_000, "pdfs": 100, "repeat": 5
+    }
+}
+
+RESULTS_DIR = "benchmarks/results"
+
+# Median time change (fraction) above which compare reports a regression
+REGRESSION_THRESHOLD = 0.15
+
+TELCO_DROP_COLUMNS = [
+    "CustomerID", "Churn Label", "Churn Reason", "Churn Value", "Churn Score", "CLTV"
+]
+
+# Fields of a /predict payload; the rest of the Telco columns stay absent
+# (filled with 0), as in test_api.py
+API_FIELDS = [
+    "Tenure Months", "Monthly Charges", "Total Charges",
+    "Contract", "Internet Service", "Payment Method"
+]
+
+
+# ==============================
+# TIMING
+# ==============================
+def measure(fn, repeat, warmup=True):
+    if warmup:
+        fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def summarize(timings, rows):
+
+    median = float(np.median(timings))
+    return {
+        "rows": rows,
+        "calls": len(timings),
+        "median_s": median,
+        "p95_s": float(np.percentile(timings, 95)),
+        "min_s": float(min(timings)),
+        "max_s": float(max(timings)),
+        "rows_per_s": rows / median if median else None
+    }
+
+
+def stage_means():
+    from utils.metrics import snapshot
+    stages, _ = snapshot()
+    return {row["stage"]: round(row["mean_ms"], 3) for row in stages}
+
+
+# ==============================
+# FIXTURES
+# ==============================
+def train_telco_artifacts(df, data_dir):
+
+    # src/churn_model.py, writing into data_dir
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+    from utils.flat_forest import save_flat_forest
+    from utils.telco_data import clean_telco
+
+    df = clean_telco(df.copy()).dropna(subset=["Total Charges"])
+    df = df.drop(columns=TELCO_DROP_COLUMNS, errors="ignore")
+    df = pd.get_dummies(df, drop_first=True)
+
+    X = df.drop("Churn", axis=1)
+    y = df["Churn"]
+
+    scaler = StandardScaler()
+    model = RandomForestClassifier(n_estimators=200, random_state=42, class_weight="balanced")
+    model.fit(scaler.fit_transform(X), y)
+
+    joblib.dump(X.columns.tolist(), os.path.join(data_dir, "model_columns.pkl"))
+    joblib.dump(scaler, os.path.join(data_dir, "scaler.pkl"))
+    joblib.dump(model, os.path.join(data_dir, "churn_model.pkl"))
+    save_flat_forest(model, os.path.join(data_dir, "churn_model.flat"))
+
+
+def api_records(telco, n):
+    records = telco[API_FIELDS].head(n).copy()
+    records["Total Charges"] = pd.to_numeric(records["Total Charges"], errors="coerce").fillna(0)
+    return records.to_dict("records")
+
+
+def saas_pipeline(context):
+    if "pipeline" not in context:
+        from utils.training import train_in_memory
+        context["pipeline"], _ = train_in_memory(context["train_df"])
+    return context["pipeline"]
+
+
+def scored_saas(context):
+
+    # What dashboard.scored_frame caches for an upload
+    if "scored" not in context:
+        from utils.risk import risk_level
+        from utils.schema import REQUIRED_COLUMNS, compact, validate
+        df, _ = validate(pd.read_csv(context["csv_path"], usecols=REQUIRED_COLUMNS))
+        df["Churn Probability"] = saas_pipeline(context).predict_proba(df[REQUIRED_COLUMNS])[:, 1]
+        df["Risk Level"] = risk_level(df["Churn Probability"])
+        context["scored"] = compact(df)
+    return context["scored"]
+
+
+# ==============================
+# CASES
+# Each returns {name: summary}; context holds shared data and models
+# ==============================
+def case_train_telco(context, size):
+    telco = make_telco_customers(size["telco_rows"])
+    timings = measure(
+        lambda: train_telco_artifacts(telco, context["data_dir"]), 1, warmup=False
+    )
+    return {"train.telco": summarize(timings, len(telco))}
+
+
+def case_train_saas(context, size):
+
+    from utils.training import train_in_memory
+
+    def train():
+        context["pipeline"], _ = train_in_memory(context["train_df"])
+
+    return {"train.saas": summarize(measure(train, 1, warmup=False), len(context["train_df"]))}
+
+
+def case_api(context, size):
+
+    if not os.path.exists(os.path.join(context["data_dir"], "churn_model.pkl")):
+        case_train_telco(context, size)
+
+    # app.py and the model registry resolve data/... against the working
+    # directory, so the whole case runs from the scratch directory
+    cwd = os.getcwd()
+    os.chdir(context["work_dir"])
+    try:
+        return _api_results(size)
+    finally:
+        os.chdir(cwd)
+
+
+def _api_results(size):
+
+    import app as api
+    from utils.metrics import reset
+
+    client = api.app.test_client()
+    telco = make_telco_customers(max(size["api_batch"], size["api_calls"]), seed=7)
+    single = api_records(telco, size["api_calls"])
+    batch = api_records(telco, size["api_batch"])
+
+    calls = iter(single * 2)
+
+    def predict():
+        response = client.post("/predict", json=next(calls))
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    def predict_batch():
+        response = client.post("/predict_batch", json=batch)
+        assert response.status_code == 200, response.get_data(as_text=True)
+
+    results = {}
+    reset()
+    results["api.predict"] = summarize(measure(predict, len(single)), 1)
+    results["api.predict"]["stages_ms"] = stage_means()
+    reset()
+    results["api.predict_batch"] = summarize(measure(predict_batch, size["repeat"]), len(batch))
+    results["api.predict_batch"]["stages_ms"] = stage_means()
+    return results
+
+
+def case_bulk(context, size):
+
+    from utils.scoring import score_file_in_chunks
+
+    pipeline = saas_pipeline(context)
+    output_path = os.path.join(context["work_dir"], "scored.csv")
+
+    def score():
+        with open(context["csv_path"], "rb") as source:
+            score_file_in_chunks(source, pipeline, output_path)
+
+    return {"bulk.score": summarize(measure(score, size["repeat"]), size["rows"])}
+
+
+def case_dashboard(context, size):
+
+    from utils.chart_data import binned_density, box_stats
+    from utils.kpi_engine import SAAS_SPEC, aggregate_frame
+    from utils.risk import risk_level
+    from utils.schema import REQUIRED_COLUMNS, compact, validate
+
+    pipeline = saas_pipeline(context)
+
+    def score():
+        df, _ = validate(pd.read_csv(context["csv_path"], usecols=REQUIRED_COLUMNS))
+        df["Churn Probability"] = pipeline.predict_proba(df[REQUIRED_COLUMNS])[:, 1]
+        df["Risk Level"] = risk_level(df["Churn Probability"])
+        context["scored"] = compact(df)
+
+    scored = summarize(measure(score, size["repeat"]), size["rows"])
+
+    df = scored_saas(context)
+
+    def aggregate():
+        aggregate_frame(df, SAAS_SPEC)
+        binned_density(df, "avg_weekly_usage_hours", "Churn Probability")
+        box_stats(df, "Risk Level", "support_tickets")
+
+    return {
+        "dashboard.score": scored,
+        "dashboard.aggregate": summarize(measure(aggregate, size["repeat"]), len(df))
+    }
+
+
+def case_explain(context, size):
+
+    from utils.explain import EXPLAIN_MODES, shap_values
+    from utils.schema import REQUIRED_COLUMNS
+
+    pipeline = saas_pipeline(context)
+    X = scored_saas(context)[REQUIRED_COLUMNS].head(size["shap_rows"])
+
+    return {
+        f"explain.shap.{mode}": summarize(
+            measure(lambda: shap_values(pipeline, X, mode=mode), size["repeat"]), len(X)
+        )
+        for mode in EXPLAIN_MODES
+    }
+
+
+def case_pdf(context, size):
+
+    from utils.pdf_report import generate_pdf
+
+    def report():
+        generate_pdf(io.BytesIO(), 73.5, "High Risk")
+
+    return {"report.pdf": summarize(measure(report, size["pdfs"]), 1)}
+
+
+# Order matters: API and training first (the Telco and SaaS models are
+# built there and reused by the later cases)
+CASES = {
+    "train.telco": case_train_telco,
+    "api": case_api,
+    "train.saas": case_train_saas,
+    "bulk": case_bulk,
+    "dashboard": case_dashboard,
+    "explain": case_explain,
+    "report": case_pdf
+}
+
+
+# ==============================
+# RUN
+# ==============================
+def _git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment(size_name, size):
+
+    import sklearn
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "size": size_name,
+        "params": size,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__
+    }
+
+
+def run(size_name, only=None, out_path=None, rows=None):
+
+    size = dict(SIZES[size_name])
+    if rows:
+        size["rows"] = rows
+
+    selected = [
+        name for name in CASES
+        if not only or any(name == o or name.startswith(o + ".") or o.startswith(name) for o in only)
+    ]
+
+    results = {}
+    skipped = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        data_dir = os.path.join(work_dir, "data")
+        os.makedirs(data_dir)
+
+        print(f"Generating {size['rows']:,} SaaS customers...")
+        customers = make_saas_customers(size["rows"], seed=7)
+        csv_path = os.path.join(work_dir, "customers.csv")
+        customers.drop(columns="churn").to_csv(csv_path, index=False)
+        del customers
+
+        context = {
+            "work_dir": work_dir,
+            "data_dir": data_dir,
+            "csv_path": csv_path,
+            "train_df": make_saas_customers(size["train_rows"])
+        }
+
+        for name in selected:
+            print(f"Running {name}...")
+            try:
+                case_results = CASES[name](context, size)
+            except ImportError as e:
+                # e.g. reportlab not installed: recorded, not fatal
+                skipped[name] = str(e)
+                print(f"  skipped: {e}")
+                continue
+            for case, summary in case_results.items():
+                results[case] = summary
+                print(f"  {case:<28}{summary['median_s'] * 1000:>12.2f} ms"
+                      f"{summary['rows_per_s'] or 0:>16,.1f} rows/s")
+
+    output = {
+        "environment": environment(size_name, size),
+        "results": results,
+        "skipped": skipped
+    }
+
+    if out_path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        out_path = os.path.join(RESULTS_DIR, f"{size_name}-{stamp}.json")
+
+    with open(out_path, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults saved to {out_path}")
+    return output
+
+
+# ==============================
+# COMPARE
+# ==============================
+def compare(base_path, new_path, threshold=REGRESSION_THRESHOLD):
+
+    with open(base_path) as f:
+        base = json.load(f)
+    with open(new_path) as f:
+        new = json.load(f)
+
+    # Timings are only comparable on the same box and data size
+    for key in ["size", "cpu_count", "python", "numpy", "pandas", "sklearn"]:
+        if base["environment"].get(key) != new["environment"].get(key):
+            print(f"Warning: {key} differs "
+                  f"({base['environment'].get(key)} -> {new['environment'].get(key)})")
+
+    rows = []
+    for case in sorted(set(base["results"]) | set(new["results"])):
+        before = base["results"].get(case)
+        after = new["results"].get(case)
+        if before is None or after is None:
+            rows.append({"case": case, "status": "only in " + ("new" if before is None else "base")})
+            continue
+
+        change = after["median_s"] / before["median_s"] - 1
+        if change > threshold:
+            status = "REGRESSION"
+        elif change < -threshold:
+            status = "faster"
+        else:
+            status = "ok"
+        rows.append({
+            "case": case,
+            "base_ms": before["median_s"] * 1000,
+            "new_ms": after["median_s"] * 1000,
+            "change_pct": change * 100,
+            "status": status
+        })
+
+    table = pd.DataFrame(rows)
+    print(f"{base['environment'].get('commit')} -> {new['environment'].get('commit')} "
+          f"(threshold {threshold:.0%} on median time)\n")
+    print(table.round(2).to_string(index=False))
+
+    regressions = table[table["status"] == "REGRESSION"]
+    return len(regressions)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Churn analytics benchmark suite")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time every code path, write JSON")
+    run_parser.add_argument("--size", choices=list(SIZES), default="small")
+    run_parser.add_argument("--rows", type=int, help="override the scoring file size")
+    run_parser.add_argument("--only", help="comma-separated cases, e.g. api,bulk,explain")
+    run_parser.add_argument("--out", help="output JSON path")
+
+    compare_parser = commands.add_parser("compare", help="flag regressions between two runs")
+    compare_parser.add_argument("base")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+
+    args = parser.parse_args()
+
+    if args.command == "run":
+        run(args.size, args.only.split(",") if args.only else None, args.out, args.rows)
+    else:
+        # Non-zero exit status on regressions, for CI
+        sys.exit(1 if compare(args.base, args.new, args.threshold) else 0)
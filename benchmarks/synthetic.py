@@ -0,0 +1,163 @@
+import numpy as np
+import pandas as pd
+
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+
+# ==============================
+# SYNTHETIC SaaS CUSTOMERS
+# Same columns as the Bulk Scoring / Analytics uploads, with a churn label
+# that depends on the features so trained forests look realistic.
+# ==============================
+
+NUMERIC = [
+    "tenure_months",
+    "monthly_fee",
+    "avg_weekly_usage_hours",
+    "support_tickets",
+    "payment_failures",
+    "last_login_days_ago"
+]
+
+FEATURES = NUMERIC + ["plan_type"]
+
+PLAN_TYPES = ["Basic", "Standard", "Premium"]
+
+
+def make_saas_customers(n, seed=42):
+
+    rng = np.random.default_rng(seed)
+
+    df = pd.DataFrame({
+        "customer_id": np.arange(n),
+        "tenure_months": rng.integers(1, 72, n),
+        "monthly_fee": rng.uniform(10, 500, n).round(2),
+        "avg_weekly_usage_hours": rng.uniform(0, 40, n).round(1),
+        "support_tickets": rng.integers(0, 15, n),
+        "payment_failures": rng.integers(0, 6, n),
+        "last_login_days_ago": rng.integers(0, 90, n),
+        "plan_type": rng.choice(PLAN_TYPES, n)
+    })
+
+    logit = (
+        -1
+        + 0.4 * df["payment_failures"]
+        + 0.1 * df["support_tickets"]
+        - 0.05 * df["avg_weekly_usage_hours"]
+        + 0.02 * df["last_login_days_ago"]
+        - 0.02 * df["tenure_months"]
+    )
+    churned = rng.random(n) < 1 / (1 + np.exp(-logit))
+    df["churn"] = np.where(churned, "Yes", "No")
+
+    return df
+
+
+def train_saas_pipeline(df, n_estimators=300):
+
+    pipeline = Pipeline([
+        ("preprocessing", ColumnTransformer([
+            ("num", StandardScaler(), NUMERIC),
+            ("cat", OneHotEncoder(handle_unknown="ignore"), ["plan_type"])
+        ])),
+        ("model", RandomForestClassifier(
+            n_estimators=n_estimators,
+            random_state=42,
+            class_weight="balanced",
+            n_jobs=-1
+        ))
+    ])
+
+    return pipeline.fit(df[FEATURES], (df["churn"] == "Yes").astype(int))
+
+
+# ==============================
+# SYNTHETIC TELCO CUSTOMERS
+# Column layout of the IBM Telco workbook read by the src/ scripts,
+# including blank Total Charges for new customers.
+# ==============================
+
+TELCO_YES_NO = ["Yes", "No"]
+
+TELCO_CHURN_REASONS = [
+    "Competitor made better offer",
+    "Competitor had better devices",
+    "Attitude of support person",
+    "Don't know",
+    "Price too high",
+    "Moved"
+]
+
+# The workbook has 1,129 cities and 1,652 distinct locations; one-hot
+# encoding them is most of model_columns, so keep the same cardinality
+TELCO_CITIES = 1_129
+TELCO_LOCATIONS = 1_652
+
+
+def make_telco_customers(n, seed=42):
+
+    rng = np.random.default_rng(seed)
+
+    tenure = rng.integers(0, 73, n)
+    monthly = rng.uniform(18, 119, n).round(2)
+    contract = rng.choice(["Month-to-month", "One year", "Two year"], n, p=[0.55, 0.21, 0.24])
+    internet = rng.choice(["DSL", "Fiber optic", "No"], n)
+    payment = rng.choice([
+        "Electronic check", "Mailed check",
+        "Bank transfer (automatic)", "Credit card (automatic)"
+    ], n)
+
+    logit = -1 + 1.2 * (contract == "Month-to-month") + 0.6 * (internet == "Fiber optic") - 0.03 * tenure
+    churned = rng.random(n) < 1 / (1 + np.exp(-logit))
+
+    total = (tenure * monthly).round(2).astype(object)
+    total[tenure == 0] = " "   # as in the source workbook
+
+    cities = np.array(["Los Angeles", "San Diego", "San Jose", "Fresno"] + [
+        f"Town {i}" for i in range(TELCO_CITIES - 4)
+    ])
+    location_city = np.concatenate([cities, rng.choice(cities, TELCO_LOCATIONS - len(cities))])
+    location_zip = 90001 + rng.permutation(6161)[:TELCO_LOCATIONS]
+    location_lat = rng.uniform(32, 42, TELCO_LOCATIONS).round(6)
+    location_long = rng.uniform(-124, -114, TELCO_LOCATIONS).round(6)
+    location = rng.integers(0, TELCO_LOCATIONS, n)
+    latitude = location_lat[location]
+    longitude = location_long[location]
+
+    return pd.DataFrame({
+        "CustomerID": [f"{i:04d}-TELCO" for i in range(n)],
+        "Count": 1,
+        "Country": "United States",
+        "State": "California",
+        "City": location_city[location],
+        "Zip Code": location_zip[location],
+        "Lat Long": [f"{a}, {b}" for a, b in zip(latitude, longitude)],
+        "Latitude": latitude,
+        "Longitude": longitude,
+        "Gender": rng.choice(["Male", "Female"], n),
+        "Senior Citizen": rng.choice(TELCO_YES_NO, n, p=[0.16, 0.84]),
+        "Partner": rng.choice(TELCO_YES_NO, n),
+        "Dependents": rng.choice(TELCO_YES_NO, n),
+        "Tenure Months": tenure,
+        "Phone Service": rng.choice(TELCO_YES_NO, n, p=[0.9, 0.1]),
+        "Multiple Lines": rng.choice(["Yes", "No", "No phone service"], n),
+        "Internet Service": internet,
+        "Online Security": rng.choice(["Yes", "No", "No internet service"], n),
+        "Online Backup": rng.choice(["Yes", "No", "No internet service"], n),
+        "Device Protection": rng.choice(["Yes", "No", "No internet service"], n),
+        "Tech Support": rng.choice(["Yes", "No", "No internet service"], n),
+        "Streaming TV": rng.choice(["Yes", "No", "No internet service"], n),
+        "Streaming Movies": rng.choice(["Yes", "No", "No internet service"], n),
+        "Contract": contract,
+        "Paperless Billing": rng.choice(TELCO_YES_NO, n),
+        "Payment Method": payment,
+        "Monthly Charges": monthly,
+        "Total Charges": total,
+        "Churn Label": np.where(churned, "Yes", "No"),
+        "Churn Value": churned.astype(int),
+        "Churn Score": np.clip(rng.normal(np.where(churned, 80, 45), 12), 5, 100).astype(int),
+        "CLTV": rng.integers(2000, 6500, n),
+        "Churn Reason": np.where(churned, rng.choice(TELCO_CHURN_REASONS, n), None)
+    })
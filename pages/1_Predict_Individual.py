@@ -1,11 +1,15 @@
 import streamlit as st
 import pandas as pd
-import joblib
 import plotly.graph_objects as go
 import plotly.express as px
-import shap
 import io
 from utils.pdf_report import generate_pdf
+from utils.explain import EXPLAIN_MODES, feature_names, shap_values
+from utils.debug_panel import debug_panel
+from utils.metrics import start_run, stopwatch, timer
+from utils.model_registry import get_model, model_version
+from utils.prediction_cache import get_cache, predict_proba_cached
+from utils.risk import MEDIUM_RISK_THRESHOLD, HIGH_RISK_THRESHOLD
 
 # =========================
 # Page Setup
@@ -14,12 +18,16 @@ st.set_page_config(layout="wide")
 st.title("🔮 Individual Customer Churn Prediction")
 st.write("Predict churn risk and generate AI-powered business insights.")
 
+run_timings = start_run()
+
 st.divider()
 
 # =========================
 # Load Model
 # =========================
-model = joblib.load("data/churn_pipeline.pkl")
+MODEL_PATH = "data/churn_pipeline.pkl"
+
+model = get_model(MODEL_PATH)
 
 # =========================
 # Sidebar Inputs
@@ -46,6 +54,13 @@ payment = st.sidebar.selectbox(
      "Bank transfer (automatic)", "Credit card (automatic)"]
 )
 
+explain_mode = st.sidebar.selectbox(
+    "Explanation Mode",
+    EXPLAIN_MODES,
+    help="exact: full SHAP · sampled: SHAP on a subset of trees · "
+         "path: fast path decomposition"
+)
+
 predict_btn = st.sidebar.button("🚀 Predict Churn Risk")
 
 # =========================
@@ -62,16 +77,23 @@ if predict_btn:
         "Payment Method": payment
     }])
 
-    probability = model.predict_proba(input_data)[0][1]
+    # Same inputs as an earlier click (any session) come from the cache
+    with timer("individual.predict"):
+        probability = predict_proba_cached(
+            model, input_data, model_version(MODEL_PATH), get_cache("individual")
+        )[0][1]
     risk_percent = round(probability * 100, 2)
 
+    medium_percent = round(MEDIUM_RISK_THRESHOLD * 100, 2)
+    high_percent = round(HIGH_RISK_THRESHOLD * 100, 2)
+
     # =========================
     # Risk Classification
     # =========================
-    if risk_percent < 40:
+    if risk_percent < medium_percent:
         segment = "Loyal Customer"
         bar_color = "#00FF88"   # Green
-    elif risk_percent < 70:
+    elif risk_percent < high_percent:
         segment = "At Risk"
         bar_color = "#FFA500"   # Orange
     else:
@@ -87,16 +109,17 @@ if predict_btn:
         st.subheader("📊 Risk Score")
         st.metric("Churn Probability", f"{risk_percent}%")
 
-        if risk_percent < 40:
+        if risk_percent < medium_percent:
             st.success("🟢 Low Risk")
-        elif risk_percent < 70:
+        elif risk_percent < high_percent:
             st.warning("🟡 Medium Risk")
         else:
             st.error("🔴 High Risk")
 
         # Generate PDF in memory
         pdf_buffer = io.BytesIO()
-        generate_pdf(pdf_buffer, risk_percent, segment)
+        with timer("individual.pdf"):
+            generate_pdf(pdf_buffer, risk_percent, segment)
 
         st.download_button(
             label="📄 Download PDF Report",
@@ -110,6 +133,7 @@ if predict_btn:
     # =========================
     with col2:
 
+        charts_timer = stopwatch("individual.charts")
         fig = go.Figure(go.Indicator(
             mode="gauge+number",
             value=risk_percent,
@@ -119,9 +143,9 @@ if predict_btn:
                 'axis': {'range': [0, 100]},
                 'bar': {'color': bar_color},  # Dynamic color
                 'steps': [
-                    {'range': [0, 40], 'color': "#0F3D2E"},
-                    {'range': [40, 70], 'color': "#3D2F0F"},
-                    {'range': [70, 100], 'color': "#3D0F0F"},
+                    {'range': [0, medium_percent], 'color': "#0F3D2E"},
+                    {'range': [medium_percent, high_percent], 'color': "#3D2F0F"},
+                    {'range': [high_percent, 100], 'color': "#3D0F0F"},
                 ],
             }
         ))
@@ -152,6 +176,7 @@ if predict_btn:
         title=f"Customer Classified As: {segment}"
     )
     st.plotly_chart(seg_chart, use_container_width=True)
+    charts_timer.stop()
 
     # =========================
     # SHAP Explainability
@@ -159,17 +184,13 @@ if predict_btn:
     st.subheader("🧠 Model Explainability")
 
     try:
-        rf_model = model.named_steps['model']
-        transformed = model.named_steps['preprocessing'].transform(input_data)
-
-        explainer = shap.TreeExplainer(rf_model)
-        shap_values = explainer.shap_values(transformed)
+        # Explainer is built once per loaded model and reused across clicks
+        with timer("individual.shap"):
+            shap_df = pd.DataFrame({
+                "Feature": feature_names(model),
+                "Feature Impact": shap_values(model, input_data, mode=explain_mode)[0]
+            })
 
-        shap_df = pd.DataFrame({
-            "Feature Impact": shap_values[1][0]
-        })
-
-        shap_df["Feature"] = shap_df.index
         shap_df = shap_df.sort_values("Feature Impact", ascending=False).head(6)
 
         shap_chart = px.bar(
@@ -205,4 +226,6 @@ if predict_btn:
         insights.append("• No strong churn drivers detected.")
 
     for item in insights:
-        st.write(item)
\ No newline at end of file
+        st.write(item)
+
+debug_panel(run_timings)
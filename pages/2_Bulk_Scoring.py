@@ -1,87 +1,81 @@
 import streamlit as st
-import pandas as pd
-import joblib
 import os
-
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler, OneHotEncoder
-from sklearn.compose import ColumnTransformer
-from sklearn.pipeline import Pipeline
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.metrics import roc_auc_score
+import tempfile
+import time
+from functools import partial
+
+from utils.columnar import (
+    FORMAT_LABELS, MIME_TYPES, STREAM_OUTPUT_FORMATS, UPLOAD_TYPES, file_format,
+    read_preview, total_rows
+)
+from utils.compression import compressed_path
+from utils.dashboard_data import upload_key
+from utils.debug_panel import debug_panel
+from utils.explain import (
+    EXPLAIN_MODES, TOP_K_DRIVERS, choose_mode, driver_columns, exact_seconds_per_row
+)
+from utils.inference import scoring_model
+from utils.metrics import start_run, timer
+from utils.model_registry import artifact_version, get_model, model_info, model_version
+from utils.parallel_scoring import SCORING_WORKERS
+from utils.schema import REQUIRED_COLUMNS, missing_columns, model_categories
+from utils.scoring import score_file_in_chunks
+from utils.training_jobs import ACTIVE_STATES, job_status, start_training
 
 st.title("📂 Bulk Customer Churn Scoring (SaaS Version)")
 
-MODEL_PATH = "data/saas_churn_pipeline.pkl"
-
-uploaded_file = st.file_uploader("Upload Customer CSV File", type=["csv"])
-
-# =========================
-# TRAIN MODEL FUNCTION
-# =========================
-def train_model(df):
-
-    df["churn"] = df["churn"].map({"Yes": 1, "No": 0})
-
-    features = [
-        "tenure_months",
-        "monthly_fee",
-        "avg_weekly_usage_hours",
-        "support_tickets",
-        "payment_failures",
-        "last_login_days_ago",
-        "plan_type"
-    ]
-
-    X = df[features]
-    y = df["churn"]
+run_timings = start_run()
 
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.2, random_state=42, stratify=y
-    )
+MODEL_PATH = "data/saas_churn_pipeline.pkl"
 
-    numeric_features = [
-        "tenure_months",
-        "monthly_fee",
-        "avg_weekly_usage_hours",
-        "support_tickets",
-        "payment_failures",
-        "last_login_days_ago"
-    ]
-
-    categorical_features = ["plan_type"]
-
-    preprocessor = ColumnTransformer(
-        transformers=[
-            ("num", StandardScaler(), numeric_features),
-            ("cat", OneHotEncoder(handle_unknown="ignore"), categorical_features),
-        ]
-    )
+# Uploads above this size are trained out-of-core
+OUT_OF_CORE_BYTES = 200 * 1024 * 1024
 
-    model = RandomForestClassifier(
-        n_estimators=300,
-        random_state=42,
-        class_weight="balanced"
-    )
+JOB_POLL_SECONDS = 2
 
-    pipeline = Pipeline(
-        steps=[
-            ("preprocessing", preprocessor),
-            ("model", model)
-        ]
-    )
+# Streamlit holds a download button's data in server memory for the
+# session, so larger scored files are left on disk and not offered in the
+# browser
+MAX_DOWNLOAD_BYTES = 512 * 1024 * 1024
 
-    pipeline.fit(X_train, y_train)
+uploaded_file = st.file_uploader(
+    "Upload Customer File (CSV, Parquet or Feather)", type=UPLOAD_TYPES
+)
 
-    probs = pipeline.predict_proba(X_test)[:,1]
-    auc = roc_auc_score(y_test, probs)
+# =========================
+# EXPLANATION COST
+# =========================
+# Exact SHAP timed once per model version, not on every rerun
+@st.cache_data(max_entries=8, show_spinner="Timing explanations...")
+def exact_explain_cost(model_version, _model, _X):
+    return exact_seconds_per_row(_model, _X)
 
-    st.success(f"✅ Model trained successfully (ROC-AUC: {round(auc,3)})")
 
-    os.makedirs("data", exist_ok=True)
-    joblib.dump(pipeline, MODEL_PATH)
+# =========================
+# TRAINING JOB STATUS
+# =========================
+def show_training_job(status):
+
+    # Polls the background job; the fit runs in its own process, so this
+    # session only sleeps between reruns. None: a job is being set up but
+    # has not written its status yet
+    if status is None or status["phase"] == "starting":
+        st.info("🔄 No trained model found. Starting a training job...")
+    elif status["phase"] == "compressing":
+        st.info("🗜️ Building a compressed copy of the model for serving...")
+    elif status["phase"] == "saving":
+        st.info("💾 Saving the trained model...")
+    else:
+        mode = "out-of-core" if status.get("out_of_core") else "in-memory"
+        st.info(f"🔄 No trained model found. Training in the background ({mode})...")
+        if status.get("out_of_core"):
+            st.progress(
+                status["fraction"],
+                text=f"Trained on {status['rows']:,} rows ({status['seconds']:.0f}s)"
+            )
 
-    return pipeline
+    time.sleep(JOB_POLL_SECONDS)
+    st.rerun()
 
 
 # =========================
@@ -90,23 +84,20 @@ def train_model(df):
 
 if uploaded_file:
 
-    df = pd.read_csv(uploaded_file)
+    # Only the first rows are parsed for the preview; the full file is
+    # streamed in chunks during scoring.
+    input_format = file_format(uploaded_file.name)
+    with timer("bulk.read_preview"):
+        preview_df = read_preview(uploaded_file, input_format)
+        n_rows = total_rows(uploaded_file, input_format)
 
     st.subheader("📊 Uploaded Data Preview")
-    st.dataframe(df.head())
+    st.dataframe(preview_df)
 
-    # Validate required columns
-    required_columns = [
-        "tenure_months",
-        "monthly_fee",
-        "avg_weekly_usage_hours",
-        "support_tickets",
-        "payment_failures",
-        "last_login_days_ago",
-        "plan_type"
-    ]
+    # Validate required columns (values are checked per chunk while scoring)
+    required_columns = REQUIRED_COLUMNS
 
-    missing = set(required_columns) - set(df.columns)
+    missing = missing_columns(preview_df.columns)
 
     if missing:
         st.error(f"❌ Missing required columns: {missing}")
@@ -117,36 +108,219 @@ if uploaded_file:
     # =========================
     if not os.path.exists(MODEL_PATH):
 
-        st.info("🔄 No trained model found. Training now...")
-        model = train_model(df)
+        status = job_status(MODEL_PATH)
+
+        if status is not None and status["state"] == "failed":
+            st.error(f"❌ Training failed: {status['error']}")
+            if not st.button("Retry training"):
+                st.stop()
+            status = None
+
+        # Joins the running job if another session already started one
+        if status is None or status["state"] not in ACTIVE_STATES:
+            status = start_training(
+                uploaded_file, input_format, MODEL_PATH,
+                out_of_core=uploaded_file.size > OUT_OF_CORE_BYTES
+            )
+
+        show_training_job(status)
 
     else:
-        model = joblib.load(MODEL_PATH)
+        model = get_model(MODEL_PATH)
+        scoring_path = MODEL_PATH
         st.success("✅ Loaded existing trained model")
 
+        status = job_status(MODEL_PATH)
+        if status is not None and status["state"] == "done":
+            if status["rows_rejected"]:
+                st.warning(
+                    f"⚠️ Trained without {status['rows_rejected']:,} rows that failed validation"
+                )
+            st.caption(
+                f"Trained on {status['rows']:,} rows in {status['seconds']:.1f}s "
+                f"(ROC-AUC: {round(status['auc'],3)})"
+            )
+
+        # The compressed copy has fewer / shallower trees with holdout AUC
+        # within tolerance of the full forest
+        if os.path.exists(compressed_path(MODEL_PATH)):
+            if st.checkbox("Score with the compressed model (faster)", value=True):
+                scoring_path = compressed_path(MODEL_PATH)
+                model = get_model(scoring_path)
+
+            summary = (status or {}).get("compressed")
+            if summary:
+                depth = summary["max_depth"] or "full"
+                st.caption(
+                    f"Compressed: {summary['trees']} trees, depth {depth}, "
+                    f"{summary['nodes']:,} of {summary['full_nodes']:,} nodes "
+                    f"(holdout ROC-AUC {summary['auc']:.3f} vs {summary['full_auc']:.3f})"
+                )
+
+        info = model_info(scoring_path)[0]
+        st.caption(
+            f"Model {info['version']} · loaded in {info['load_seconds']:.2f}s "
+            f"· ~{info['memory_mb']:.1f} MB"
+        )
+
     # =========================
-    # Bulk Scoring
+    # Bulk Scoring (streamed)
     # =========================
 
-    X_score = df[required_columns]
+    keep_all_columns = st.checkbox(
+        "Include all uploaded columns in scored file",
+        value=True
+    )
+
+    n_workers = st.number_input(
+        "Scoring worker processes",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=min(SCORING_WORKERS, os.cpu_count() or 1)
+    )
+
+    add_drivers = st.checkbox(
+        "Add top churn drivers per customer (SHAP, slower)",
+        value=False
+    )
+
+    top_k = st.number_input(
+        "Drivers per customer", min_value=1, max_value=5, value=TOP_K_DRIVERS
+    ) if add_drivers else TOP_K_DRIVERS
+
+    driver_mode = st.selectbox(
+        "Driver explanation mode",
+        ["auto"] + EXPLAIN_MODES,
+        help="exact: full SHAP · sampled: SHAP on a subset of trees · "
+             "path: fast path decomposition · auto: most accurate within the time budget"
+    ) if add_drivers else "exact"
+
+    if add_drivers and driver_mode == "auto":
+        budget_seconds = st.number_input(
+            "Explanation time budget (seconds)", min_value=1, value=60
+        )
+
+        # Columnar files know their row count; for CSV it is estimated
+        # from the line density of the first 64 KB
+        estimated_rows = n_rows
+        if estimated_rows is None:
+            head = uploaded_file.getbuffer()[:65536].tobytes()
+            estimated_rows = int(
+                uploaded_file.size * max(head.count(b"\n") - 1, 1) / max(len(head), 1)
+            )
+
+        driver_mode = choose_mode(
+            model, preview_df[required_columns], budget_seconds,
+            n_rows=estimated_rows, n_workers=n_workers,
+            exact_per_row=exact_explain_cost(
+                artifact_version(scoring_path), model, preview_df[required_columns]
+            )
+        )
+        st.caption(f"~{estimated_rows:,} rows → using **{driver_mode}** explanations")
+
+    explain_fn = (
+        partial(driver_columns, model_path=scoring_path, k=top_k, n_workers=n_workers,
+                mode=driver_mode)
+        if add_drivers else None
+    )
+
+    output_format = st.selectbox(
+        "Scored file format",
+        STREAM_OUTPUT_FORMATS,
+        format_func=FORMAT_LABELS.get
+    )
 
-    probabilities = model.predict_proba(X_score)[:,1]
+    usecols = list(preview_df.columns) if keep_all_columns else required_columns
 
-    df["Churn Probability"] = probabilities
+    progress_bar = st.progress(0.0)
+    status = st.empty()
 
-    df["Risk Level"] = df["Churn Probability"].apply(
-        lambda x: "High" if x > 0.7 else "Medium" if x > 0.4 else "Low"
+    def show_progress(rows, elapsed, fraction):
+        if fraction is not None:
+            progress_bar.progress(fraction)
+        rate = rows / elapsed if elapsed > 0 else 0
+        status.write(f"⚙️ Scored {rows:,} rows ({rate:,.0f} rows/sec)")
+
+    # Reruns (widget changes, the download click) reuse the last result
+    # while the upload, the model and the output settings are unchanged
+    score_key = (
+        upload_key(uploaded_file), model_version(scoring_path), tuple(usecols),
+        output_format, add_drivers, top_k, driver_mode
+    )
+    result = st.session_state.get("scored_result")
+
+    if (
+        result is None or st.session_state.get("scored_key") != score_key
+        or not os.path.exists(result["output_path"])
+    ):
+
+        # Scored rows go to disk; drop the file from this session's last run
+        if result is not None and os.path.exists(result["output_path"]):
+            os.remove(result["output_path"])
+        st.session_state.pop("scored_result", None)
+
+        output_file = tempfile.NamedTemporaryFile(
+            prefix="scored_customers_", suffix=f".{output_format}", delete=False
+        )
+        output_file.close()
+
+        # Per-stage timings (read / validate / predict / explain / write) are
+        # recorded inside the scorer
+        result = score_file_in_chunks(
+            uploaded_file,
+            scoring_model(model),
+            output_file.name,
+            usecols=usecols,
+            total_bytes=uploaded_file.size,
+            on_progress=show_progress,
+            model_path=scoring_path,
+            n_workers=n_workers,
+            explain_fn=explain_fn,
+            input_format=input_format,
+            output_format=output_format,
+            total_rows=n_rows,
+            categories=model_categories(model)
+        )
+        st.session_state["scored_result"] = result
+        st.session_state["scored_key"] = score_key
+
+    progress_bar.progress(1.0)
+    rate = result["rows"] / result["seconds"] if result["seconds"] > 0 else 0
+    status.write(
+        f"✅ Scored {result['rows']:,} rows in {result['seconds']:.1f}s "
+        f"({rate:,.0f} rows/sec)"
     )
 
+    if result["rows_rejected"]:
+        st.warning(
+            f"⚠️ {result['rows_rejected']:,} rows failed validation and were not scored"
+        )
+        with st.expander("Rejected rows"):
+            st.dataframe(result["bad_rows"].head(1000))
+            st.download_button(
+                "📥 Download Rejected Rows Report",
+                result["bad_rows"].to_csv(index=False).encode("utf-8"),
+                "rejected_rows.csv",
+                "text/csv"
+            )
+
     st.subheader("📈 Scored Results")
-    st.dataframe(df.head())
+    st.dataframe(result["preview"])
 
     # Download
-    csv = df.to_csv(index=False).encode("utf-8")
-
-    st.download_button(
-        "📥 Download Scored CSV",
-        csv,
-        "scored_customers.csv",
-        "text/csv"
-    )
\ No newline at end of file
+    output_bytes = os.path.getsize(result["output_path"])
+    if output_bytes > MAX_DOWNLOAD_BYTES:
+        st.info(
+            f"ℹ️ The scored file ({output_bytes / 1024 ** 2:,.0f} MB) is too large to "
+            f"serve in the browser. It was written to `{result['output_path']}`."
+        )
+    else:
+        with open(result["output_path"], "rb") as scored_file:
+            st.download_button(
+                f"📥 Download Scored {FORMAT_LABELS[output_format]}",
+                scored_file.read(),
+                f"scored_customers.{output_format}",
+                MIME_TYPES[output_format]
+            )
+
+    debug_panel(run_timings)
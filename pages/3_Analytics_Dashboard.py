@@ -1,9 +1,23 @@
 import streamlit as st
-import pandas as pd
-import joblib
+import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
 import os
 
+from utils.dashboard_data import (
+    file_export, kpis, plan_risk, risk_distribution, scored_frame, ticket_box_stats,
+    ticket_outliers, upload_key, usage_risk_density, usage_risk_outliers
+)
+from utils.columnar import (
+    EXPORT_FORMATS, FORMAT_LABELS, MIME_TYPES, UPLOAD_TYPES, file_format, read_preview
+)
+from utils.debug_panel import debug_panel
+from utils.metrics import start_run, stopwatch, timer
+from utils.model_registry import artifact_version
+from utils.parallel_scoring import SCORING_WORKERS
+from utils.risk import HIGH_RISK_THRESHOLD, MEDIUM_RISK_THRESHOLD, RISK_LEVELS
+from utils.schema import missing_columns
+
 # ==============================
 # PAGE CONFIG
 # ==============================
@@ -11,6 +25,8 @@ st.set_page_config(layout="wide")
 st.title("📊 SaaS Churn Analytics Dashboard")
 st.write("Upload customer dataset to analyze churn risk insights.")
 
+run_timings = start_run()
+
 MODEL_PATH = "data/saas_churn_pipeline.pkl"
 
 # ==============================
@@ -25,29 +41,22 @@ risk_colors = {
 # ==============================
 # FILE UPLOAD
 # ==============================
-uploaded_file = st.file_uploader("Upload CSV for Analytics", type=["csv"])
+uploaded_file = st.file_uploader(
+    "Upload CSV, Parquet or Feather for Analytics", type=UPLOAD_TYPES
+)
 
 if uploaded_file:
 
-    df = pd.read_csv(uploaded_file)
+    with timer("dashboard.read_preview"):
+        preview_df = read_preview(uploaded_file, file_format(uploaded_file.name))
 
     st.subheader("📁 Dataset Preview")
-    st.dataframe(df.head())
+    st.dataframe(preview_df)
 
     # ==============================
     # REQUIRED COLUMNS
     # ==============================
-    required_columns = [
-        "tenure_months",
-        "monthly_fee",
-        "avg_weekly_usage_hours",
-        "support_tickets",
-        "payment_failures",
-        "last_login_days_ago",
-        "plan_type"
-    ]
-
-    missing = set(required_columns) - set(df.columns)
+    missing = missing_columns(preview_df.columns)
 
     if missing:
         st.error(f"❌ Missing required columns: {missing}")
@@ -58,18 +67,33 @@ if uploaded_file:
         st.stop()
 
     # ==============================
-    # LOAD MODEL
+    # SCORE (model loaded once per process / worker)
     # ==============================
-    model = joblib.load(MODEL_PATH)
+    n_workers = st.sidebar.number_input(
+        "Scoring worker processes",
+        min_value=1,
+        max_value=os.cpu_count() or 1,
+        value=min(SCORING_WORKERS, os.cpu_count() or 1)
+    )
 
-    X = df[required_columns]
-    probabilities = model.predict_proba(X)[:, 1]
+    # Scored frame and aggregates are cached per (upload, model version)
+    data_key = upload_key(uploaded_file)
+    model_version = artifact_version(MODEL_PATH)
 
-    df["Churn Probability"] = probabilities
+    df, bad_rows = scored_frame(data_key, model_version, uploaded_file, MODEL_PATH, n_workers)
 
-    df["Risk Level"] = df["Churn Probability"].apply(
-        lambda x: "High" if x > 0.7 else "Medium" if x > 0.4 else "Low"
-    )
+    if not bad_rows.empty:
+        st.warning(
+            f"⚠️ {bad_rows['row'].nunique():,} rows failed validation and were left out"
+        )
+        with st.expander("Rejected rows"):
+            st.dataframe(bad_rows.head(1000))
+
+    if df.empty:
+        st.error("❌ No valid rows to analyse.")
+        st.stop()
+
+    show_outliers = st.sidebar.checkbox("Overlay a sample of outlier customers", value=False)
 
     st.success("✅ Analytics Generated Successfully")
 
@@ -78,11 +102,15 @@ if uploaded_file:
     # ==============================
     st.divider()
 
-    col1, col2, col3 = st.columns(3)
+    col1, col2, col3, col4, col5 = st.columns(5)
+
+    summary = kpis(data_key, model_version, df)
 
-    col1.metric("Total Customers", len(df))
-    col2.metric("Avg Churn Risk %", round(df["Churn Probability"].mean() * 100, 2))
-    col3.metric("High Risk Customers", (df["Risk Level"] == "High").sum())
+    col1.metric("Total Customers", summary["total_customers"])
+    col2.metric("Avg Churn Risk %", summary["avg_churn_risk_pct"])
+    col3.metric("High Risk Customers", summary["high_risk_customers"])
+    col4.metric("MRR", f"${summary['mrr']:,.0f}")
+    col5.metric("ARPU", f"${summary['arpu']:,.2f}")
 
     st.divider()
 
@@ -91,9 +119,13 @@ if uploaded_file:
     # ==============================
     st.subheader("📌 Risk Level Distribution")
 
+    # Figure building and serialization for all four charts
+    charts_timer = stopwatch("dashboard.charts")
+
     risk_chart = px.pie(
-        df,
+        risk_distribution(data_key, model_version, df),
         names="Risk Level",
+        values="Customers",
         color="Risk Level",
         color_discrete_map=risk_colors,
         title="Customer Risk Segmentation"
@@ -111,10 +143,8 @@ if uploaded_file:
     # ==============================
     st.subheader("📈 Plan Type vs Average Churn Risk")
 
-    plan_risk = df.groupby("plan_type")["Churn Probability"].mean().reset_index()
-
     bar_chart = px.bar(
-        plan_risk,
+        plan_risk(data_key, model_version, df),
         x="plan_type",
         y="Churn Probability",
         title="Average Risk by Plan Type",
@@ -135,16 +165,37 @@ if uploaded_file:
     # ==============================
     st.subheader("📉 Usage vs Churn Risk")
 
-    scatter = px.scatter(
-        df,
-        x="avg_weekly_usage_hours",
-        y="Churn Probability",
-        color="Risk Level",
-        color_discrete_map=risk_colors,
-        title="Usage Behavior vs Risk"
-    )
+    # Binned on the server: payload size is set by the bin count
+    density = usage_risk_density(data_key, model_version, df)
+
+    scatter = go.Figure(go.Heatmap(
+        x=density["x"],
+        y=density["y"],
+        z=np.where(density["counts"] == 0, np.nan, density["counts"]),
+        colorscale="Blues",
+        colorbar={"title": "Customers"}
+    ))
+
+    # Risk band boundaries
+    scatter.add_hline(y=MEDIUM_RISK_THRESHOLD, line_dash="dash", line_color=risk_colors["Medium"])
+    scatter.add_hline(y=HIGH_RISK_THRESHOLD, line_dash="dash", line_color=risk_colors["High"])
+
+    if show_outliers:
+        outliers = usage_risk_outliers(data_key, model_version, df)
+        for level in RISK_LEVELS:
+            points = outliers[outliers["Risk Level"] == level]
+            scatter.add_trace(go.Scatter(
+                x=points["avg_weekly_usage_hours"],
+                y=points["Churn Probability"],
+                mode="markers",
+                name=level,
+                marker={"color": risk_colors[level], "size": 5}
+            ))
 
     scatter.update_layout(
+        title="Usage Behavior vs Risk",
+        xaxis_title="avg_weekly_usage_hours",
+        yaxis_title="Churn Probability",
         paper_bgcolor="#0E1117",
         plot_bgcolor="#0E1117",
         font_color="white"
@@ -157,33 +208,63 @@ if uploaded_file:
     # ==============================
     st.subheader("🎫 Support Tickets Impact")
 
-    ticket_chart = px.box(
-        df,
-        x="Risk Level",
-        y="support_tickets",
-        color="Risk Level",
-        color_discrete_map=risk_colors,
-        title="Support Tickets vs Risk Level"
-    )
+    # Quartiles and whiskers precomputed on the server
+    ticket_chart = go.Figure()
+
+    for box in ticket_box_stats(data_key, model_version, df).to_dict("records"):
+        level = box["Risk Level"]
+        ticket_chart.add_trace(go.Box(
+            name=level,
+            x=[level],
+            q1=[box["q1"]],
+            median=[box["median"]],
+            q3=[box["q3"]],
+            lowerfence=[box["lower_whisker"]],
+            upperfence=[box["upper_whisker"]],
+            marker_color=risk_colors[level]
+        ))
+
+    if show_outliers:
+        outliers = ticket_outliers(data_key, model_version, df)
+        for level in RISK_LEVELS:
+            points = outliers[outliers["Risk Level"] == level]
+            ticket_chart.add_trace(go.Scatter(
+                x=[level] * len(points),
+                y=points["support_tickets"],
+                mode="markers",
+                showlegend=False,
+                marker={"color": risk_colors[level], "size": 4}
+            ))
 
     ticket_chart.update_layout(
+        title="Support Tickets vs Risk Level",
+        xaxis_title="Risk Level",
+        yaxis_title="support_tickets",
         paper_bgcolor="#0E1117",
         plot_bgcolor="#0E1117",
         font_color="white"
     )
 
     st.plotly_chart(ticket_chart, use_container_width=True)
+    charts_timer.stop()
 
     # ==============================
     # DOWNLOAD ANALYTICS FILE
     # ==============================
     st.divider()
 
-    csv = df.to_csv(index=False).encode("utf-8")
+    export_format = st.selectbox(
+        "Export format", EXPORT_FORMATS, format_func=FORMAT_LABELS.get
+    )
+
+    with timer("dashboard.export"):
+        export = file_export(data_key, model_version, export_format, df)
 
     st.download_button(
         "📥 Download Analytics Data",
-        csv,
-        "analytics_output.csv",
-        "text/csv"
-    )
\ No newline at end of file
+        export,
+        f"analytics_output.{export_format}",
+        MIME_TYPES[export_format]
+    )
+
+    debug_panel(run_timings)
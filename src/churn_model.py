@@ -1,3 +1,4 @@
+import sys
 import pandas as pd
 import numpy as np
 import joblib
@@ -13,17 +14,19 @@ from sklearn.metrics import (
     roc_auc_score
 )
 
+sys.path.append("..")
+from utils.flat_forest import save_flat_forest
+from utils.telco_data import load_telco
+
 # =========================
 # Load and Clean Data
 # =========================
 
-df = pd.read_excel("../data/Telco_customer_churn.xlsx")
+# Cleaned copy cached as Parquet (Total Charges numeric, Churn 0/1)
+df = load_telco()
 
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
 df = df.dropna(subset=["Total Charges"])
 
-df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
-
 df = df.drop(columns=[
     "CustomerID",
     "Churn Label",
@@ -79,7 +82,7 @@ print("\nClassification Report:\n", classification_report(y_test, predictions))
 roc_score = roc_auc_score(y_test, probabilities)
 print("\nRandom Forest ROC-AUC:", roc_score)
 
-cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring="roc_auc")
+cv_scores = cross_val_score(model, X_train, y_train, cv=5, scoring="roc_auc", n_jobs=-1)
 print("\nCross-Validation ROC-AUC Scores:", cv_scores)
 print("Average CV ROC-AUC:", cv_scores.mean())
 
@@ -90,4 +93,7 @@ print("Average CV ROC-AUC:", cv_scores.mean())
 joblib.dump(scaler, "../data/scaler.pkl")
 joblib.dump(model, "../data/churn_model.pkl")
 
+# Memory-mappable copy of the forest for fast, shared loading
+save_flat_forest(model, "../data/churn_model.flat")
+
 print("\nModel, scaler and columns saved successfully.")
\ No newline at end of file
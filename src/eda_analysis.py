@@ -1,11 +1,12 @@
-import pandas as pd
+import sys
 import matplotlib.pyplot as plt
 
-df = pd.read_excel("../data/Telco_customer_churn.xlsx")
+sys.path.append("..")
+from utils.telco_data import load_telco
+
+df = load_telco()
 
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
 df = df.dropna(subset=["Total Charges"])
-df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
 
 # 1️⃣ Churn by Contract Type
 churn_contract = df.groupby("Contract")["Churn"].mean()
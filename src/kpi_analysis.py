@@ -1,21 +1,21 @@
-import pandas as pd
+import sys
 
-df = pd.read_excel("../data/Telco_customer_churn.xlsx")
+sys.path.append("..")
+from utils.kpi_engine import aggregate_frame
+from utils.telco_data import load_telco
 
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
-df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
+df = load_telco()
 
 # Only drop rows where Total Charges is missing
 df = df.dropna(subset=["Total Charges"])
 
-# KPIs
-total_revenue = df["Total Charges"].sum()
-mrr = df["Monthly Charges"].sum()
-arpu = df["Monthly Charges"].mean()
-churn_rate = df["Churn"].mean() * 100
+# KPIs (single pass, with breakdowns by Contract and Payment Method)
+kpis = aggregate_frame(df)
 
-print("Total Revenue:", total_revenue)
-print("Monthly Recurring Revenue:", mrr)
-print("ARPU:", arpu)
-print("Churn Rate:", churn_rate)
\ No newline at end of file
+print("Total Revenue:", kpis["total_revenue"])
+print("Monthly Recurring Revenue:", kpis["mrr"])
+print("ARPU:", kpis["arpu"])
+print("Churn Rate:", kpis["churn_rate_pct"])
+
+for dimension, table in kpis["breakdowns"].items():
+    print(f"\nBy {dimension}:\n{table.round(2).to_string()}")
\ No newline at end of file
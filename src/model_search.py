@@ -0,0 +1,101 @@
+import sys
+
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.compose import ColumnTransformer
+
+sys.path.append("..")
+from utils.model_search import save_leaderboard, successive_halving
+from utils.telco_data import load_telco
+
+# =====================
+# Load Data
+# =====================
+
+# Cleaned copy cached as Parquet (Total Charges numeric, Churn 0/1)
+df = load_telco()
+
+df = df.dropna(subset=["Total Charges"])
+
+# =====================
+# Feature Sets
+# =====================
+
+# "pipeline" is what pipeline_model.py trains on
+FEATURE_SETS = {
+    "pipeline": {
+        "numeric": ["Tenure Months", "Monthly Charges", "Total Charges"],
+        "categorical": ["Contract", "Internet Service", "Payment Method"]
+    },
+    "extended": {
+        "numeric": ["Tenure Months", "Monthly Charges", "Total Charges"],
+        "categorical": [
+            "Contract", "Internet Service", "Payment Method", "Senior Citizen",
+            "Partner", "Dependents", "Online Security", "Tech Support",
+            "Paperless Billing"
+        ]
+    }
+}
+
+all_columns = sorted({
+    column for features in FEATURE_SETS.values()
+    for column in features["numeric"] + features["categorical"]
+})
+
+X = df[all_columns].copy()
+y = df["Churn"]
+
+
+def make_preprocessor(feature_set, min_frequency):
+    features = FEATURE_SETS[feature_set]
+    return ColumnTransformer([
+        ("num", StandardScaler(), features["numeric"]),
+        ("cat", OneHotEncoder(handle_unknown="infrequent_if_exist", min_frequency=min_frequency),
+         features["categorical"])
+    ])
+
+
+# =====================
+# Search Space
+# =====================
+
+preprocessing_grid = {
+    "feature_set": ["pipeline", "extended"],
+    "min_frequency": [None, 0.05]
+}
+
+forest_grid = {
+    "max_depth": [None, 8, 16],
+    "min_samples_leaf": [1, 5, 20],
+    "max_features": ["sqrt", 0.5]
+}
+
+# =====================
+# Successive Halving
+# =====================
+
+
+def report_round(round_, trees, n_candidates, best):
+    print(f"Round {round_}: {n_candidates} candidates x {trees} trees "
+          f"-> best CV ROC-AUC {best['cv_auc']:.4f}")
+
+
+leaderboard, stats = successive_halving(
+    X, y, make_preprocessor, preprocessing_grid, forest_grid,
+    cache_path="../data/model_search_cache.json", on_round=report_round
+)
+
+print(f"\nModel fits: {stats['model_fits']} (cached: {stats['cached_fits']}), "
+      f"preprocessing fits: {stats['preprocessing_fits']}")
+
+print("\nTop candidates:")
+print(leaderboard.head(10).round(4).to_string())
+
+print("\nAccuracy / cost Pareto front:")
+print(leaderboard[leaderboard["pareto"]].round(4).to_string())
+
+# =====================
+# Save Leaderboard
+# =====================
+
+save_leaderboard(leaderboard, "../data/model_search_leaderboard.csv")
+print("\nLeaderboard saved successfully!")
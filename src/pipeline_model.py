@@ -1,6 +1,7 @@
-import pandas as pd
+import sys
 import joblib
 
+from sklearn.base import clone
 from sklearn.model_selection import train_test_split
 from sklearn.preprocessing import StandardScaler, OneHotEncoder
 from sklearn.compose import ColumnTransformer
@@ -8,17 +9,22 @@ from sklearn.pipeline import Pipeline
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import roc_auc_score
 
+sys.path.append("..")
+from utils.compression import (
+    compress_model, compress_to, compression_summary, save_compressed, serving_report
+)
+from utils.flat_forest import save_flat_forest
+from utils.telco_data import load_telco
+
 # =====================
 # Load Data
 # =====================
 
-df = pd.read_excel("../data/Telco_customer_churn.xlsx")
+# Cleaned copy cached as Parquet (Total Charges numeric, Churn 0/1)
+df = load_telco()
 
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
 df = df.dropna(subset=["Total Charges"])
 
-df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
-
 df = df.drop(columns=[
     "CustomerID",
     "Churn Label",
@@ -48,6 +54,12 @@ X_train, X_test, y_train, y_test = train_test_split(
     X, y, test_size=0.2, random_state=42
 )
 
+# Validation rows for the compression search. Only the tuning fit below
+# leaves them out; the saved pipeline is trained on all of X_train.
+X_fit, X_val, y_fit, y_val = train_test_split(
+    X_train, y_train, test_size=0.2, random_state=42
+)
+
 # =====================
 # Identify Columns
 # =====================
@@ -82,6 +94,13 @@ pipeline = Pipeline([
 # Train
 # =====================
 
+# Fewest trees / shallowest depth with validation ROC-AUC within
+# tolerance, chosen on a copy fit without the validation rows
+tuning = clone(pipeline).fit(X_fit, y_fit)
+_, table = compress_model(tuning, X_val, y_val)
+summary = compression_summary(table)
+del tuning
+
 pipeline.fit(X_train, y_train)
 
 # =====================
@@ -98,4 +117,20 @@ print("Pipeline ROC-AUC:", roc_score)
 # =====================
 
 joblib.dump(pipeline, "../data/churn_pipeline.pkl")
-print("Pipeline saved successfully!")
\ No newline at end of file
+
+# Memory-mappable copy of the forest for fast, shared loading
+save_flat_forest(pipeline, "../data/churn_pipeline.flat")
+print("Pipeline saved successfully!")
+
+# =====================
+# Compressed Copy for Serving
+# =====================
+
+# The tuned settings applied to the full pipeline; both are scored on
+# the untouched test set below
+compressed = compress_to(pipeline, summary["max_depth"], summary["trees"])
+save_compressed(compressed, "../data/churn_pipeline.pkl")
+
+print(f"\nCompressed pipeline: {summary['trees']} trees, max depth {summary['max_depth']}")
+print(serving_report({"full": pipeline, "compressed": compressed}, X_test, y_test)
+      .round(4).to_string(index=False))
\ No newline at end of file
@@ -1,22 +1,18 @@
-import pandas as pd
+import sys
 
-df = pd.read_excel("../data/Telco_customer_churn.xlsx")
+sys.path.append("..")
+from utils.kpi_engine import aggregate_frame
+from utils.telco_data import load_telco
 
-df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
-df = df.dropna(subset=["Total Charges"])
-df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
-
-# High Value Customers (Above average CLTV)
-avg_cltv = df["CLTV"].mean()
-high_value = df[df["CLTV"] > avg_cltv]
+df = load_telco()
 
-# High Risk Customers (High Churn Score)
-high_risk = df[df["Churn Score"] > 80]
+df = df.dropna(subset=["Total Charges"])
 
-# Intersection
-high_value_risk = high_value[high_value["Churn Score"] > 80]
+# One pass: high value (CLTV above average), high risk (Churn Score > 80)
+# and their intersection, without copying the matching rows
+kpis = aggregate_frame(df)
 
-print("Total Customers:", len(df))
-print("High Value Customers:", len(high_value))
-print("High Risk Customers:", len(high_risk))
-print("High Value & High Risk Customers:", len(high_value_risk))
\ No newline at end of file
+print("Total Customers:", kpis["customers"])
+print("High Value Customers:", kpis["high_value_customers"])
+print("High Risk Customers:", kpis["high_risk_customers"])
+print("High Value & High Risk Customers:", kpis["high_value_high_risk_customers"])
\ No newline at end of file
@@ -0,0 +1,63 @@
+import json
+import random
+import time
+import numpy as np
+import requests
+
+url = "http://127.0.0.1:5000/predict_batch"
+
+BATCH_SIZES = [1, 10, 100, 1000, 10000]
+TOTAL_RECORDS = 20000   # per batch size, spread over as many requests as needed
+MIN_REQUESTS = 5
+MAX_REQUESTS = 200
+
+random.seed(42)
+
+
+def make_record():
+    tenure = random.randint(1, 72)
+    monthly = round(random.uniform(18, 120), 2)
+    return {
+        "Tenure Months": tenure,
+        "Monthly Charges": monthly,
+        "Total Charges": round(tenure * monthly, 2),
+        "Contract": random.choice(["Month-to-month", "One year", "Two year"]),
+        "Internet Service": random.choice(["DSL", "Fiber optic", "No"]),
+        "Payment Method": random.choice([
+            "Electronic check", "Mailed check",
+            "Bank transfer (automatic)", "Credit card (automatic)"
+        ])
+    }
+
+
+session = requests.Session()
+
+print(f"{'batch':>7}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}{'records/sec':>14}")
+
+for batch_size in BATCH_SIZES:
+    records = [make_record() for _ in range(batch_size)]
+    n_requests = min(MAX_REQUESTS, max(MIN_REQUESTS, TOTAL_RECORDS // batch_size))
+
+    # Alternate JSON and newline-delimited JSON bodies
+    ndjson_body = "\n".join(json.dumps(r) for r in records)
+
+    latencies = []
+    start = time.perf_counter()
+
+    for i in range(n_requests):
+        t0 = time.perf_counter()
+        if i % 2:
+            response = session.post(
+                url, data=ndjson_body,
+                headers={"Content-Type": "application/x-ndjson"}
+            )
+        else:
+            response = session.post(url, json=records)
+        latencies.append(time.perf_counter() - t0)
+        response.raise_for_status()
+
+    elapsed = time.perf_counter() - start
+    p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+
+    print(f"{batch_size:>7}{n_requests:>10}{p50:>10.1f}{p99:>10.1f}"
+          f"{batch_size * n_requests / elapsed:>14,.0f}")
@@ -0,0 +1,52 @@
+import random
+import sys
+import time
+import numpy as np
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+url = "http://127.0.0.1:5000/predict"
+stats_url = "http://127.0.0.1:5000/batching_stats"
+
+CALLERS = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+REQUESTS_PER_CALLER = 10
+
+random.seed(42)
+
+
+def make_record():
+    tenure = random.randint(1, 72)
+    monthly = round(random.uniform(18, 120), 2)
+    return {
+        "Tenure Months": tenure,
+        "Monthly Charges": monthly,
+        "Total Charges": round(tenure * monthly, 2),
+        "Contract": random.choice(["Month-to-month", "One year", "Two year"]),
+        "Internet Service": random.choice(["DSL", "Fiber optic", "No"]),
+        "Payment Method": random.choice([
+            "Electronic check", "Mailed check",
+            "Bank transfer (automatic)", "Credit card (automatic)"
+        ])
+    }
+
+
+def caller(_):
+    session = requests.Session()
+    latencies = []
+    for _ in range(REQUESTS_PER_CALLER):
+        t0 = time.perf_counter()
+        session.post(url, json=make_record()).raise_for_status()
+        latencies.append(time.perf_counter() - t0)
+    return latencies
+
+
+start = time.perf_counter()
+with ThreadPoolExecutor(max_workers=CALLERS) as pool:
+    latencies = [t for result in pool.map(caller, range(CALLERS)) for t in result]
+elapsed = time.perf_counter() - start
+
+p50, p99 = np.percentile(latencies, [50, 99]) * 1000
+print(f"Callers: {CALLERS}  Requests: {len(latencies)}")
+print(f"Throughput: {len(latencies) / elapsed:,.0f} req/sec")
+print(f"Latency p50: {p50:.1f} ms  p99: {p99:.1f} ms")
+print("Server batching stats:", requests.get(stats_url).json())
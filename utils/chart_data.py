@@ -0,0 +1,89 @@
+import numpy as np
+
+from utils.risk import RISK_LEVELS
+
+# ==============================
+# SERVER-SIDE CHART AGGREGATION
+# ==============================
+# The dashboard charts are built from these summaries instead of raw rows,
+# so what goes to the browser depends on the number of bins / groups, not
+# on the number of customers.
+
+DENSITY_BINS = (60, 40)
+OUTLIERS_PER_LEVEL = 200
+
+
+def _shuffled(df, seed):
+    return df.sample(frac=1, random_state=seed)
+
+
+def binned_density(df, x, y, bins=DENSITY_BINS, y_range=(0.0, 1.0)):
+
+    data = df[[x, y]].dropna()
+    xs = data[x].to_numpy(dtype=float)
+    ys = data[y].to_numpy(dtype=float)
+
+    x_range = (xs.min(), xs.max()) if len(xs) else (0.0, 1.0)
+    if x_range[0] == x_range[1]:
+        x_range = (x_range[0] - 0.5, x_range[1] + 0.5)
+
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins, range=[x_range, y_range])
+
+    return {
+        "x": (x_edges[:-1] + x_edges[1:]) / 2,
+        "y": (y_edges[:-1] + y_edges[1:]) / 2,
+        "counts": counts.T,   # rows follow y, as heatmaps expect
+        "x_edges": x_edges,
+        "y_edges": y_edges
+    }
+
+
+def sparse_region_sample(df, x, y, group, density, max_count=2,
+                         per_group=OUTLIERS_PER_LEVEL, seed=42):
+
+    # Points that fall in near-empty bins, sampled evenly across groups
+    data = df[[x, y, group]].dropna()
+
+    x_bin = np.clip(np.searchsorted(density["x_edges"], data[x], side="right") - 1,
+                    0, len(density["x"]) - 1)
+    y_bin = np.clip(np.searchsorted(density["y_edges"], data[y], side="right") - 1,
+                    0, len(density["y"]) - 1)
+
+    sparse = density["counts"][y_bin, x_bin] <= max_count
+
+    return _shuffled(data[sparse], seed).groupby(group, observed=True).head(per_group)
+
+
+def box_stats(df, group, value, groups=RISK_LEVELS):
+
+    # Quartiles plus Tukey whiskers (furthest points within 1.5 * IQR),
+    # the same statistics plotly computes client-side for px.box
+    data = df[[group, value]].dropna()
+    grouped = data.groupby(group, observed=False)[value]
+
+    quartiles = grouped.quantile([0.25, 0.5, 0.75]).unstack()
+    quartiles.columns = ["q1", "median", "q3"]
+
+    iqr = quartiles["q3"] - quartiles["q1"]
+    low_fence = data[group].map(quartiles["q1"] - 1.5 * iqr).astype(float)
+    high_fence = data[group].map(quartiles["q3"] + 1.5 * iqr).astype(float)
+
+    inside = data[(data[value] >= low_fence) & (data[value] <= high_fence)]
+    whiskers = inside.groupby(group, observed=False)[value].agg(["min", "max"])
+
+    stats = quartiles.join(whiskers).join(grouped.size().rename("count"))
+    stats = stats.rename(columns={"min": "lower_whisker", "max": "upper_whisker"})
+
+    return stats.reindex(groups).dropna(subset=["median"]).reset_index()
+
+
+def box_outlier_sample(df, group, value, stats, per_group=OUTLIERS_PER_LEVEL, seed=42):
+
+    data = df[[group, value]].dropna()
+    bounds = stats.set_index(group)
+
+    lower = data[group].map(bounds["lower_whisker"]).astype(float)
+    upper = data[group].map(bounds["upper_whisker"]).astype(float)
+    outside = (data[value] < lower) | (data[value] > upper)
+
+    return _shuffled(data[outside], seed).groupby(group, observed=True).head(per_group)
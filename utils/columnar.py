@@ -0,0 +1,170 @@
+import io
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.file_io import rewind
+
+# ==============================
+# COLUMNAR FILE SUPPORT
+# ==============================
+# Uploads and downloads as CSV, Parquet or Arrow IPC / Feather. Columnar
+# files are read with column projection (only the requested columns are
+# decoded) and in record batches, so they feed the same chunked scorer as
+# CSV without a text-parsing step.
+
+UPLOAD_TYPES = ["csv", "parquet", "feather", "arrow"]
+
+# Streamed outputs; Feather cannot be appended to chunk by chunk when
+# category dictionaries differ between chunks, so it is export-only
+STREAM_OUTPUT_FORMATS = ["csv", "parquet"]
+EXPORT_FORMATS = ["csv", "parquet", "feather"]
+
+FORMAT_LABELS = {"csv": "CSV", "parquet": "Parquet", "feather": "Feather"}
+
+MIME_TYPES = {
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+    "feather": "application/vnd.apache.arrow.file"
+}
+
+
+def file_format(name):
+    ext = os.path.splitext(name)[1].lower().lstrip(".")
+    return "feather" if ext == "arrow" else ext
+
+
+# ==============================
+# READING
+# ==============================
+def read_preview(source, fmt, nrows=5):
+
+    if fmt == "parquet":
+        batch = next(pq.ParquetFile(source).iter_batches(batch_size=nrows), None)
+        preview = (
+            batch.to_pandas() if batch is not None
+            else pq.read_schema(source).empty_table().to_pandas()
+        )
+    elif fmt == "feather":
+        reader = pa.ipc.open_file(source)
+        preview = (
+            reader.get_batch(0).slice(0, nrows).to_pandas() if reader.num_record_batches
+            else reader.schema.empty_table().to_pandas()
+        )
+    else:
+        preview = pd.read_csv(source, nrows=nrows)
+
+    rewind(source)
+    return preview
+
+
+def total_rows(source, fmt):
+
+    # Row count from file metadata; unknown for CSV without a full pass
+    if fmt == "parquet":
+        rows = pq.ParquetFile(source).metadata.num_rows
+    elif fmt == "feather":
+        reader = pa.ipc.open_file(source)
+        rows = sum(reader.get_batch(i).num_rows for i in range(reader.num_record_batches))
+    else:
+        return None
+
+    rewind(source)
+    return rows
+
+
+def read_frame(source, fmt, columns=None):
+
+    if fmt == "parquet":
+        df = pq.read_table(source, columns=columns).to_pandas()
+    elif fmt == "feather":
+        df = pa.ipc.open_file(source).read_all()
+        df = (df.select(columns) if columns else df).to_pandas()
+    else:
+        df = pd.read_csv(source, usecols=columns)
+
+    return df
+
+
+def iter_frames(source, fmt, columns=None, chunksize=100_000):
+
+    # DataFrame chunks of at most chunksize rows
+    if fmt == "parquet":
+        batches = pq.ParquetFile(source).iter_batches(batch_size=chunksize, columns=columns)
+    elif fmt == "feather":
+        reader = pa.ipc.open_file(source)
+        batches = (
+            piece
+            for i in range(reader.num_record_batches)
+            for piece in pa.Table.from_batches(
+                [reader.get_batch(i).select(columns) if columns else reader.get_batch(i)]
+            ).to_batches(max_chunksize=chunksize)
+        )
+    else:
+        batches = pd.read_csv(source, usecols=columns, chunksize=chunksize)
+
+    for batch in batches:
+        yield batch if isinstance(batch, pd.DataFrame) else batch.to_pandas()
+
+
+# ==============================
+# WRITING
+# ==============================
+class ChunkWriter:
+
+    # Appends scored chunks to one CSV or Parquet file (one row group per
+    # chunk), so output memory stays bounded like the input side
+
+    def __init__(self, path, fmt="csv"):
+        if fmt not in STREAM_OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported streamed output format: {fmt}")
+        self.path = path
+        self.fmt = fmt
+        self._file = open(path, "w", newline="", encoding="utf-8") if fmt == "csv" else None
+        self._parquet = None
+        self._chunks = 0
+
+    def write(self, chunk):
+
+        if self.fmt == "csv":
+            # Header only once, then append rows as they are scored
+            chunk.to_csv(self._file, index=False, header=(self._chunks == 0))
+        else:
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            else:
+                # Pass-through columns can infer differently per chunk
+                table = table.cast(self._parquet.schema)
+            self._parquet.write_table(table)
+
+        self._chunks += 1
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+        if self._parquet is not None:
+            self._parquet.close()
+        elif self.fmt == "parquet":
+            # Nothing was written: leave an empty file rather than none
+            open(self.path, "wb").close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_bytes(df, fmt):
+
+    if fmt == "csv":
+        return df.to_csv(index=False).encode("utf-8")
+
+    buffer = io.BytesIO()
+    if fmt == "parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        df.reset_index(drop=True).to_feather(buffer)
+    return buffer.getvalue()
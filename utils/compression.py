@@ -0,0 +1,285 @@
+import copy
+import io
+import os
+import time
+import joblib
+import numpy as np
+import pandas as pd
+
+from sklearn.metrics import roc_auc_score
+from sklearn.tree._tree import Tree
+
+from utils.file_io import write_atomic
+from utils.flat_forest import flat_path, save_flat_forest, split_pipeline
+from utils.inference import scoring_model
+from utils.risk import risk_level
+
+# ==============================
+# LATENCY-AWARE FOREST COMPRESSION
+# ==============================
+# A fitted forest is shrunk in two ways that need no retraining:
+#   - depth truncation: nodes below max_depth are cut and their parent
+#     becomes a leaf. Every sklearn node stores its class fractions, so
+#     the new leaf predicts what the subtree averaged to.
+#   - tree count: random forest trees are exchangeable, so the first k
+#     trees are a fair random subset.
+# For each depth, per-tree holdout predictions are computed once, which
+# makes the AUC of every (depth, k) prefix a cumulative mean. The
+# cheapest candidate within `tolerance` of the full forest's AUC wins.
+# Cost is node visits per row (what the flat walk and sklearn's traversal
+# both pay), then node count (what the artifact stores).
+#
+# AUC only checks the ranking. Shallow trees also pull probabilities
+# towards the middle, which moves customers between risk levels, so a
+# candidate must also give the full forest's risk level to at least
+# MIN_RISK_AGREEMENT of the holdout rows (None: AUC only). Dropping trees
+# alone costs some agreement too: the full forest's own probabilities
+# carry sampling noise near the thresholds.
+#
+# Artifacts: <model>.compressed.pkl plus its flat copy, next to the full one.
+
+TOLERANCE = 0.005
+MIN_RISK_AGREEMENT = 0.9
+
+DEPTHS = [None, 20, 16, 12, 10, 8, 6]
+TREE_COUNTS = [5, 10, 20, 30, 50, 75, 100, 150, 200, 300, 500]
+
+BENCH_ROWS = 10_000
+LATENCY_CALLS = 50
+
+
+def compressed_path(model_path):
+    base, ext = os.path.splitext(model_path)
+    return f"{base}.compressed{ext}"
+
+
+def _node_depths(tree):
+    left, right = tree.children_left, tree.children_right
+    depth = np.zeros(tree.node_count, dtype=np.intp)
+    frontier = np.array([0])
+    level = 0
+    while frontier.size:
+        depth[frontier] = level
+        children = np.concatenate([left[frontier], right[frontier]])
+        frontier = children[children != -1]
+        level += 1
+    return depth
+
+
+def truncate_tree(estimator, max_depth):
+
+    # Copy of a fitted DecisionTreeClassifier cut at max_depth. Kept nodes
+    # keep their relative (depth-first) order, so parents stay before
+    # children and the root stays node 0.
+    tree = estimator.tree_
+    if max_depth is None or tree.max_depth <= max_depth:
+        return estimator
+
+    state = tree.__getstate__()
+    nodes, values = state["nodes"], state["values"]
+
+    depth = _node_depths(tree)
+    kept = np.flatnonzero(depth <= max_depth)
+    new_index = np.full(tree.node_count, -1, dtype=np.intp)
+    new_index[kept] = np.arange(len(kept))
+
+    new_nodes = nodes[kept].copy()
+    cut = (depth[kept] == max_depth) & (new_nodes["left_child"] != -1)
+    internal = new_nodes["left_child"] != -1
+
+    new_nodes["left_child"][internal] = new_index[new_nodes["left_child"][internal]]
+    new_nodes["right_child"][internal] = new_index[new_nodes["right_child"][internal]]
+    new_nodes["left_child"][cut] = -1
+    new_nodes["right_child"][cut] = -1
+    new_nodes["feature"][cut] = -2
+    new_nodes["threshold"][cut] = -2
+
+    new_tree = Tree(tree.n_features, np.asarray(tree.n_classes, dtype=np.intp), tree.n_outputs)
+    new_tree.__setstate__({
+        "max_depth": max_depth,
+        "node_count": len(kept),
+        "nodes": new_nodes,
+        "values": np.ascontiguousarray(values[kept])
+    })
+
+    truncated = copy.copy(estimator)
+    truncated.tree_ = new_tree
+    return truncated
+
+
+def compress_forest(forest, max_depth, n_trees):
+
+    compressed = copy.copy(forest)
+    compressed.estimators_ = [truncate_tree(e, max_depth) for e in forest.estimators_[:n_trees]]
+    compressed.n_estimators = len(compressed.estimators_)
+    return compressed
+
+
+def compress_to(model, max_depth, n_trees):
+    # Pipeline (or bare forest) cut to the given depth and tree count, e.g.
+    # settings compress_model chose on another fit of the same pipeline
+    _, forest = split_pipeline(model)
+    return _with_forest(model, compress_forest(forest, max_depth, n_trees))
+
+
+def _with_forest(model, forest):
+    # Same pipeline (or bare forest) with the final estimator swapped
+    preprocessing, _ = split_pipeline(model)
+    if preprocessing is None:
+        return forest
+    compressed = copy.copy(model)
+    compressed.steps = model.steps[:-1] + [(model.steps[-1][0], forest)]
+    return compressed
+
+
+# ==============================
+# SEARCH
+# ==============================
+def _risk_codes(probabilities):
+    return risk_level(probabilities).cat.codes.to_numpy()
+
+
+def compress_model(model, X_val, y_val, tolerance=TOLERANCE,
+                   min_risk_agreement=MIN_RISK_AGREEMENT, depths=None, tree_counts=None):
+
+    # Returns (compressed model, table of every (depth, trees) candidate)
+    preprocessing, forest = split_pipeline(model)
+    X = preprocessing.transform(X_val) if preprocessing is not None else X_val
+    X = np.ascontiguousarray(X, dtype="float32")
+    y_val = np.asarray(y_val)
+
+    n_total = len(forest.estimators_)
+    counts = sorted({min(k, n_total) for k in (tree_counts or TREE_COUNTS)} | {n_total})
+    positive = list(forest.classes_).index(1)
+    full_risk = _risk_codes(forest.predict_proba(X)[:, positive])
+
+    rows = []
+    for max_depth in depths or DEPTHS:
+        trees = [truncate_tree(e, max_depth) for e in forest.estimators_]
+
+        proba = np.empty((n_total, len(X)))
+        visits = np.empty(n_total)
+        nodes = np.empty(n_total, dtype=np.int64)
+        for i, tree in enumerate(trees):
+            proba[i] = tree.predict_proba(X)[:, positive]
+            visits[i] = _node_depths(tree.tree_)[tree.tree_.apply(X)].mean()
+            nodes[i] = tree.tree_.node_count
+
+        cumulative = np.cumsum(proba, axis=0)
+        for k in counts:
+            probabilities = cumulative[k - 1] / k
+            rows.append({
+                "max_depth": max_depth,
+                "trees": k,
+                "auc": roc_auc_score(y_val, probabilities),
+                "risk_agreement": float((_risk_codes(probabilities) == full_risk).mean()),
+                "node_visits": float(visits[:k].sum()),
+                "nodes": int(nodes[:k].sum())
+            })
+
+    table = pd.DataFrame(rows)
+    full_auc = table.loc[table["max_depth"].isna() & (table["trees"] == n_total), "auc"].iloc[0]
+    table["auc_drop"] = full_auc - table["auc"]
+    table["within_tolerance"] = table["auc_drop"] <= tolerance
+    if min_risk_agreement is not None:
+        table["within_tolerance"] &= table["risk_agreement"] >= min_risk_agreement
+
+    best = table[table["within_tolerance"]].sort_values(["node_visits", "nodes"]).iloc[0]
+    max_depth = None if pd.isna(best["max_depth"]) else int(best["max_depth"])
+    table["chosen"] = (table["trees"] == best["trees"]) & (
+        table["max_depth"].isna() if max_depth is None else table["max_depth"] == max_depth
+    )
+
+    return compress_to(model, max_depth, int(best["trees"])), table
+
+
+def compression_summary(table):
+
+    # The chosen candidate next to the full forest, JSON-friendly
+    chosen = table[table["chosen"]].iloc[0]
+    full = table[table["max_depth"].isna()].sort_values("trees").iloc[-1]
+    return {
+        "trees": int(chosen["trees"]),
+        "max_depth": None if pd.isna(chosen["max_depth"]) else int(chosen["max_depth"]),
+        "auc": float(chosen["auc"]),
+        "full_auc": float(full["auc"]),
+        "risk_agreement": float(chosen["risk_agreement"]),
+        "nodes": int(chosen["nodes"]),
+        "full_nodes": int(full["nodes"])
+    }
+
+
+def holdout_summary(summary, model, compressed, X_test, y_test):
+
+    # The search's AUCs come from the rows it chose on; report both models
+    # on rows the choice never saw, keeping the search figures alongside
+    summary = dict(
+        summary, validation_auc=summary["auc"], validation_full_auc=summary["full_auc"]
+    )
+    summary["auc"] = float(roc_auc_score(y_test, compressed.predict_proba(X_test)[:, 1]))
+    summary["full_auc"] = float(roc_auc_score(y_test, model.predict_proba(X_test)[:, 1]))
+    return summary
+
+
+def save_compressed(model, model_path):
+    path = compressed_path(model_path)
+    write_atomic(lambda p: joblib.dump(model, p), path)
+    save_flat_forest(model, flat_path(path))
+    return path
+
+
+# ==============================
+# SIZE / LOAD / THROUGHPUT REPORT
+# ==============================
+def _median_ms(fn, calls=LATENCY_CALLS):
+    fn()
+    timings = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return float(np.median(timings)) * 1000
+
+
+def serving_report(models, X, y=None):
+
+    # One row per {name: model}: pickle size and load time, single-row
+    # latency (whole pipeline, and the forest alone on an encoded row) and
+    # batch throughput with the serving backend
+    rows = []
+    batch = X.iloc[:BENCH_ROWS] if hasattr(X, "iloc") else X[:BENCH_ROWS]
+    row = batch[:1]
+
+    for name, model in models.items():
+        buffer = io.BytesIO()
+        joblib.dump(model, buffer)
+        start = time.perf_counter()
+        buffer.seek(0)
+        joblib.load(buffer)
+        load_seconds = time.perf_counter() - start
+
+        preprocessing, forest = split_pipeline(model)
+        encoded = preprocessing.transform(row) if preprocessing is not None else row
+        scorer = scoring_model(model)
+        forest_scorer = scoring_model(forest)
+
+        start = time.perf_counter()
+        scorer.predict_proba(batch)
+        batch_seconds = time.perf_counter() - start
+
+        report = {
+            "model": name,
+            "trees": len(forest.estimators_),
+            "max_depth": max(e.tree_.max_depth for e in forest.estimators_),
+            "nodes": sum(e.tree_.node_count for e in forest.estimators_),
+            "pickle_mb": buffer.getbuffer().nbytes / 1e6,
+            "load_s": load_seconds,
+            "row_latency_ms": _median_ms(lambda: scorer.predict_proba(row)),
+            "forest_latency_ms": _median_ms(lambda: forest_scorer.predict_proba(encoded)),
+            "batch_rows_per_s": len(batch) / batch_seconds
+        }
+        if y is not None:
+            report["auc"] = roc_auc_score(y, model.predict_proba(X)[:, 1])
+        rows.append(report)
+
+    return pd.DataFrame(rows)
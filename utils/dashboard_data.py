@@ -0,0 +1,132 @@
+import hashlib
+import streamlit as st
+
+from utils.chart_data import (
+    binned_density, box_outlier_sample, box_stats, sparse_region_sample
+)
+from utils.columnar import export_bytes, file_format, read_frame
+from utils.kpi_engine import SAAS_SPEC, aggregate_frame
+from utils.metrics import count, timer
+from utils.model_registry import get_model
+from utils.parallel_scoring import predict_proba_parallel
+from utils.risk import RISK_LEVELS, risk_level
+from utils.schema import REQUIRED_COLUMNS, compact, model_categories, validate
+
+# ==============================
+# CACHED DASHBOARD DATA
+# ==============================
+# Every cached function is keyed on (upload_key, model_version): the
+# content hash of the upload and the hash of the model artifact. Arguments
+# starting with "_" are not hashed by Streamlit. A rerun with the same file
+# and model (resize, download click, widget change) reuses the scored frame
+# and every aggregate instead of rescoring.
+
+
+def upload_key(uploaded_file):
+
+    # Hash the upload once per file and remember it for later reruns
+    file_id = getattr(uploaded_file, "file_id", None) or (
+        uploaded_file.name, uploaded_file.size
+    )
+    digests = st.session_state.setdefault("upload_digests", {})
+
+    if file_id not in digests:
+        digests[file_id] = hashlib.blake2b(
+            uploaded_file.getbuffer(), digest_size=16
+        ).hexdigest()
+
+    return digests[file_id]
+
+
+# Large frame: shared as-is (no per-rerun copy). Treat it as read-only.
+@st.cache_resource(max_entries=4, show_spinner="Scoring customers...")
+def scored_frame(upload_key, model_version, _uploaded_file, _model_path, _n_workers=1):
+
+    # Every uploaded column is kept for the export (customer IDs and other
+    # pass-through columns); only the feature columns go to the model. Rows
+    # failing the feature schema are left out and returned as a report;
+    # floats are compacted after scoring (see utils.schema.validate).
+    _uploaded_file.seek(0)
+    with timer("dashboard.read"):
+        df = read_frame(_uploaded_file, file_format(_uploaded_file.name))
+    with timer("dashboard.validate"):
+        df, bad_rows = validate(df, categories=model_categories(get_model(_model_path)))
+
+    with timer("dashboard.predict"):
+        df["Churn Probability"] = predict_proba_parallel(
+            df[REQUIRED_COLUMNS], _model_path, _n_workers
+        ) if len(df) else []
+    df["Risk Level"] = risk_level(df["Churn Probability"])
+
+    count("rows_scored", len(df), source="dashboard")
+    count("bytes_ingested", _uploaded_file.size, source="dashboard")
+
+    return compact(df), bad_rows
+
+
+# KPIs and breakdowns all come from one pass of the aggregation engine
+@st.cache_data(max_entries=16)
+def customer_kpis(upload_key, model_version, _df):
+    with timer("dashboard.kpis"):
+        return aggregate_frame(_df, SAAS_SPEC)
+
+
+@st.cache_data(max_entries=16)
+def kpis(upload_key, model_version, _df):
+    result = customer_kpis(upload_key, model_version, _df)
+    return {
+        "total_customers": result["customers"],
+        "avg_churn_risk_pct": round(result["churn_rate_pct"], 2),
+        "high_risk_customers": result["high_risk_customers"],
+        "mrr": result["mrr"],
+        "arpu": result["arpu"]
+    }
+
+
+@st.cache_data(max_entries=16)
+def plan_risk(upload_key, model_version, _df):
+    by_plan = customer_kpis(upload_key, model_version, _df)["breakdowns"]["plan_type"]
+    return (by_plan["churn_rate_pct"] / 100).rename("Churn Probability").reset_index()
+
+
+@st.cache_data(max_entries=16)
+def risk_distribution(upload_key, model_version, _df):
+    by_level = customer_kpis(upload_key, model_version, _df)["breakdowns"]["Risk Level"]
+    return (
+        by_level["customers"]
+        .reindex(RISK_LEVELS, fill_value=0)
+        .rename_axis("Risk Level")
+        .reset_index(name="Customers")
+    )
+
+
+@st.cache_resource(max_entries=4)
+def file_export(upload_key, model_version, fmt, _df):
+    return export_bytes(_df, fmt)
+
+
+# ==============================
+# CHART SUMMARIES
+# ==============================
+@st.cache_data(max_entries=16)
+def usage_risk_density(upload_key, model_version, _df):
+    return binned_density(_df, "avg_weekly_usage_hours", "Churn Probability")
+
+
+@st.cache_data(max_entries=16)
+def usage_risk_outliers(upload_key, model_version, _df):
+    density = usage_risk_density(upload_key, model_version, _df)
+    return sparse_region_sample(
+        _df, "avg_weekly_usage_hours", "Churn Probability", "Risk Level", density
+    )
+
+
+@st.cache_data(max_entries=16)
+def ticket_box_stats(upload_key, model_version, _df):
+    return box_stats(_df, "Risk Level", "support_tickets")
+
+
+@st.cache_data(max_entries=16)
+def ticket_outliers(upload_key, model_version, _df):
+    stats = ticket_box_stats(upload_key, model_version, _df)
+    return box_outlier_sample(_df, "Risk Level", "support_tickets", stats)
@@ -0,0 +1,35 @@
+import pandas as pd
+import streamlit as st
+
+from utils.metrics import METRICS_ENABLED, snapshot
+
+# ==============================
+# STREAMLIT DEBUG PANEL
+# ==============================
+# Call at the end of a page with the list from utils.metrics.start_run():
+# shows this run's stage timings and the process-wide histograms (all
+# sessions, plus anything else this server process has scored).
+
+
+def debug_panel(run_timings):
+
+    if not METRICS_ENABLED or not st.sidebar.checkbox("Show timings (debug)", value=False):
+        return
+
+    with st.expander("⏱️ Timings (debug)", expanded=True):
+
+        st.markdown("**This run**")
+        if run_timings:
+            run = pd.DataFrame(run_timings, columns=["stage", "seconds"])
+            run = run.groupby("stage", sort=False)["seconds"].agg(["count", "sum"])
+            run["ms"] = run.pop("sum") * 1000
+            st.dataframe(run.round(2))
+        else:
+            st.caption("Nothing timed (results came from the cache).")
+
+        stages, counters = snapshot()
+        st.markdown("**This server process**")
+        if stages:
+            st.dataframe(pd.DataFrame(stages).set_index("stage").round(3))
+        if counters:
+            st.dataframe(pd.DataFrame(counters), hide_index=True)
@@ -0,0 +1,121 @@
+import threading
+import numpy as np
+import pandas as pd
+
+# ==============================
+# DUMMY ENCODING AGAINST model_columns
+# ==============================
+# Reproduces what pd.get_dummies + "add missing columns" does for a single
+# record, for a whole batch at once: numbers fill their field's column,
+# strings switch on the "<field>_<value>" column, anything not in
+# model_columns is dropped and absent columns stay 0.
+
+
+def build_column_index(model_columns):
+    return {column: i for i, column in enumerate(model_columns)}
+
+
+def encode_records(records, column_index):
+
+    frame = pd.DataFrame.from_records(records)
+    X = np.zeros((len(frame), len(column_index)))
+
+    for field in frame.columns:
+        values = frame[field]
+
+        is_text = values.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+
+        if is_text.any():
+            positions = (field + "_" + values[is_text]).map(column_index)
+            hit = positions.notna().to_numpy()
+            X[np.flatnonzero(is_text)[hit], positions[hit].astype(int)] = 1
+
+        if field in column_index and not is_text.all():
+            numbers = pd.to_numeric(values[~is_text], errors="coerce")
+            X[~is_text, column_index[field]] = numbers.fillna(0).to_numpy(dtype=float)
+
+    return X
+
+
+# ==============================
+# COMPILED ENCODER (dummy encoding + scaling)
+# ==============================
+# Built once per (model_columns, scaler) pair. Replaces get_dummies, the
+# add-missing-columns loop, the reindex and scaler.transform: a record is
+# written straight into a NumPy row that is already scaled.
+#   - an absent column is 0 before scaling, so every row starts as
+#     (0 - mean) / scale
+#   - a number sets its field's column to (value - mean) / scale
+#   - a string sets the "<field>_<value>" column to (1 - mean) / scale
+# Same rules (and same output) as encode_records + scaler.transform.
+
+
+class CompiledEncoder:
+
+    def __init__(self, model_columns, scaler=None):
+
+        self.columns = list(model_columns)
+        n = len(self.columns)
+
+        mean = np.zeros(n)
+        scale = np.ones(n)
+        if scaler is not None:
+            if getattr(scaler, "with_mean", True) and scaler.mean_ is not None:
+                mean = np.asarray(scaler.mean_, dtype=float)
+            if getattr(scaler, "with_std", True) and scaler.scale_ is not None:
+                scale = np.asarray(scaler.scale_, dtype=float)
+
+        # Same arithmetic as StandardScaler.transform, so results match bit for bit
+        self.mean = mean
+        self.scale = scale
+        self.base = (0.0 - mean) / scale
+        self.one = (1.0 - mean) / scale
+
+        # field -> column for numbers, (field, category) -> column for
+        # strings. A column is indexed under every "_" split point, so
+        # fields and categories that contain "_" still resolve.
+        self.numeric = build_column_index(self.columns)
+        self.categories = {}
+        for i, column in enumerate(self.columns):
+            start = column.find("_")
+            while start != -1:
+                self.categories.setdefault((column[:start], column[start + 1:]), i)
+                start = column.find("_", start + 1)
+
+        self._local = threading.local()
+
+    def _set(self, row, record):
+        for field, value in record.items():
+            if isinstance(value, str):
+                i = self.categories.get((field, value))
+                if i is not None:
+                    row[i] = self.one[i]
+            elif value is not None:
+                i = self.numeric.get(field)
+                if i is not None:
+                    try:
+                        value = float(value)
+                    except (TypeError, ValueError):
+                        continue
+                    if value == value:   # NaN stays 0, as in encode_records
+                        row[i] = (value - self.mean[i]) / self.scale[i]
+
+    def encode_one(self, record):
+
+        # One (1, n_columns) row, reused per thread: read it (predict)
+        # before encoding the next record on the same thread
+        row = getattr(self._local, "row", None)
+        if row is None:
+            row = self._local.row = np.empty((1, len(self.columns)))
+        row[0] = self.base
+        self._set(row[0], record)
+        return row
+
+    def encode(self, records, out=None):
+
+        # (len(records), n_columns) matrix; pass `out` to reuse a buffer
+        X = np.empty((len(records), len(self.columns))) if out is None else out[:len(records)]
+        X[:] = self.base
+        for row, record in zip(X, records):
+            self._set(row, record)
+        return X
@@ -0,0 +1,217 @@
+import copy
+import os
+import time
+import weakref
+from itertools import repeat
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.flat_forest import split_pipeline
+from utils.inference import compile_forest
+from utils.model_registry import get_model
+from utils.parallel_scoring import SCORING_WORKERS, map_bounded
+
+# ==============================
+# SHAP EXPLANATION SERVICE
+# ==============================
+# One TreeExplainer per loaded model (a hot-swapped model is a new object,
+# so it gets a new explainer). SHAP values are computed on the transformed
+# matrix in batches, across worker processes for large inputs, and reported
+# against readable feature names from the ColumnTransformer.
+#
+# Explanation modes (accuracy vs exact SHAP is measured by
+# benchmarks/bench_explainers.py):
+#   exact    TreeSHAP over every tree.
+#   sampled  TreeSHAP over a fixed random subset of SAMPLED_TREES trees.
+#            Forest SHAP is the mean of per-tree SHAP, so this is an
+#            unbiased estimate; cost scales with the tree count.
+#            Interventional SHAP on a sampled background set was measured
+#            slower than exact on these deep forests, so it is not offered.
+#   path     Saabas / treeinterpreter path decomposition from the flat
+#            forest arrays (FlatForest.contributions). Not Shapley values:
+#            it over-credits features split near the root.
+#
+# Measured on 200 rows, 100-tree synthetic SaaS pipeline, one core:
+#   mode      rows/s   MAE vs exact   corr   top-1 match   top-3 overlap
+#   exact          8              -      -             -               -
+#   sampled       27         0.0085  0.992          0.92            0.86
+#   path       4,500         0.0149  0.961          0.78            0.85
+
+EXPLAIN_BATCH_ROWS = 500
+PARALLEL_MIN_ROWS = 200
+TOP_K_DRIVERS = 3
+
+EXPLAIN_MODES = ["exact", "sampled", "path"]
+SAMPLED_TREES = 30
+
+_explainers = weakref.WeakKeyDictionary()
+_sampled_explainers = weakref.WeakKeyDictionary()
+
+
+def get_explainer(model):
+
+    import shap
+
+    explainer = _explainers.get(model)
+    if explainer is None:
+        _, forest = split_pipeline(model)
+        explainer = shap.TreeExplainer(forest)
+        _explainers[model] = explainer
+
+    return explainer
+
+
+def get_sampled_explainer(model, n_trees=SAMPLED_TREES, seed=42):
+
+    import shap
+
+    explainer = _sampled_explainers.get(model)
+    if explainer is None:
+        _, forest = split_pipeline(model)
+        rng = np.random.default_rng(seed)
+        picked = rng.choice(len(forest.estimators_), min(n_trees, len(forest.estimators_)),
+                            replace=False)
+
+        subset = copy.copy(forest)
+        subset.estimators_ = [forest.estimators_[i] for i in sorted(picked)]
+        subset.n_estimators = len(subset.estimators_)
+
+        explainer = shap.TreeExplainer(subset)
+        _sampled_explainers[model] = explainer
+
+    return explainer
+
+
+def feature_names(model):
+
+    preprocessing, forest = split_pipeline(model)
+
+    if preprocessing is None:
+        names = getattr(forest, "feature_names_in_", None)
+        if names is None:
+            return [f"feature_{i}" for i in range(forest.n_features_in_)]
+        return list(names)
+
+    # "num__tenure_months" -> "tenure_months", "cat__plan_type_Basic" -> "plan_type_Basic"
+    return [name.split("__", 1)[-1] for name in preprocessing.get_feature_names_out()]
+
+
+def transform(model, X):
+
+    preprocessing, _ = split_pipeline(model)
+    if preprocessing is not None:
+        X = preprocessing.transform(X)
+    if sparse.issparse(X):
+        X = X.toarray()
+    return np.asarray(X, dtype="float64")
+
+
+def positive_class(values):
+    # shap < 0.45 returns [class_0, class_1]; newer versions (rows, features, classes)
+    if isinstance(values, list):
+        return np.asarray(values[1])
+    values = np.asarray(values)
+    return values[..., 1] if values.ndim == 3 else values
+
+
+def shap_values(model, X, batch_rows=EXPLAIN_BATCH_ROWS, mode="exact"):
+
+    if mode not in EXPLAIN_MODES:
+        raise ValueError(f"Unknown explanation mode: {mode}")
+
+    if mode == "path":
+        _, contributions = compile_forest(model).contributions(X)
+        return contributions[..., 1]
+
+    explainer = get_explainer(model) if mode == "exact" else get_sampled_explainer(model)
+    transformed = transform(model, X)
+
+    if len(transformed) == 0:
+        return np.zeros(transformed.shape)
+
+    return np.vstack([
+        positive_class(explainer.shap_values(transformed[start:start + batch_rows]))
+        for start in range(0, len(transformed), batch_rows)
+    ])
+
+
+def _explain_shard(model_path, mode, X):
+    return shap_values(get_model(model_path), X, mode=mode)
+
+
+def shap_values_parallel(X, model_path, n_workers=None, batch_rows=EXPLAIN_BATCH_ROWS,
+                         mode="exact"):
+
+    n_workers = n_workers or SCORING_WORKERS
+    model_path = os.path.abspath(model_path)
+
+    # The path decomposition is cheap enough to stay in-process
+    if n_workers <= 1 or len(X) < PARALLEL_MIN_ROWS or mode == "path":
+        return _explain_shard(model_path, mode, X)
+
+    # Several shards per worker keeps every core busy on small files
+    shard_rows = max(1, min(batch_rows, -(-len(X) // (4 * n_workers))))
+    shards = [X.iloc[start:start + shard_rows] for start in range(0, len(X), shard_rows)]
+    results = map_bounded(
+        _explain_shard, n_workers, repeat(model_path), repeat(mode), shards
+    )
+
+    return np.vstack(list(results))
+
+
+def top_drivers(values, names, k=TOP_K_DRIVERS, index=None):
+
+    # Largest positive contributions first, i.e. what pushes churn risk up
+    k = min(k, values.shape[1])
+    order = np.argsort(-values, axis=1)[:, :k]
+    names = np.asarray(names)
+
+    columns = {}
+    for rank in range(k):
+        columns[f"Driver {rank + 1}"] = names[order[:, rank]]
+        columns[f"Driver {rank + 1} Impact"] = np.take_along_axis(
+            values, order[:, [rank]], axis=1
+        )[:, 0]
+
+    return pd.DataFrame(columns, index=index)
+
+
+def exact_seconds_per_row(model, X, probe_rows=20):
+
+    # Timed cost of exact SHAP on the first few rows of X
+    probe = X.head(probe_rows)
+    if len(probe) == 0:
+        return 0.0
+    start = time.perf_counter()
+    shap_values(model, probe)
+    return (time.perf_counter() - start) / len(probe)
+
+
+def choose_mode(model, X, budget_seconds, n_rows=None, n_workers=1, probe_rows=20,
+                exact_per_row=None):
+
+    # Most accurate mode expected to explain n_rows (default: all of X)
+    # within the budget, from the cost of exact SHAP per row (timed on a
+    # few rows of X unless the caller passes a cached exact_per_row)
+    n_rows = len(X) if n_rows is None else n_rows
+    if n_rows == 0 or len(X) == 0:
+        return "exact"
+
+    if exact_per_row is None:
+        exact_per_row = exact_seconds_per_row(model, X, probe_rows)
+
+    _, forest = split_pipeline(model)
+    sampled_share = min(SAMPLED_TREES, len(forest.estimators_)) / len(forest.estimators_)
+
+    exact_estimate = exact_per_row * n_rows / n_workers
+    if exact_estimate <= budget_seconds:
+        return "exact"
+    if exact_estimate * sampled_share <= budget_seconds:
+        return "sampled"
+    return "path"
+
+
+def driver_columns(X, model_path, k=TOP_K_DRIVERS, n_workers=None, mode="exact"):
+    values = shap_values_parallel(X, model_path, n_workers, mode=mode)
+    return top_drivers(values, feature_names(get_model(model_path)), k, index=X.index)
@@ -0,0 +1,49 @@
+import hashlib
+import json
+import os
+
+# ==============================
+# SHARED FILE HELPERS
+# ==============================
+# Atomic writes go to a temporary file next to the target and are renamed
+# into place, so a reader (another session, worker or server on the same
+# disk) sees the old file or the new one, never half of one.
+
+
+def write_atomic(write, path):
+    # write(tmp_path) produces the file; the rename is atomic on one disk
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+
+def write_json(obj, path, indent=2):
+
+    def write(tmp_path):
+        with open(tmp_path, "w") as f:
+            json.dump(obj, f, indent=indent)
+
+    write_atomic(write, path)
+
+
+def read_json(path):
+    # None when the file is missing or not (yet) valid JSON
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def rewind(source):
+    # Uploads and open files are read more than once; paths need nothing
+    if hasattr(source, "seek"):
+        source.seek(0)
@@ -0,0 +1,256 @@
+import json
+import os
+import shutil
+import uuid
+import joblib
+import numpy as np
+from scipy import sparse
+
+# ==============================
+# FLAT FOREST ARTIFACT FORMAT
+# ==============================
+# A fitted RandomForest is stored as one set of node arrays covering every
+# tree (node ids are global, leaves point to themselves). The arrays are
+# plain .npy files opened with mmap_mode="r", so loading takes milliseconds
+# and all worker processes on a host share one physical copy through the
+# page cache. joblib's own mmap_mode cannot do this for sklearn trees: they
+# copy their node arrays into private memory when unpickled.
+#
+#   <name>.flat/
+#       meta.json              classes, tree count, depth, artifact id
+#       preprocessing.joblib   pipeline steps before the forest (optional)
+#       feature.npy  threshold.npy  children_left.npy  children_right.npy
+#       value.npy    is_leaf.npy  roots.npy
+
+FLAT_ARRAYS = [
+    "feature",
+    "threshold",
+    "children_left",
+    "children_right",
+    "value",
+    "is_leaf",
+    "roots"
+]
+
+# Rows traversed at once; bounds the (rows x trees) node-id vectors
+PREDICT_BATCH_ROWS = 4096
+
+
+def flat_path(model_path):
+    return os.path.splitext(model_path)[0] + ".flat"
+
+
+def split_pipeline(model):
+    if hasattr(model, "named_steps"):
+        return model[:-1], model.steps[-1][1]
+    return None, model
+
+
+# ==============================
+# CONVERSION
+# ==============================
+def _float32_floor(thresholds):
+    # Largest float32 <= each float64 threshold, so that for float32 inputs
+    # x <= t32 gives exactly the same split as sklearn's x <= t64
+    t32 = thresholds.astype("float32")
+    above = t32.astype("float64") > thresholds
+    t32[above] = np.nextafter(t32[above], np.float32(-np.inf))
+    return t32
+
+
+def flatten_forest(forest):
+
+    features, thresholds, lefts, rights, values, roots = [], [], [], [], [], []
+    offset = 0
+    max_depth = 0
+
+    for estimator in forest.estimators_:
+        tree = estimator.tree_
+        n_nodes = tree.node_count
+        node_ids = np.arange(offset, offset + n_nodes)
+        is_leaf = tree.children_left == -1
+
+        left = np.where(is_leaf, node_ids, tree.children_left + offset)
+        right = np.where(is_leaf, node_ids, tree.children_right + offset)
+
+        # Per-node class probabilities, as DecisionTree.predict_proba
+        # normalises them (counts or fractions depending on sklearn version)
+        value = tree.value[:, 0, :].astype("float64")
+        totals = value.sum(axis=1, keepdims=True)
+        totals[totals == 0] = 1.0
+
+        features.append(np.where(is_leaf, 0, tree.feature))
+        thresholds.append(_float32_floor(tree.threshold))
+        lefts.append(left)
+        rights.append(right)
+        values.append(value / totals)
+        roots.append(offset)
+
+        offset += n_nodes
+        max_depth = max(max_depth, tree.max_depth)
+
+    arrays = {
+        "feature": np.concatenate(features).astype("int32"),
+        "threshold": np.concatenate(thresholds),
+        "children_left": np.concatenate(lefts).astype("int32"),
+        "children_right": np.concatenate(rights).astype("int32"),
+        "value": np.concatenate(values),
+        "is_leaf": np.concatenate(lefts) == np.arange(offset),
+        "roots": np.asarray(roots, dtype="int32")
+    }
+
+    meta = {
+        "classes": forest.classes_.tolist(),
+        "n_estimators": len(forest.estimators_),
+        "n_features_in": int(forest.n_features_in_),
+        "max_depth": int(max_depth),
+        "n_nodes": int(offset)
+    }
+
+    return arrays, meta
+
+
+# ==============================
+# SAVE / LOAD
+# ==============================
+def save_flat_forest(model, path):
+
+    preprocessing, forest = split_pipeline(model)
+    arrays, meta = flatten_forest(forest)
+    meta["artifact_id"] = uuid.uuid4().hex
+    meta["has_preprocessing"] = preprocessing is not None
+
+    # Write next to the target, then swap directories so readers never
+    # see a half-written artifact
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    for name in FLAT_ARRAYS:
+        np.save(os.path.join(tmp_path, f"{name}.npy"), arrays[name])
+
+    if preprocessing is not None:
+        joblib.dump(preprocessing, os.path.join(tmp_path, "preprocessing.joblib"))
+
+    with open(os.path.join(tmp_path, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+
+    old_path = f"{path}.old-{os.getpid()}"
+    if os.path.exists(path):
+        os.rename(path, old_path)
+    os.rename(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+    return path
+
+
+def load_flat_forest(path, mmap_mode="r"):
+
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+
+    arrays = {
+        name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode=mmap_mode)
+        for name in FLAT_ARRAYS
+    }
+
+    preprocessing = None
+    if meta.get("has_preprocessing"):
+        preprocessing = joblib.load(os.path.join(path, "preprocessing.joblib"))
+
+    return FlatForest(arrays, meta, preprocessing)
+
+
+# ==============================
+# PREDICTION
+# ==============================
+class FlatForest:
+
+    def __init__(self, arrays, meta, preprocessing=None):
+        self.arrays = arrays
+        self.meta = meta
+        self.preprocessing = preprocessing
+        self.classes_ = np.asarray(meta["classes"])
+        self.n_estimators = meta["n_estimators"]
+
+    def _prepare(self, X):
+        if self.preprocessing is not None:
+            X = self.preprocessing.transform(X)
+        if sparse.issparse(X):
+            X = X.toarray()
+        # sklearn trees compare float32 inputs; thresholds are stored to match
+        return np.ascontiguousarray(X, dtype="float32")
+
+    def _leaves(self, X, on_step=None):
+
+        # Node ids for every (row, tree) pair, stored row-major in one flat
+        # vector. Each step advances only the pairs not yet at a leaf;
+        # on_step(active, current, next) sees every edge taken.
+        a = self.arrays
+        n_rows, n_features = X.shape
+        x = X.ravel()
+
+        nodes = np.tile(a["roots"], n_rows)
+        row_offset = np.repeat(
+            np.arange(n_rows, dtype=np.intp) * n_features, self.n_estimators
+        )
+        active = np.flatnonzero(~a["is_leaf"][nodes])
+
+        while active.size:
+            current = nodes[active]
+            go_left = x[row_offset[active] + a["feature"][current]] <= a["threshold"][current]
+            following = np.where(go_left, a["children_left"][current], a["children_right"][current])
+            if on_step is not None:
+                on_step(active, current, following)
+            nodes[active] = following
+            active = active[~a["is_leaf"][following]]
+
+        return nodes.reshape(n_rows, self.n_estimators)
+
+    def _forest_proba(self, X):
+
+        proba = np.empty((X.shape[0], len(self.classes_)))
+
+        for start in range(0, X.shape[0], PREDICT_BATCH_ROWS):
+            leaves = self._leaves(X[start:start + PREDICT_BATCH_ROWS])
+            proba[start:start + leaves.shape[0]] = self.arrays["value"][leaves].mean(axis=1)
+
+        return proba
+
+    def _contributions(self, X):
+
+        # Path decomposition (Saabas / treeinterpreter): each split on the
+        # path credits its feature with the change in node class
+        # probabilities. Per row, bias + contributions.sum(features) equals
+        # predict_proba.
+        a = self.arrays
+        n_rows, n_features = X.shape
+        n_classes = len(self.classes_)
+        out = np.zeros((n_rows * n_features, n_classes))
+
+        def credit(active, current, following):
+            slots = (active // self.n_estimators) * n_features + a["feature"][current]
+            delta = a["value"][following] - a["value"][current]
+            for c in range(n_classes):
+                out[:, c] += np.bincount(slots, weights=delta[:, c], minlength=out.shape[0])
+
+        self._leaves(X, on_step=credit)
+
+        return out.reshape(n_rows, n_features, n_classes) / self.n_estimators
+
+    def contributions(self, X):
+
+        X = self._prepare(X)
+        bias = self.arrays["value"][self.arrays["roots"]].mean(axis=0)
+        contributions = np.concatenate([
+            self._contributions(X[start:start + PREDICT_BATCH_ROWS])
+            for start in range(0, X.shape[0], PREDICT_BATCH_ROWS)
+        ]) if X.shape[0] else np.zeros((0, X.shape[1], len(self.classes_)))
+
+        return bias, contributions
+
+    def predict_proba(self, X):
+        return self._forest_proba(self._prepare(X))
+
+    def predict(self, X):
+        return self.classes_[np.argmax(self.predict_proba(X), axis=1)]
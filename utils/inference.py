@@ -0,0 +1,72 @@
+import os
+import weakref
+
+from utils.flat_forest import FlatForest, flatten_forest, split_pipeline
+
+# ==============================
+# PLUGGABLE INFERENCE BACKENDS
+# ==============================
+# "sklearn" scores with the fitted estimator as-is. "flat" compiles the
+# forest into the flat node arrays of utils/flat_forest.py and walks all
+# trees with vectorized NumPy. The flat walk avoids sklearn's per-tree call
+# overhead, which dominates small batches, but sklearn's compiled traversal
+# is faster on large ones, so "auto" picks per call by batch size.
+
+INFERENCE_BACKEND = os.environ.get("CHURN_INFERENCE_BACKEND", "auto")
+
+AUTO_FLAT_MAX_ROWS = 256
+
+_compiled = weakref.WeakKeyDictionary()
+
+
+def compile_forest(model):
+
+    if isinstance(model, FlatForest):
+        return model
+
+    compiled = _compiled.get(model)
+    if compiled is None:
+        preprocessing, forest = split_pipeline(model)
+        arrays, meta = flatten_forest(forest)
+        compiled = FlatForest(arrays, meta, preprocessing)
+        _compiled[model] = compiled
+
+    return compiled
+
+
+class AutoBackend:
+
+    def __init__(self, model):
+        self.model = model
+        self.flat = compile_forest(model)
+        self.classes_ = self.flat.classes_
+
+    def _backend(self, X):
+        return self.flat if X.shape[0] <= AUTO_FLAT_MAX_ROWS else self.model
+
+    def predict_proba(self, X):
+        return self._backend(X).predict_proba(X)
+
+    def predict(self, X):
+        return self._backend(X).predict(X)
+
+
+BACKENDS = {
+    "sklearn": lambda model: model,
+    "flat": compile_forest,
+    "auto": AutoBackend
+}
+
+
+def scoring_model(model, backend=None):
+
+    backend = backend or INFERENCE_BACKEND
+
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown inference backend: {backend}")
+
+    # A flat artifact loaded from disk has no sklearn estimator behind it
+    if isinstance(model, FlatForest):
+        return model
+
+    return BACKENDS[backend](model)
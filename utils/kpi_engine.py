@@ -0,0 +1,221 @@
+from functools import reduce
+from itertools import repeat
+import numpy as np
+import pandas as pd
+
+from utils.columnar import iter_frames
+from utils.parallel_scoring import SCORING_WORKERS, map_bounded
+from utils.risk import HIGH_RISK_THRESHOLD
+
+# ==============================
+# KPI / RISK AGGREGATION ENGINE
+# ==============================
+# Every KPI is computed from a small partial aggregate per chunk: sums and
+# non-null counts, per-category sums for the breakdowns, and value counts
+# of CLTV. Partials merge associatively, so chunks of a file larger than
+# memory, row groups read by different workers, or separate shard files
+# all reduce to the same result in one pass over the data.
+#
+# "High value" is CLTV above the overall mean, which is only known at the
+# end; the CLTV value counts make that count exact without a second pass.
+# CLTV is a whole-dollar score, so they stay small.
+
+CHUNK_SIZE = 100_000
+
+# Column roles for each dataset; None when a dataset has no such column.
+# A customer is high risk when risk_score > high_risk_above.
+TELCO_SPEC = {
+    "revenue": "Total Charges",
+    "monthly": "Monthly Charges",
+    "churn": "Churn",
+    "cltv": "CLTV",
+    "risk_score": "Churn Score",
+    "high_risk_above": 80,
+    "breakdowns": ["Contract", "Payment Method"]
+}
+
+# Scored SaaS uploads: churn is the predicted probability, so the churn
+# rate is the expected one. High risk matches the "High" risk level.
+SAAS_SPEC = {
+    "revenue": None,
+    "monthly": "monthly_fee",
+    "churn": "Churn Probability",
+    "cltv": None,
+    "risk_score": "Churn Probability",
+    "high_risk_above": HIGH_RISK_THRESHOLD,
+    "breakdowns": ["plan_type", "Risk Level"]
+}
+
+MEASURES = ["revenue", "monthly", "churn"]
+
+
+def spec_columns(spec):
+    columns = [spec[role] for role in MEASURES + ["cltv", "risk_score"] if spec[role]]
+    return list(dict.fromkeys(columns + spec["breakdowns"]))
+
+
+def _value_counts(values):
+    values = values[~np.isnan(values)]
+    unique, counts = np.unique(values, return_counts=True)
+    return pd.Series(counts, index=unique, dtype="int64")
+
+
+# ==============================
+# PARTIAL AGGREGATES
+# ==============================
+def empty_partial(spec=TELCO_SPEC):
+    roles = [role for role in MEASURES if spec[role]]
+    return {
+        "rows": 0,
+        "sums": {role: 0.0 for role in roles},
+        "counts": {role: 0 for role in roles},
+        "high_risk": 0,
+        "cltv": None,
+        "cltv_high_risk": None,
+        "breakdowns": {}
+    }
+
+
+def partial_kpis(chunk, spec=TELCO_SPEC):
+
+    measures = {}
+    for role in MEASURES:
+        if spec[role]:
+            measures[role] = pd.to_numeric(chunk[spec[role]], errors="coerce").to_numpy(dtype="float64")
+
+    risk = pd.to_numeric(chunk[spec["risk_score"]], errors="coerce").to_numpy(dtype="float64")
+    high_risk = risk > spec["high_risk_above"]
+
+    partial = {
+        "rows": len(chunk),
+        "sums": {role: float(np.nansum(v)) for role, v in measures.items()},
+        "counts": {role: int(np.count_nonzero(~np.isnan(v))) for role, v in measures.items()},
+        "high_risk": int(high_risk.sum()),
+        "cltv": None,
+        "cltv_high_risk": None,
+        "breakdowns": {}
+    }
+
+    if spec["cltv"]:
+        cltv = pd.to_numeric(chunk[spec["cltv"]], errors="coerce").to_numpy(dtype="float64")
+        partial["cltv"] = _value_counts(cltv)
+        partial["cltv_high_risk"] = _value_counts(cltv[high_risk])
+
+    # One groupby per dimension over a small frame of the measures
+    frame = pd.DataFrame({role: v for role, v in measures.items()})
+    for role in measures:
+        frame[f"{role}_n"] = ~np.isnan(measures[role])
+    frame["customers"] = 1
+    frame["high_risk"] = high_risk
+
+    for dim in spec["breakdowns"]:
+        # .array keeps a categorical's own order (plan vocabulary, risk levels)
+        keys = chunk[dim].array
+        partial["breakdowns"][dim] = frame.groupby(keys, dropna=False, observed=True).sum()
+
+    return partial
+
+
+def _add(a, b):
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return a.add(b, fill_value=0)
+
+
+def merge_partials(a, b):
+
+    return {
+        "rows": a["rows"] + b["rows"],
+        "sums": {role: a["sums"][role] + b["sums"][role] for role in a["sums"]},
+        "counts": {role: a["counts"][role] + b["counts"][role] for role in a["counts"]},
+        "high_risk": a["high_risk"] + b["high_risk"],
+        "cltv": _add(a["cltv"], b["cltv"]),
+        "cltv_high_risk": _add(a["cltv_high_risk"], b["cltv_high_risk"]),
+        "breakdowns": {
+            dim: _add(a["breakdowns"].get(dim), b["breakdowns"].get(dim))
+            for dim in a["breakdowns"].keys() | b["breakdowns"].keys()
+        }
+    }
+
+
+def _mean(total, count):
+    return total / count if count else float("nan")
+
+
+def finalize_kpis(partial):
+
+    sums, counts = partial["sums"], partial["counts"]
+
+    result = {
+        "customers": partial["rows"],
+        "total_revenue": sums.get("revenue"),
+        "mrr": sums.get("monthly"),
+        "arpu": _mean(sums["monthly"], counts["monthly"]) if "monthly" in sums else None,
+        "churn_rate_pct": _mean(sums["churn"], counts["churn"]) * 100 if "churn" in sums else None,
+        "high_risk_customers": partial["high_risk"],
+        "avg_cltv": None,
+        "high_value_customers": None,
+        "high_value_high_risk_customers": None,
+        "breakdowns": {}
+    }
+
+    if partial["cltv"] is not None:
+        cltv = partial["cltv"]
+        avg_cltv = _mean(float((cltv.index * cltv).sum()), int(cltv.sum()))
+        result["avg_cltv"] = avg_cltv
+        result["high_value_customers"] = int(cltv[cltv.index > avg_cltv].sum())
+        high_risk = partial["cltv_high_risk"]
+        result["high_value_high_risk_customers"] = int(high_risk[high_risk.index > avg_cltv].sum())
+
+    for dim, groups in partial["breakdowns"].items():
+        table = pd.DataFrame({"customers": groups["customers"].astype("int64")})
+        if "churn" in groups:
+            table["churn_rate_pct"] = groups["churn"] / groups["churn_n"].replace(0, np.nan) * 100
+        if "monthly" in groups:
+            table["mrr"] = groups["monthly"]
+            table["arpu"] = groups["monthly"] / groups["monthly_n"].replace(0, np.nan)
+        if "revenue" in groups:
+            table["revenue"] = groups["revenue"]
+        table["high_risk"] = groups["high_risk"].astype("int64")
+        result["breakdowns"][dim] = table.rename_axis(dim)
+
+    return result
+
+
+# ==============================
+# FUNCTION API
+# ==============================
+def aggregate_chunks(chunks, spec=TELCO_SPEC):
+    partials = (partial_kpis(chunk, spec) for chunk in chunks)
+    return finalize_kpis(reduce(merge_partials, partials, empty_partial(spec)))
+
+
+def aggregate_frame(df, spec=TELCO_SPEC, chunksize=CHUNK_SIZE):
+    chunks = (df.iloc[start:start + chunksize] for start in range(0, len(df), chunksize))
+    return aggregate_chunks(chunks, spec)
+
+
+def _file_partial(source, fmt, spec, chunksize):
+    chunks = iter_frames(source, fmt, spec_columns(spec), chunksize)
+    partials = (partial_kpis(chunk, spec) for chunk in chunks)
+    return reduce(merge_partials, partials, empty_partial(spec))
+
+
+def aggregate_file(source, fmt="csv", spec=TELCO_SPEC, chunksize=CHUNK_SIZE):
+    # Reads only the columns the spec needs, one chunk at a time
+    return finalize_kpis(_file_partial(source, fmt, spec, chunksize))
+
+
+def aggregate_files(paths, fmt="csv", spec=TELCO_SPEC, chunksize=CHUNK_SIZE, n_workers=None):
+
+    # One shard file per task; partials come back and are merged here
+    n_workers = min(n_workers or SCORING_WORKERS, len(paths))
+    if n_workers <= 1:
+        partials = [_file_partial(path, fmt, spec, chunksize) for path in paths]
+    else:
+        partials = list(map_bounded(
+            _file_partial, n_workers, paths, repeat(fmt), repeat(spec), repeat(chunksize)
+        ))
+    return finalize_kpis(reduce(merge_partials, partials, empty_partial(spec)))
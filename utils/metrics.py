@@ -0,0 +1,235 @@
+import bisect
+import contextvars
+import os
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import wraps
+import numpy as np
+
+# ==============================
+# HOT-PATH INSTRUMENTATION
+# ==============================
+# Process-wide latency histograms per stage and counters, shared by the
+# Flask app and every Streamlit session (utils/ is imported once per
+# process). timer() / stopwatch() / timed() record a stage; with
+# CHURN_METRICS=0 they hand back a shared no-op object / the undecorated
+# function, so the disabled cost is one global lookup.
+#
+# render_prometheus() writes the text exposition format for /metrics.
+# A Streamlit script run can also collect its own timings (start_run) for
+# the page debug panel.
+
+METRICS_ENABLED = os.environ.get("CHURN_METRICS", "1") == "1"
+
+METRIC_PREFIX = "churn"
+
+# Seconds; Prometheus-style cumulative buckets (+Inf is implicit)
+LATENCY_BUCKETS = [
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60
+]
+
+# Recent samples per stage for exact percentiles in the debug panel
+RECENT_SAMPLES = 1_000
+
+_lock = threading.Lock()
+_histograms = {}
+_counters = {}
+_run_timings = contextvars.ContextVar("run_timings", default=None)
+_NOOP = nullcontext()
+
+
+class Histogram:
+
+    def __init__(self, buckets=LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.recent = deque(maxlen=RECENT_SAMPLES)
+
+    def observe(self, value):
+        # bisect_left: a value equal to a bound falls in that bucket (le)
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+        self.recent.append(value)
+
+
+# ==============================
+# RECORDING
+# ==============================
+def observe(stage, seconds):
+
+    with _lock:
+        histogram = _histograms.get(stage)
+        if histogram is None:
+            histogram = _histograms[stage] = Histogram()
+        histogram.observe(seconds)
+
+    timings = _run_timings.get()
+    if timings is not None:
+        timings.append((stage, seconds))
+
+
+def count(name, value=1, **labels):
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + value
+
+
+class _Timer:
+
+    __slots__ = ("stage", "start")
+
+    def __init__(self, stage):
+        self.stage = stage
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.stop()
+        return False
+
+    def stop(self):
+        observe(self.stage, time.perf_counter() - self.start)
+
+
+class _NoopTimer:
+
+    def stop(self):
+        pass
+
+
+_NOOP_TIMER = _NoopTimer()
+
+
+def timer(stage):
+    if not METRICS_ENABLED:
+        return _NOOP
+    return _Timer(stage)
+
+
+def stopwatch(stage):
+    # Started timer for code that does not fit a with-block; call .stop()
+    if not METRICS_ENABLED:
+        return _NOOP_TIMER
+    return _Timer(stage).__enter__()
+
+
+def timed(stage):
+
+    def decorate(fn):
+        if not METRICS_ENABLED:
+            return fn
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            with _Timer(stage):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def timed_iter(iterable, stage):
+
+    # Times each step of an iterator (e.g. reading the next chunk)
+    if not METRICS_ENABLED:
+        yield from iterable
+        return
+
+    iterator = iter(iterable)
+    while True:
+        start = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            return
+        observe(stage, time.perf_counter() - start)
+        yield item
+
+
+def start_run():
+    # Timings recorded from here on in this thread / context are also
+    # collected in the returned list
+    timings = []
+    _run_timings.set(timings)
+    return timings
+
+
+# ==============================
+# EXPORT
+# ==============================
+def _format_labels(labels):
+    if not labels:
+        return ""
+    pairs = ",".join(f'{k}="{str(v)}"' for k, v in labels)
+    return "{" + pairs + "}"
+
+
+def render_prometheus():
+
+    with _lock:
+        histograms = {
+            stage: (list(h.counts), h.sum, h.count) for stage, h in _histograms.items()
+        }
+        counters = dict(_counters)
+
+    name = f"{METRIC_PREFIX}_stage_seconds"
+    lines = [
+        f"# HELP {name} Time spent per processing stage.",
+        f"# TYPE {name} histogram"
+    ]
+    for stage, (counts, total, n) in sorted(histograms.items()):
+        cumulative = np.cumsum(counts)
+        for bound, value in zip(LATENCY_BUCKETS + ["+Inf"], cumulative):
+            lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {value}')
+        lines.append(f'{name}_sum{{stage="{stage}"}} {total}')
+        lines.append(f'{name}_count{{stage="{stage}"}} {n}')
+
+    for counter in sorted({key[0] for key in counters}):
+        full_name = f"{METRIC_PREFIX}_{counter}_total"
+        lines.append(f"# TYPE {full_name} counter")
+        for (key_name, labels), value in sorted(counters.items()):
+            if key_name == counter:
+                lines.append(f"{full_name}{_format_labels(labels)} {value}")
+
+    return "\n".join(lines) + "\n"
+
+
+def snapshot():
+
+    # One dict per stage: calls, total and recent percentiles (ms)
+    with _lock:
+        stages = {stage: (h.count, h.sum, list(h.recent)) for stage, h in _histograms.items()}
+        counters = dict(_counters)
+
+    rows = []
+    for stage, (n, total, recent) in sorted(stages.items()):
+        p50, p95 = np.percentile(recent, [50, 95]) * 1000 if recent else (0.0, 0.0)
+        rows.append({
+            "stage": stage,
+            "calls": n,
+            "total_s": total,
+            "mean_ms": total / n * 1000 if n else 0.0,
+            "p50_ms": p50,
+            "p95_ms": p95
+        })
+
+    counter_rows = [
+        {"counter": name, "labels": _format_labels(labels), "value": value}
+        for (name, labels), value in sorted(counters.items())
+    ]
+
+    return rows, counter_rows
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
@@ -0,0 +1,121 @@
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+import numpy as np
+
+# ==============================
+# MICRO-BATCHING REQUEST COALESCER
+# ==============================
+# Single-record requests are queued and scored together: the worker thread
+# takes the first waiting record, keeps collecting until max_batch_size
+# records are in hand or max_wait_ms has passed, then makes one call to
+# score_fn(records) -> (labels, probabilities) and resolves every caller.
+
+LATENCY_SAMPLES = 10_000
+
+
+class MicroBatcher:
+
+    def __init__(self, score_fn, max_batch_size=64, max_wait_ms=5.0):
+        self.score_fn = score_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+
+        self._queue = queue.Queue()
+        self._stats_lock = threading.Lock()
+        self._batch_sizes = {}
+        self._queue_waits = deque(maxlen=LATENCY_SAMPLES)
+        self._batches = 0
+        self._records = 0
+        self._errors = 0
+
+        self._worker = threading.Thread(
+            target=self._run, name="micro-batcher", daemon=True
+        )
+        self._worker.start()
+
+    def submit(self, record):
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future
+
+    def predict(self, record, timeout=None):
+        return self.submit(record).result(timeout=timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            started = time.perf_counter()
+
+            records = [record for record, _, _ in batch]
+            try:
+                labels, probabilities = self.score_fn(records)
+            except Exception:
+                # One bad record must not fail the callers it was batched
+                # with: score one at a time so only its own caller gets it
+                self._run_singly(batch)
+            else:
+                for (_, future, _), label, probability in zip(batch, labels, probabilities):
+                    future.set_result((label, probability))
+
+            with self._stats_lock:
+                self._batches += 1
+                self._records += len(batch)
+                self._batch_sizes[len(batch)] = self._batch_sizes.get(len(batch), 0) + 1
+                self._queue_waits.extend(started - queued for _, _, queued in batch)
+
+    def _run_singly(self, batch):
+        for record, future, _ in batch:
+            try:
+                labels, probabilities = self.score_fn([record])
+            except Exception as exc:
+                future.set_exception(exc)
+                with self._stats_lock:
+                    self._errors += 1
+            else:
+                future.set_result((labels[0], probabilities[0]))
+
+    # ==============================
+    # METRICS
+    # ==============================
+    def stats(self):
+
+        with self._stats_lock:
+            waits = np.array(self._queue_waits) * 1000
+            histogram = dict(sorted(self._batch_sizes.items()))
+            batches, records, errors = self._batches, self._records, self._errors
+
+        added = (
+            dict(zip(["p50", "p90", "p99", "max"],
+                     np.percentile(waits, [50, 90, 99, 100]).round(3).tolist()))
+            if len(waits) else {}
+        )
+
+        return {
+            "queue_depth": self._queue.qsize(),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": batches,
+            "records": records,
+            "errors": errors,
+            "mean_batch_size": records / batches if batches else 0,
+            "batch_size_histogram": histogram,
+            "added_latency_ms": added
+        }
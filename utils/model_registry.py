@@ -0,0 +1,158 @@
+import os
+import threading
+import time
+import joblib
+import numpy as np
+
+from utils.file_io import file_hash
+from utils.flat_forest import load_flat_forest
+
+# ==============================
+# PROCESS-LEVEL MODEL REGISTRY
+# ==============================
+# Modules under utils/ are imported once per process, so this registry is
+# shared by every Streamlit session and page (and by the Flask app). Each
+# artifact is unpickled once and reloaded only when the file on disk changes.
+# Flat forest directories (see utils/flat_forest.py) are opened memory-mapped;
+# their meta.json stands in for the file.
+
+_models = {}
+_lock = threading.Lock()
+_path_locks = {}
+_versions = {}
+
+
+def _stat_target(path):
+    if os.path.isdir(path):
+        return os.path.join(path, "meta.json")
+    return path
+
+
+def _file_signature(path):
+    stat = os.stat(_stat_target(path))
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _estimate_nbytes(obj, seen=None):
+
+    # Walks estimator attributes and sums the numpy buffers they hold.
+    # sklearn trees keep their node arrays behind __getstate__.
+    # seen holds references so ids of temporary state dicts are not reused
+    seen = {} if seen is None else seen
+
+    if id(obj) in seen:
+        return 0
+    seen[id(obj)] = obj
+
+    if isinstance(obj, np.ndarray):
+        return obj.nbytes
+    if isinstance(obj, dict):
+        return sum(_estimate_nbytes(v, seen) for v in obj.values())
+    if isinstance(obj, (list, tuple, set)):
+        return sum(_estimate_nbytes(v, seen) for v in obj)
+    if hasattr(obj, "__dict__"):
+        return _estimate_nbytes(vars(obj), seen)
+    if type(obj).__module__.startswith("sklearn") and hasattr(obj, "__getstate__"):
+        try:
+            return _estimate_nbytes(obj.__getstate__(), seen)
+        except TypeError:
+            return 0
+    return 0
+
+
+def _load(path, signature):
+
+    start = time.perf_counter()
+    if os.path.isdir(path):
+        model = load_flat_forest(path)
+    else:
+        model = joblib.load(path)
+    load_seconds = time.perf_counter() - start
+
+    return {
+        "model": model,
+        "path": path,
+        "signature": signature,
+        "version": file_hash(_stat_target(path))[:12],
+        "load_seconds": load_seconds,
+        "memory_mb": _estimate_nbytes(model) / 1e6,
+        "loaded_at": time.time(),
+        "reloads": 0
+    }
+
+
+def get_model(path):
+
+    path = os.path.abspath(path)
+
+    try:
+        signature = _file_signature(path)
+    except FileNotFoundError:
+        # Artifact is being swapped on disk; keep serving the loaded one
+        if path in _models:
+            return _models[path]["model"]
+        raise
+
+    entry = _models.get(path)
+    if entry is not None and entry["signature"] == signature:
+        return entry["model"]
+
+    with _lock:
+        path_lock = _path_locks.setdefault(path, threading.Lock())
+
+    # One loader per artifact; other sessions wait and reuse its result
+    with path_lock:
+        entry = _models.get(path)
+        signature = _file_signature(path)
+
+        if entry is not None and entry["signature"] == signature:
+            return entry["model"]
+
+        # Touched but identical content: keep the loaded model
+        if entry is not None and file_hash(_stat_target(path))[:12] == entry["version"]:
+            entry["signature"] = signature
+            return entry["model"]
+
+        new_entry = _load(path, signature)
+        if entry is not None:
+            new_entry["reloads"] = entry["reloads"] + 1
+
+        _models[path] = new_entry
+        return new_entry["model"]
+
+
+def model_version(path):
+    get_model(path)
+    return _models[os.path.abspath(path)]["version"]
+
+
+def artifact_version(path):
+
+    # Content hash of an artifact without loading it; rehashed only when the
+    # file's mtime/size change. Matches model_version() for the same file.
+    path = os.path.abspath(path)
+    signature = _file_signature(path)
+
+    cached = _versions.get(path)
+    if cached is None or cached[0] != signature:
+        cached = (signature, file_hash(_stat_target(path))[:12])
+        _versions[path] = cached
+
+    return cached[1]
+
+
+def model_info(path=None):
+
+    entries = list(_models.values())
+    if path is not None:
+        entries = [e for e in entries if e["path"] == os.path.abspath(path)]
+
+    return [
+        {key: value for key, value in entry.items() if key != "model"}
+        for entry in entries
+    ]
+
+
+def clear():
+    with _lock:
+        _models.clear()
@@ -0,0 +1,250 @@
+import hashlib
+import itertools
+import json
+import math
+import os
+import time
+import numpy as np
+import pandas as pd
+
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+from sklearn.model_selection import StratifiedKFold
+
+from utils.file_io import write_atomic, write_json
+from utils.flat_forest import flatten_forest
+from utils.inference import scoring_model
+
+# ==============================
+# MODEL SELECTION: PARALLEL SUCCESSIVE HALVING
+# ==============================
+# Every candidate is a (preprocessing params, forest params) pair. Round 0
+# cross-validates all of them with a few trees; each later round keeps the
+# best 1/eta by mean CV AUC and multiplies the trees by eta, up to
+# max_trees. Fits (candidate x fold) run in parallel across all cores.
+#
+# Preprocessing is fitted once per (preprocessing params, fold) and the
+# transformed fold matrices are reused by every forest candidate and
+# round. Scores are cached on disk by dataset fingerprint + candidate +
+# trees + fold, so rerunning with a wider grid only fits what is new.
+#
+# For each candidate's fold-0 fit the leaderboard also records what it
+# costs to serve: single-row latency and batch throughput with the serving
+# backend (utils/inference.py) and the size of the flat forest. The fold-0
+# models come back from the pool and are timed one at a time after the
+# round's fits finish, so the figures are not skewed by fits competing for
+# the same cores.
+
+MIN_TREES = 25
+MAX_TREES = 225
+ETA = 3
+CV_FOLDS = 5
+
+LATENCY_CALLS = 50
+BATCH_ROWS = 10_000
+
+# Part of every cache key; bump when cached results change meaning
+CACHE_FORMAT = 2
+
+
+def _key(params):
+    return json.dumps(params, sort_keys=True, default=str)
+
+
+def _fingerprint(X, y):
+    digest = hashlib.sha256()
+    digest.update(pd.util.hash_pandas_object(X, index=False).to_numpy().tobytes())
+    digest.update(np.asarray(y).tobytes())
+    digest.update(json.dumps(list(X.columns)).encode())
+    return digest.hexdigest()[:16]
+
+
+def expand_grid(grid):
+    # {"a": [1, 2], "b": [3]} -> [{"a": 1, "b": 3}, {"a": 2, "b": 3}]
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def _load_cache(cache_path):
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path) as f:
+            return json.load(f)
+    return {}
+
+
+def _save_cache(cache, cache_path):
+    if not cache_path:
+        return
+    write_json(cache, cache_path, indent=None)
+
+
+# ==============================
+# ONE (CANDIDATE, FOLD) FIT
+# ==============================
+def _serving_cost(model, X_val):
+
+    scorer = scoring_model(model)
+    row = X_val[:1]
+    scorer.predict_proba(row)
+
+    timings = []
+    for _ in range(LATENCY_CALLS):
+        start = time.perf_counter()
+        scorer.predict_proba(row)
+        timings.append(time.perf_counter() - start)
+
+    batch = X_val[:BATCH_ROWS]
+    start = time.perf_counter()
+    scorer.predict_proba(batch)
+    batch_seconds = time.perf_counter() - start
+
+    arrays, _ = flatten_forest(model)
+    return {
+        "latency_ms": float(np.median(timings)) * 1000,
+        "rows_per_s": len(batch) / batch_seconds,
+        "size_mb": sum(a.nbytes for a in arrays.values()) / 1e6
+    }
+
+
+def _fit_score(X_train, y_train, X_val, y_val, forest_params, n_estimators, keep_model):
+
+    # One tree-building thread per task; the tasks themselves run in parallel.
+    # Returns (result, the fitted model when keep_model for serving costs).
+    model = RandomForestClassifier(n_estimators=n_estimators, n_jobs=1, **forest_params)
+
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    result = {"fit_seconds": time.perf_counter() - start}
+
+    result["auc"] = roc_auc_score(y_val, model.predict_proba(X_val)[:, 1])
+    return result, model if keep_model else None
+
+
+# ==============================
+# SEARCH
+# ==============================
+def successive_halving(X, y, make_preprocessor, preprocessing_grid, forest_grid,
+                       min_trees=MIN_TREES, max_trees=MAX_TREES, eta=ETA, cv=CV_FOLDS,
+                       n_jobs=-1, cache_path=None, random_state=42, on_round=None):
+
+    y = np.asarray(y)
+    fingerprint = _fingerprint(X, y)
+    folds = list(StratifiedKFold(cv, shuffle=True, random_state=random_state).split(X, y))
+
+    base_params = {"random_state": random_state, "class_weight": "balanced"}
+    candidates = [
+        {"preprocessing": prep, "forest": {**base_params, **forest}}
+        for prep in expand_grid(preprocessing_grid)
+        for forest in expand_grid(forest_grid)
+    ]
+
+    cache = _load_cache(cache_path)
+    prepared = {}
+    stats = {"preprocessing_fits": 0, "model_fits": 0, "cached_fits": 0}
+
+    def fold_data(prep, fold):
+        key = (_key(prep), fold)
+        if key not in prepared:
+            train_idx, val_idx = folds[fold]
+            preprocessor = make_preprocessor(**prep)
+            X_train = preprocessor.fit_transform(X.iloc[train_idx])
+            X_val = preprocessor.transform(X.iloc[val_idx])
+            prepared[key] = (
+                np.ascontiguousarray(X_train, dtype="float32"), y[train_idx],
+                np.ascontiguousarray(X_val, dtype="float32"), y[val_idx]
+            )
+            stats["preprocessing_fits"] += 1
+        return prepared[key]
+
+    def cache_key(candidate, trees, fold):
+        return _key([fingerprint, candidate, trees, fold, cv, random_state, CACHE_FORMAT])
+
+    rows = []
+    survivors = candidates
+    n_rounds = max(1, math.ceil(math.log(max_trees / min_trees, eta) - 1e-9) + 1)
+
+    with Parallel(n_jobs=n_jobs) as parallel:
+        for round_ in range(n_rounds):
+            trees = max_trees if round_ == n_rounds - 1 else min_trees * eta ** round_
+
+            tasks, task_keys, task_candidates = [], [], []
+            for candidate in survivors:
+                for fold in range(cv):
+                    key = cache_key(candidate, trees, fold)
+                    if key in cache:
+                        stats["cached_fits"] += 1
+                        continue
+                    tasks.append(delayed(_fit_score)(
+                        *fold_data(candidate["preprocessing"], fold),
+                        candidate["forest"], trees, fold == 0
+                    ))
+                    task_keys.append(key)
+                    task_candidates.append(candidate)
+
+            # Fold-0 models are timed one at a time, with the pool idle
+            results = parallel(tasks)
+            for key, candidate, (result, model) in zip(task_keys, task_candidates, results):
+                if model is not None:
+                    X_val = fold_data(candidate["preprocessing"], 0)[2]
+                    result.update(_serving_cost(model, X_val))
+                cache[key] = result
+            stats["model_fits"] += len(tasks)
+            _save_cache(cache, cache_path)
+
+            scored = []
+            for candidate in survivors:
+                results = [cache[cache_key(candidate, trees, fold)] for fold in range(cv)]
+                aucs = [r["auc"] for r in results]
+                row = {
+                    "round": round_,
+                    "trees": trees,
+                    "cv_auc": float(np.mean(aucs)),
+                    "cv_auc_std": float(np.std(aucs)),
+                    "fit_seconds": float(np.mean([r["fit_seconds"] for r in results])),
+                    "latency_ms": results[0]["latency_ms"],
+                    "rows_per_s": results[0]["rows_per_s"],
+                    "size_mb": results[0]["size_mb"],
+                    "preprocessing": _key(candidate["preprocessing"]),
+                    "forest": _key({
+                        k: v for k, v in candidate["forest"].items() if k not in base_params
+                    }),
+                    "_candidate": candidate
+                }
+                scored.append(row)
+
+            scored.sort(key=lambda r: -r["cv_auc"])
+            rows.extend(scored)
+            if on_round:
+                on_round(round_, trees, len(survivors), scored[0])
+
+            survivors = [r["_candidate"] for r in scored[:max(1, math.ceil(len(scored) / eta))]]
+
+    leaderboard = pd.DataFrame(rows).drop(columns="_candidate")
+    leaderboard = leaderboard.sort_values(
+        ["round", "cv_auc"], ascending=[False, False], kind="stable"
+    ).reset_index(drop=True)
+    leaderboard["pareto"] = pareto_front(leaderboard)
+
+    return leaderboard, stats
+
+
+def pareto_front(leaderboard):
+
+    # True where no other fit is at least as accurate, as fast and as small,
+    # and strictly better on one of them
+    auc = leaderboard["cv_auc"].to_numpy()
+    latency = leaderboard["latency_ms"].to_numpy()
+    size = leaderboard["size_mb"].to_numpy()
+
+    front = np.ones(len(leaderboard), dtype=bool)
+    for i in range(len(leaderboard)):
+        no_worse = (auc >= auc[i]) & (latency <= latency[i]) & (size <= size[i])
+        better = (auc > auc[i]) | (latency < latency[i]) | (size < size[i])
+        front[i] = not (no_worse & better).any()
+    return front
+
+
+def save_leaderboard(leaderboard, path):
+    write_atomic(lambda p: leaderboard.to_csv(p, index=False), path)
+    return path
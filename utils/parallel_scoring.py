@@ -0,0 +1,107 @@
+import atexit
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
+
+from utils.inference import scoring_model
+from utils.model_registry import get_model
+
+# ==============================
+# MULTI-CORE BULK SCORING
+# ==============================
+# Inputs are cut into shards and scored in a pool of worker processes.
+# Workers get the model through the registry, so each loads an artifact
+# once and reuses it for every later shard (a .flat artifact is memory-
+# mapped and shared between them). Results come back in input order.
+# The process has one pool, sized to the largest worker count it may be
+# asked for; a call's n_workers caps how many of its tasks are in flight,
+# and worker processes are only started as that many are needed.
+
+SCORING_WORKERS = int(os.environ.get("CHURN_SCORING_WORKERS", os.cpu_count() or 1))
+POOL_WORKERS = max(SCORING_WORKERS, os.cpu_count() or 1)
+
+SHARD_ROWS = 50_000
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn: forking a threaded Streamlit/Flask server is unsafe
+            _pool = ProcessPoolExecutor(
+                max_workers=POOL_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+@atexit.register
+def shutdown_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=True, cancel_futures=True)
+            _pool = None
+
+
+def map_bounded(fn, n_workers, *iterables):
+
+    # Like Executor.map, but lazy and with at most n_workers tasks in flight
+    n_workers = max(1, min(n_workers, POOL_WORKERS))
+    pool = get_pool()
+    in_flight = deque()
+
+    for args in zip(*iterables):
+        in_flight.append(pool.submit(fn, *args))
+        if len(in_flight) >= n_workers:
+            yield in_flight.popleft().result()
+
+    while in_flight:
+        yield in_flight.popleft().result()
+
+
+def _score_shard(model_path, backend, X):
+    model = scoring_model(get_model(model_path), backend)
+    return model.predict_proba(X)[:, 1]
+
+
+def predict_proba_parallel(X, model_path, n_workers=None, shard_rows=SHARD_ROWS,
+                           backend=None):
+
+    n_workers = n_workers or SCORING_WORKERS
+    model_path = os.path.abspath(model_path)
+
+    if n_workers <= 1 or len(X) <= shard_rows:
+        return _score_shard(model_path, backend, X)
+
+    shards = [X.iloc[start:start + shard_rows] for start in range(0, len(X), shard_rows)]
+    results = map_bounded(
+        _score_shard, n_workers, repeat(model_path), repeat(backend), shards
+    )
+
+    return np.concatenate(list(results))
+
+
+def score_chunks_parallel(chunks, columns, model_path, n_workers=None, backend=None):
+
+    # Streams (chunk, probabilities) pairs in input order while keeping at
+    # most one chunk per worker in flight, so memory stays bounded
+    n_workers = n_workers or SCORING_WORKERS
+    model_path = os.path.abspath(model_path)
+    pending = deque()
+
+    def features():
+        for chunk in chunks:
+            pending.append(chunk)
+            yield chunk[columns]
+
+    scores = map_bounded(_score_shard, n_workers, repeat(model_path), repeat(backend), features())
+    for probabilities in scores:
+        yield pending.popleft(), probabilities
@@ -0,0 +1,288 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+import numpy as np
+
+from utils.flat_forest import split_pipeline
+from utils.inference import scoring_model
+from utils.metrics import count
+
+# ==============================
+# PREDICTION RESULT CACHE
+# ==============================
+# Repeated lookups for the same customer (CRM polling /predict, widgets
+# toggled back and forth on the individual page) skip the forest. The key
+# is a hash of the encoded feature vector (what the forest actually sees,
+# so {"a": 1, "b": 2} and {"b": 2, "a": 1} hit the same entry) plus the
+# model version; the value is the predict_proba row.
+#
+#   - in-process LRU bounded to max_entries, with an optional TTL
+#   - optional SQLite file shared by every worker process on the host
+#     (CHURN_PREDICTION_CACHE_DB); a hit there is copied into the LRU
+#   - a new model version clears the LRU and drops the old version's rows
+#     from the shared store (stale keys could never hit anyway)
+#
+# CHURN_PREDICTION_CACHE_SIZE=0 turns the cache off.
+
+CACHE_SIZE = int(os.environ.get("CHURN_PREDICTION_CACHE_SIZE", "10000"))
+CACHE_TTL_SECONDS = float(os.environ.get("CHURN_PREDICTION_CACHE_TTL", "0")) or None
+CACHE_DB_PATH = os.environ.get("CHURN_PREDICTION_CACHE_DB") or None
+
+# Shared store size, as a multiple of the in-process LRU
+DB_SIZE_FACTOR = 10
+# Trim the shared store every N inserts, not on every one
+DB_TRIM_EVERY = 500
+DB_TIMEOUT_SECONDS = 5
+
+
+def feature_key(row, version):
+    # Canonical: float64, C order, -0.0 folded into 0.0
+    row = np.ascontiguousarray(row, dtype=np.float64) + 0.0
+    digest = hashlib.blake2b(version.encode(), digest_size=16)
+    digest.update(row.tobytes())
+    return digest.hexdigest()
+
+
+class SQLiteStore:
+
+    # Shared second level: one row per key, oldest rows trimmed past max_rows
+    def __init__(self, path, max_rows):
+        self.path = path
+        self.max_rows = max_rows
+        self._local = threading.local()
+        self._inserts = 0
+        with self._connect() as db:
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS predictions ("
+                "key TEXT PRIMARY KEY, cache TEXT, version TEXT, value TEXT, created REAL)"
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS predictions_created ON predictions (created)")
+
+    def _connect(self):
+        # sqlite3 connections are per thread
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=DB_TIMEOUT_SECONDS)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            self._local.db = db
+        return db
+
+    def get_many(self, keys, min_created):
+        found = {}
+        for start in range(0, len(keys), 500):
+            part = keys[start:start + 500]
+            rows = self._connect().execute(
+                f"SELECT key, value, created FROM predictions WHERE created >= ? "
+                f"AND key IN ({','.join('?' * len(part))})",
+                [min_created, *part]
+            )
+            found.update((key, (json.loads(value), created)) for key, value, created in rows)
+        return found
+
+    def put_many(self, cache, version, items):
+        now = time.time()
+        with self._connect() as db:
+            db.executemany(
+                "INSERT OR REPLACE INTO predictions VALUES (?, ?, ?, ?, ?)",
+                [(key, cache, version, json.dumps(value), now) for key, value in items]
+            )
+            self._inserts += len(items)
+            if self._inserts >= DB_TRIM_EVERY:
+                self._inserts = 0
+                db.execute(
+                    "DELETE FROM predictions WHERE key IN (SELECT key FROM predictions "
+                    "ORDER BY created DESC LIMIT -1 OFFSET ?)", (self.max_rows,)
+                )
+
+    def drop_other_versions(self, cache, version):
+        with self._connect() as db:
+            db.execute("DELETE FROM predictions WHERE cache = ? AND version != ?", (cache, version))
+
+    def clear(self, cache):
+        with self._connect() as db:
+            db.execute("DELETE FROM predictions WHERE cache = ?", (cache,))
+
+
+class PredictionCache:
+
+    def __init__(self, name, max_entries=CACHE_SIZE, ttl_seconds=CACHE_TTL_SECONDS,
+                 db_path=CACHE_DB_PATH):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl_seconds
+        self.store = SQLiteStore(db_path, max_entries * DB_SIZE_FACTOR) if db_path else None
+
+        self._entries = OrderedDict()    # key -> (value, created)
+        self._lock = threading.Lock()
+        self._version = None
+        self._stats = {
+            "hits": 0, "shared_hits": 0, "misses": 0, "evictions": 0, "expired": 0,
+            "invalidations": 0, "store_errors": 0
+        }
+
+    def _record(self, stat, n=1):
+        if n:
+            self._stats[stat] += n
+            count("prediction_cache", n, cache=self.name, result=stat)
+
+    def _check_version(self, version):
+
+        # New model artifact: nothing cached for the old one can be served
+        if version == self._version:
+            return
+        with self._lock:
+            if version == self._version:
+                return
+            if self._version is not None:
+                self._entries.clear()
+                self._record("invalidations")
+                if self.store is not None:
+                    try:
+                        self.store.drop_other_versions(self.name, version)
+                    except sqlite3.Error:
+                        self._record("store_errors")
+            self._version = version
+
+    def get_many(self, keys):
+
+        now = time.time()
+        values = [None] * len(keys)
+        missing = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                entry = self._entries.get(key)
+                if entry is not None and self.ttl and now - entry[1] > self.ttl:
+                    del self._entries[key]
+                    self._record("expired")
+                    entry = None
+                if entry is None:
+                    missing.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                    values[i] = entry[0]
+            self._record("hits", len(keys) - len(missing))
+
+        if missing and self.store is not None:
+            try:
+                found = self.store.get_many(
+                    [keys[i] for i in missing], now - self.ttl if self.ttl else 0
+                )
+            except sqlite3.Error:
+                found = {}
+                with self._lock:
+                    self._record("store_errors")
+            if found:
+                # Copied with their original time, so the TTL still counts
+                # from when the prediction was made
+                self._remember([(key, value, created) for key, (value, created) in found.items()])
+                for i in missing:
+                    if keys[i] in found:
+                        values[i] = found[keys[i]][0]
+                missing = [i for i in missing if values[i] is None]
+                with self._lock:
+                    self._record("shared_hits", len(found))
+
+        with self._lock:
+            self._record("misses", len(missing))
+        return values
+
+    def _remember(self, items):
+        with self._lock:
+            for key, value, created in items:
+                self._entries[key] = (value, created)
+                self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._record("evictions", evicted)
+
+    def put_many(self, keys, values):
+        items = list(zip(keys, values))
+        now = time.time()
+        self._remember([(key, value, now) for key, value in items])
+        if self.store is not None:
+            try:
+                self.store.put_many(self.name, self._version, items)
+            except sqlite3.Error:
+                with self._lock:
+                    self._record("store_errors")
+
+    def predict(self, X, version, predict_fn):
+
+        # predict_fn(X) -> probability rows, run on the cache misses only
+        self._check_version(version)
+        X = np.asarray(X)
+        keys = [feature_key(row, version) for row in X]
+        values = self.get_many(keys)
+
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing:
+            computed = np.asarray(predict_fn(X[missing]), dtype=float).tolist()
+            self.put_many([keys[i] for i in missing], computed)
+            for i, value in zip(missing, computed):
+                values[i] = value
+
+        return np.array(values, dtype=float)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        if self.store is not None:
+            self.store.clear(self.name)
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["shared_hits"] + stats["misses"]
+        return {
+            "cache": self.name,
+            "version": self._version,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl,
+            "shared_store": self.store.path if self.store is not None else None,
+            "hit_rate": (stats["hits"] + stats["shared_hits"]) / lookups if lookups else 0.0,
+            **stats
+        }
+
+
+# ==============================
+# PROCESS-WIDE CACHES
+# ==============================
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(name):
+    # One cache per name per process (None when disabled)
+    if CACHE_SIZE <= 0:
+        return None
+    with _caches_lock:
+        if name not in _caches:
+            _caches[name] = PredictionCache(name)
+        return _caches[name]
+
+
+def predict_proba_cached(model, X, version, cache):
+
+    # predict_proba for a fitted model or pipeline; with a pipeline the key
+    # is the preprocessed row, so only the forest is skipped on a hit
+    preprocessing, forest = split_pipeline(model)
+    if preprocessing is None:
+        scorer = scoring_model(model)
+        encoded = X
+    else:
+        scorer = scoring_model(forest)
+        encoded = preprocessing.transform(X)
+        if hasattr(encoded, "toarray"):
+            encoded = encoded.toarray()
+
+    if cache is None:
+        return scorer.predict_proba(encoded)
+    return cache.predict(encoded, version, scorer.predict_proba)
@@ -0,0 +1,35 @@
+import numpy as np
+import pandas as pd
+
+# ==============================
+# RISK THRESHOLDS (single source of truth)
+# ==============================
+# A churn probability above MEDIUM_RISK_THRESHOLD is "Medium", above
+# HIGH_RISK_THRESHOLD is "High". Pages showing percentages use the same
+# values scaled by 100.
+MEDIUM_RISK_THRESHOLD = 0.4
+HIGH_RISK_THRESHOLD = 0.7
+
+RISK_LEVELS = ["Low", "Medium", "High"]
+
+
+# ==============================
+# VECTORIZED RISK BANDING
+# ==============================
+def risk_level(probabilities, medium=MEDIUM_RISK_THRESHOLD,
+               high=HIGH_RISK_THRESHOLD):
+
+    probs = np.asarray(probabilities, dtype="float64")
+
+    # side="left" keeps the boundaries exclusive like the old per-row lambda:
+    # p <= medium -> Low, medium < p <= high -> Medium, p > high -> High
+    codes = np.searchsorted([medium, high], probs, side="left").astype("int8")
+    codes[np.isnan(probs)] = -1
+
+    index = probabilities.index if isinstance(probabilities, pd.Series) else None
+
+    return pd.Series(
+        pd.Categorical.from_codes(codes, categories=RISK_LEVELS),
+        index=index,
+        name="Risk Level"
+    )
@@ -0,0 +1,188 @@
+import numpy as np
+import pandas as pd
+
+from utils.flat_forest import FlatForest, split_pipeline
+
+# ==============================
+# SaaS FEATURE SCHEMA
+# ==============================
+# One declaration of the scoring features: compact dtype and, where the
+# feature sets one, an allowed range. validate() checks and casts a frame
+# (or one chunk of a streamed upload) in a single vectorized pass per
+# column and returns the clean rows plus a report of the rejected ones.
+#
+# Numeric limits not set here are those of the compact dtype. plan_type
+# has no fixed vocabulary: training takes its values from the data, and
+# scoring checks them against the categories the fitted model's
+# OneHotEncoder learnt (model_categories).
+
+FEATURE_SCHEMA = {
+    "tenure_months": {"dtype": "int16", "min": 0},
+    "monthly_fee": {"dtype": "float32", "min": 0},
+    "avg_weekly_usage_hours": {"dtype": "float32", "min": 0, "max": 168},
+    "support_tickets": {"dtype": "int16", "min": 0},
+    "payment_failures": {"dtype": "int16", "min": 0},
+    "last_login_days_ago": {"dtype": "int16", "min": 0},
+    "plan_type": {"dtype": "category"}
+}
+
+REQUIRED_COLUMNS = list(FEATURE_SCHEMA)
+
+NUMERIC_FEATURES = [
+    column for column, spec in FEATURE_SCHEMA.items() if spec["dtype"] != "category"
+]
+CATEGORICAL_FEATURES = [
+    column for column, spec in FEATURE_SCHEMA.items() if spec["dtype"] == "category"
+]
+
+BAD_ROW_COLUMNS = ["row", "column", "value", "problem"]
+
+# Detail rows kept per upload; the count of rejected rows is always exact
+MAX_BAD_ROW_DETAILS = 10_000
+
+
+def missing_columns(columns):
+    return [column for column in REQUIRED_COLUMNS if column not in set(columns)]
+
+
+def model_categories(model):
+
+    # {column: categories} known to a fitted pipeline's (or flat forest's)
+    # OneHotEncoder; None when the model has no encoder step
+    preprocessing = (
+        model.preprocessing if isinstance(model, FlatForest) else split_pipeline(model)[0]
+    )
+    if preprocessing is None:
+        return None
+    if hasattr(preprocessing, "steps"):
+        preprocessing = preprocessing.steps[-1][1]
+
+    encoder = getattr(preprocessing, "named_transformers_", {}).get("cat")
+    if encoder is None or not hasattr(encoder, "categories_"):
+        return None
+    return {
+        column: values.tolist()
+        for column, values in zip(encoder.feature_names_in_, encoder.categories_)
+    }
+
+
+def _bounds(spec):
+    info = np.iinfo(spec["dtype"]) if spec["dtype"].startswith("int") else np.finfo(spec["dtype"])
+    return spec.get("min", info.min), spec.get("max", info.max)
+
+
+def _problems(series, spec, categories=None):
+
+    # (cast values, {problem: mask}) for one column
+    present = series.notna().to_numpy()
+
+    if spec["dtype"] == "category":
+        if categories is None:
+            return pd.Categorical(series), {"missing": ~present}
+        codes = pd.Index(categories).get_indexer(series)
+        values = pd.Categorical.from_codes(codes, categories=categories)
+        unknown = (codes == -1) & present
+        return values, {"missing": ~present, "unknown category": unknown}
+
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64")
+    numeric = ~np.isnan(values)
+    low, high = _bounds(spec)
+
+    problems = {
+        "missing": ~present,
+        "not a number": present & ~numeric,
+        "out of range": numeric & ((values < low) | (values > high))
+    }
+    if spec["dtype"] == "int16":
+        problems["not a whole number"] = numeric & (values != np.round(values))
+
+    return values, problems
+
+
+def validate(df, start_row=0, compact_floats=False, categories=None):
+
+    # Returns (clean, bad_rows). categories ({column: values}, usually
+    # model_categories(model)) rejects category values the model never saw;
+    # without it any value passes. clean keeps every column of df for rows
+    # that pass, with schema columns cast to their compact dtypes (df is
+    # cast in place when every row passes, so nothing is copied). Floats
+    # stay float64 unless compact_floats: a float32 value such as 18.2 is
+    # off by one ulp, enough to move some rows across a split threshold,
+    # so frames are scored first and compacted afterwards.
+    bad = np.zeros(len(df), dtype=bool)
+    cast = {}
+    reports = []
+
+    for column in REQUIRED_COLUMNS:
+        spec = FEATURE_SCHEMA[column]
+        values, problems = _problems(df[column], spec, (categories or {}).get(column))
+        cast[column] = values
+
+        for problem, mask in problems.items():
+            if mask.any():
+                bad |= mask
+                rows = np.flatnonzero(mask)
+                reports.append(pd.DataFrame({
+                    "row": rows + start_row,
+                    "column": column,
+                    "value": df[column].iloc[rows].astype(str).to_numpy(),
+                    "problem": problem
+                }))
+
+    good = ~bad
+    if bad.any():
+        # take() rather than df[good]: a real copy, not a view pandas warns
+        # on. A RangeIndex instead of the surviving labels saves 8 bytes/row;
+        # source positions are kept in bad_rows.
+        clean = df.take(np.flatnonzero(good))
+        clean.index = pd.RangeIndex(len(clean))
+    else:
+        clean = df
+
+    for column in REQUIRED_COLUMNS:
+        dtype = FEATURE_SCHEMA[column]["dtype"]
+        values = cast[column][good] if bad.any() else cast[column]
+        if dtype == "float32" and not compact_floats:
+            dtype = "float64"
+        clean[column] = pd.Series(values, index=clean.index).astype(dtype)
+
+    bad_rows = (
+        pd.concat(reports, ignore_index=True).sort_values("row", kind="stable")
+        if reports else pd.DataFrame(columns=BAD_ROW_COLUMNS)
+    )
+
+    return clean, bad_rows
+
+
+def compact(df):
+
+    # Float features to float32 once scores are computed
+    for column in NUMERIC_FEATURES:
+        if FEATURE_SCHEMA[column]["dtype"] == "float32" and column in df.columns:
+            df[column] = df[column].astype("float32")
+    return df
+
+
+class BadRowCollector:
+
+    # Accumulates validate() reports across the chunks of one upload
+
+    def __init__(self, max_details=MAX_BAD_ROW_DETAILS):
+        self.max_details = max_details
+        self.rejected = 0
+        self._details = []
+        self._kept = 0
+
+    def add(self, bad_rows):
+        if bad_rows.empty:
+            return
+        self.rejected += bad_rows["row"].nunique()
+        if self._kept < self.max_details:
+            detail = bad_rows.head(self.max_details - self._kept)
+            self._details.append(detail)
+            self._kept += len(detail)
+
+    def report(self):
+        if not self._details:
+            return pd.DataFrame(columns=BAD_ROW_COLUMNS)
+        return pd.concat(self._details, ignore_index=True)
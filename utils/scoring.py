@@ -0,0 +1,115 @@
+import time
+
+from utils.columnar import ChunkWriter, iter_frames
+from utils.metrics import count, timed_iter, timer
+from utils.parallel_scoring import score_chunks_parallel
+from utils.risk import risk_level
+from utils.schema import REQUIRED_COLUMNS, BadRowCollector, validate
+
+# Rows parsed, scored and written per step. Peak memory is bounded by one
+# chunk, not by the size of the upload.
+CHUNK_SIZE = 100_000
+
+
+def _bytes_read_fraction(source, total_bytes):
+    try:
+        return min(source.tell() / total_bytes, 1.0)
+    except (AttributeError, OSError, TypeError, ZeroDivisionError):
+        return None
+
+
+def _validated(chunks, bad_rows, categories=None):
+
+    # Schema-checked chunks; rejected rows go to the collector, numbered by
+    # their position in the upload
+    offset = 0
+    for chunk in timed_iter(chunks, "score.read"):
+        with timer("score.validate"):
+            clean, bad = validate(chunk, start_row=offset, categories=categories)
+        offset += len(chunk)
+        bad_rows.add(bad)
+        if len(clean):
+            yield clean
+
+
+# ==============================
+# STREAMING BULK SCORER
+# ==============================
+def _predicted(chunks, model):
+    for chunk in chunks:
+        with timer("score.predict"):
+            probabilities = model.predict_proba(chunk[REQUIRED_COLUMNS])[:, 1]
+        yield chunk, probabilities
+
+
+def score_file_in_chunks(source, model, output_path, usecols=None,
+                         chunksize=CHUNK_SIZE, total_bytes=None,
+                         on_progress=None, model_path=None, n_workers=1,
+                         explain_fn=None, input_format="csv", output_format="csv",
+                         total_rows=None, categories=None):
+
+    usecols = usecols or REQUIRED_COLUMNS
+
+    rows_scored = 0
+    preview = None
+    bad_rows = BadRowCollector()
+    start = time.perf_counter()
+
+    # CSV is parsed in chunks; Parquet / Feather are read in record batches
+    # of only the requested columns
+    # Category values are checked against those the model was trained on
+    # (utils.schema.model_categories) when given
+    reader = _validated(
+        iter_frames(source, input_format, usecols, chunksize), bad_rows, categories
+    )
+
+    # With several workers, chunks are scored in a process pool that loads
+    # the artifact at model_path; otherwise in-process with `model`
+    if n_workers > 1 and model_path:
+        scored = score_chunks_parallel(reader, REQUIRED_COLUMNS, model_path, n_workers)
+    else:
+        scored = _predicted(reader, model)
+
+    with ChunkWriter(output_path, output_format) as out:
+        for chunk, probabilities in scored:
+
+            chunk["Churn Probability"] = probabilities
+
+            chunk["Risk Level"] = risk_level(chunk["Churn Probability"])
+
+            # Optional per-customer explanation columns (e.g. top-k drivers)
+            if explain_fn is not None:
+                with timer("score.explain"):
+                    chunk = chunk.join(explain_fn(chunk[REQUIRED_COLUMNS]))
+
+            with timer("score.write"):
+                out.write(chunk)
+
+            if preview is None:
+                preview = chunk.head()
+
+            rows_scored += len(chunk)
+
+            if on_progress:
+                elapsed = time.perf_counter() - start
+                if total_rows:
+                    fraction = min((rows_scored + bad_rows.rejected) / total_rows, 1.0)
+                elif total_bytes:
+                    fraction = _bytes_read_fraction(source, total_bytes)
+                else:
+                    fraction = None
+                on_progress(rows_scored, elapsed, fraction)
+
+    count("rows_scored", rows_scored, source="bulk")
+    count("rows_rejected", bad_rows.rejected, source="bulk")
+    if total_bytes:
+        count("bytes_ingested", total_bytes, source="bulk")
+
+    return {
+        "rows": rows_scored,
+        "seconds": time.perf_counter() - start,
+        "preview": preview,
+        "output_path": output_path,
+        "rows_rejected": bad_rows.rejected,
+        "bad_rows": bad_rows.report()
+    }
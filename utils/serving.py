@@ -0,0 +1,107 @@
+import os
+
+from utils.encoding import CompiledEncoder
+from utils.flat_forest import flat_path
+from utils.metrics import count, timer
+from utils.model_registry import get_model, model_version
+from utils.prediction_cache import get_cache, predict_proba_cached
+
+# ==============================
+# PREDICTION API CORE
+# ==============================
+# Artifacts, encoding, caching and scoring shared by the Flask app
+# (app.py) and the ASGI app (asgi_app.py), so both serve the same
+# /predict and /predict_batch answers. Paths are relative to the repo root.
+
+MODEL_PATH = "data/churn_model.pkl"
+SCALER_PATH = "data/scaler.pkl"
+COLUMNS_PATH = "data/model_columns.pkl"
+
+MAX_BATCH_RECORDS = 50_000
+
+# Prefer the memory-mapped flat forest when training wrote one: it opens in
+# milliseconds and is shared by every worker process on the host
+if os.path.isdir(flat_path(MODEL_PATH)):
+    MODEL_PATH = flat_path(MODEL_PATH)
+
+# Repeated feature vectors skip the forest (None when disabled)
+prediction_cache = get_cache("api")
+
+_encoder = {}
+
+
+def load_artifacts():
+    # Cached per process, reloaded by the registry when the files change
+    for artifact_path in (MODEL_PATH, SCALER_PATH, COLUMNS_PATH):
+        get_model(artifact_path)
+    get_encoder()
+
+
+def get_encoder():
+    # Compiled once per (model_columns, scaler) pair; rebuilt only when the
+    # registry hands back a reloaded artifact
+    model_columns = get_model(COLUMNS_PATH)
+    scaler = get_model(SCALER_PATH)
+    artifacts = _encoder.get("artifacts", (None, None))
+    if artifacts[0] is not model_columns or artifacts[1] is not scaler:
+        _encoder["encoder"] = CompiledEncoder(model_columns, scaler)
+        _encoder["artifacts"] = (model_columns, scaler)
+    return _encoder["encoder"]
+
+
+def artifacts_version():
+    # Cached predictions are only valid for this exact model, scaler and columns
+    return "-".join(model_version(path) for path in (MODEL_PATH, SCALER_PATH, COLUMNS_PATH))
+
+
+def predict_encoded(X_scaled):
+
+    # Single forest pass over the rows not already cached; the label is
+    # the most probable class
+    model = get_model(MODEL_PATH)
+    with timer("api.forest"):
+        probabilities = predict_proba_cached(
+            model, X_scaled, artifacts_version(), prediction_cache
+        )
+    return model.classes_[probabilities.argmax(axis=1)], probabilities
+
+
+def predict_record(record):
+
+    # Dummy-encoded and scaled straight into a preallocated row (same
+    # result as get_dummies + missing columns + scaler.transform)
+    with timer("api.encode"):
+        input_scaled = get_encoder().encode_one(record)
+
+    # One forest pass for both label and probability, or a cache hit
+    labels, probabilities = predict_encoded(input_scaled)
+    count("rows_scored", source="api")
+    return labels[0], probabilities[0, 1]
+
+
+def score_records(records):
+
+    encoder = get_encoder()
+
+    # Encoded and scaled in one pass into a single matrix
+    with timer("api.encode"):
+        X_scaled = encoder.encode(records)
+
+    labels, probabilities = predict_encoded(X_scaled)
+
+    count("rows_scored", len(records), source="api")
+    return labels, probabilities[:, 1]
+
+
+def prediction_response(label, probability):
+    return {"churn_prediction": int(label), "churn_probability": float(probability)}
+
+
+def batch_error(records):
+
+    # (message, status) when a /predict_batch payload is not acceptable
+    if not isinstance(records, list) or not all(isinstance(r, dict) for r in records):
+        return "Expected a list of customer records", 400
+    if len(records) > MAX_BATCH_RECORDS:
+        return f"Batch larger than {MAX_BATCH_RECORDS} records", 413
+    return None
@@ -0,0 +1,86 @@
+import os
+import pandas as pd
+
+from utils.file_io import file_hash, read_json, write_atomic, write_json
+
+# ==============================
+# TELCO DATASET LOADER (src/ scripts)
+# ==============================
+# The workbook is parsed with openpyxl once, cleaned the way every script
+# did by hand (numeric Total Charges, 0/1 Churn), and cached as Parquet
+# next to it. Later loads read the Parquet file in milliseconds. The cache
+# is rebuilt when the workbook's size / mtime change and its content hash
+# no longer matches (a touch alone only refreshes the stored signature).
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
+
+TELCO_XLSX = os.path.join(DATA_DIR, "Telco_customer_churn.xlsx")
+
+# Bump when clean_telco changes so old caches are rebuilt
+CACHE_FORMAT = 1
+
+
+def cache_paths(source):
+    base = os.path.splitext(source)[0]
+    return f"{base}.cache.parquet", f"{base}.cache.json"
+
+
+def _signature(path):
+    stat = os.stat(path)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def clean_telco(df):
+
+    df["Total Charges"] = pd.to_numeric(df["Total Charges"], errors="coerce")
+    df["Churn"] = df["Churn Label"].map({"Yes": 1, "No": 0})
+    return df
+
+
+def _cache_is_fresh(source, parquet_path, meta_path):
+
+    meta = read_json(meta_path)
+    if meta is None or meta.get("format") != CACHE_FORMAT or not os.path.exists(parquet_path):
+        return False
+
+    signature = _signature(source)
+    if signature == meta["signature"]:
+        return True
+
+    # Touched or copied, but same bytes: keep the cache, store the new signature
+    if file_hash(source) == meta["sha256"]:
+        meta["signature"] = signature
+        write_json(meta, meta_path)
+        return True
+
+    return False
+
+
+def build_cache(source=TELCO_XLSX):
+
+    parquet_path, meta_path = cache_paths(source)
+    signature = _signature(source)
+
+    df = clean_telco(pd.read_excel(source))
+    write_atomic(lambda p: df.to_parquet(p, index=False), parquet_path)
+
+    meta = {"format": CACHE_FORMAT, "signature": signature, "sha256": file_hash(source)}
+    write_json(meta, meta_path)
+
+    return df
+
+
+def load_telco(source=TELCO_XLSX):
+
+    parquet_path, meta_path = cache_paths(source)
+
+    if not os.path.exists(source):
+        # Workbook not shipped (it is excluded from the repo): use the cache
+        if os.path.exists(parquet_path):
+            return pd.read_parquet(parquet_path)
+        raise FileNotFoundError(f"Dataset not found: {source}")
+
+    if _cache_is_fresh(source, parquet_path, meta_path):
+        return pd.read_parquet(parquet_path)
+
+    return build_cache(source)
@@ -0,0 +1,285 @@
+import math
+import time
+import numpy as np
+import pandas as pd
+
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import StandardScaler, OneHotEncoder
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.metrics import roc_auc_score
+
+from utils.columnar import iter_frames
+from utils.file_io import rewind
+from utils.schema import (
+    BAD_ROW_COLUMNS, CATEGORICAL_FEATURES, NUMERIC_FEATURES, REQUIRED_COLUMNS,
+    BadRowCollector, validate
+)
+
+# ==============================
+# SaaS CHURN MODEL TRAINING
+# ==============================
+# train_in_memory() is the original Bulk Scoring path: the whole upload as
+# one DataFrame, an 80/20 stratified split and a 300-tree forest.
+#
+# The 20% held out of training is split in two: "validation" for tuning
+# after the fit (the compression search) and "holdout" for the reported
+# AUC, so the reported score never comes from the rows a choice was made on.
+#
+# train_out_of_core() never holds more than one shard of the training rows.
+# Pass 1 streams the file once to fit the scaler (partial_fit), collect
+# the category values, count the classes and hold out every 5th row
+# (capped), alternately to validation and holdout. Pass 2 streams it
+# again and grows the forest with warm_start: each shard of rows gets its
+# share of the trees, each tree a bootstrap sample of its shard. The
+# result is the same Pipeline type, so flat-forest export, SHAP and the
+# model registry work unchanged.
+
+N_ESTIMATORS = 300
+CHUNK_SIZE = 100_000
+
+# Training rows per shard. Each shard is one fit() call; its trees never
+# see the other shards, so smaller shards mean less memory and weaker trees.
+SHARD_ROWS = 200_000
+
+# Every 5th clean row is held out (the in-memory path's test_size=0.2), up
+# to MAX_HOLDOUT_ROWS, half of them for validation
+HOLDOUT_EVERY = 5
+MAX_HOLDOUT_ROWS = 200_000
+
+CHURN_LABELS = {"Yes": 1, "No": 0}
+
+
+def build_pipeline(n_estimators=N_ESTIMATORS, categories="auto", **forest_params):
+
+    # categories: "auto" learns them from the rows the pipeline is fit on
+    preprocessor = ColumnTransformer(
+        transformers=[
+            ("num", StandardScaler(), NUMERIC_FEATURES),
+            ("cat", OneHotEncoder(categories=categories, handle_unknown="ignore"),
+             CATEGORICAL_FEATURES),
+        ]
+    )
+
+    params = {"random_state": 42, "class_weight": "balanced"}
+    params.update(forest_params)
+    model = RandomForestClassifier(n_estimators=n_estimators, **params)
+
+    return Pipeline(
+        steps=[
+            ("preprocessing", preprocessor),
+            ("model", model)
+        ]
+    )
+
+
+def _labelled(chunk, start_row=0):
+
+    # (features, labels, bad_rows): schema checks plus a Yes/No churn label
+    labels = chunk["churn"].map(CHURN_LABELS).to_numpy(dtype="float64")
+    clean, bad_rows = validate(chunk[REQUIRED_COLUMNS + ["churn"]], start_row=start_row)
+
+    keep = np.ones(len(chunk), dtype=bool)
+    keep[bad_rows["row"].to_numpy(dtype="int64") - start_row] = False
+    y = labels[keep]
+
+    unlabelled = np.flatnonzero(np.isnan(labels))
+    if len(unlabelled):
+        values = chunk["churn"].iloc[unlabelled]
+        label_rows = pd.DataFrame({
+            "row": unlabelled + start_row,
+            "column": "churn",
+            "value": values.astype(str).to_numpy(),
+            "problem": np.where(values.isna(), "missing", "unknown label")
+        })
+        bad_rows = pd.concat([bad_rows, label_rows], ignore_index=True)
+        bad_rows = bad_rows.sort_values("row", kind="stable")
+
+        labelled = ~np.isnan(y)
+        clean = clean.take(np.flatnonzero(labelled))
+        clean.index = pd.RangeIndex(len(clean))
+        y = y[labelled]
+
+    return clean[REQUIRED_COLUMNS], y.astype("int8"), bad_rows[BAD_ROW_COLUMNS]
+
+
+def _report(pipeline, X_test, y_test, validation, rows, start, bad_rows, rows_rejected,
+            shards=1):
+    probs = pipeline.predict_proba(X_test)[:, 1]
+    return {
+        "rows": rows,
+        "auc": roc_auc_score(y_test, probs),
+        "holdout_rows": len(y_test),
+        "trees": len(pipeline["model"].estimators_),
+        "shards": shards,
+        "seconds": time.perf_counter() - start,
+        "rows_rejected": rows_rejected,
+        "bad_rows": bad_rows,
+        "holdout": (X_test, y_test),
+        "validation": validation
+    }
+
+
+# ==============================
+# IN-MEMORY TRAINING
+# ==============================
+def train_in_memory(df, n_estimators=N_ESTIMATORS, **forest_params):
+
+    start = time.perf_counter()
+    X, y, bad_rows = _labelled(df)
+
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=0.2, random_state=42, stratify=y
+    )
+    X_val, X_test, y_val, y_test = train_test_split(
+        X_test, y_test, test_size=0.5, random_state=42, stratify=y_test
+    )
+
+    pipeline = build_pipeline(n_estimators, **forest_params)
+    pipeline.fit(X_train, y_train)
+
+    rows_rejected = bad_rows["row"].nunique()
+    return pipeline, _report(pipeline, X_test, y_test, (X_val, y_val), len(X), start,
+                             bad_rows, rows_rejected)
+
+
+# ==============================
+# OUT-OF-CORE TRAINING
+# ==============================
+def _labelled_chunks(source, fmt, chunksize, bad_rows):
+
+    # (features, labels, held-out mask, validation mask) per chunk; the
+    # masks depend only on the position among clean rows, so both passes
+    # split the same way
+    offset = 0
+    position = 0
+    for chunk in iter_frames(source, fmt, REQUIRED_COLUMNS + ["churn"], chunksize):
+        X, y, bad = _labelled(chunk, start_row=offset)
+        offset += len(chunk)
+        if bad_rows is not None:
+            bad_rows.add(bad)
+
+        positions = position + np.arange(len(X))
+        position += len(X)
+        held = (
+            (positions % HOLDOUT_EVERY == 0)
+            & (positions < HOLDOUT_EVERY * MAX_HOLDOUT_ROWS)
+        )
+        validation = held & ((positions // HOLDOUT_EVERY) % 2 == 1)
+        if len(X):
+            yield X, y, held, validation
+
+
+def train_out_of_core(source, fmt="csv", n_estimators=N_ESTIMATORS, chunksize=CHUNK_SIZE,
+                      shard_rows=SHARD_ROWS, on_progress=None, **forest_params):
+
+    start = time.perf_counter()
+
+    # ---- Pass 1: scaler statistics, categories, class counts, held-out rows ----
+    rewind(source)
+    bad_rows = BadRowCollector()
+    scaler = StandardScaler()
+    seen = {column: set() for column in CATEGORICAL_FEATURES}
+    class_counts = np.zeros(2, dtype="int64")
+    holdout_X, holdout_y = [], []
+    validation_X, validation_y = [], []
+    first_X = None
+
+    for X, y, held, validation in _labelled_chunks(source, fmt, chunksize, bad_rows):
+        holdout_X.append(X[held & ~validation])
+        holdout_y.append(y[held & ~validation])
+        validation_X.append(X[validation])
+        validation_y.append(y[validation])
+        for column in CATEGORICAL_FEATURES:
+            seen[column].update(X[column].unique())
+
+        X_train, y_train = X[~held], y[~held]
+        if not len(X_train):
+            continue
+        class_counts += np.bincount(y_train, minlength=2)
+        scaler.partial_fit(X_train[NUMERIC_FEATURES])
+        if first_X is None:
+            first_X = X_train
+
+    train_rows = int(class_counts.sum())
+    if class_counts.min() == 0:
+        raise ValueError("Training data needs both churned and retained customers")
+
+    # The encoder gets every category in the file, not only the first
+    # chunk's; the transformer is fit on that chunk and then handed the
+    # scaler partial_fit on all of them
+    pipeline = build_pipeline(
+        n_estimators, [sorted(seen[column]) for column in CATEGORICAL_FEATURES],
+        **forest_params
+    )
+    preprocessor, model = pipeline["preprocessing"], pipeline["model"]
+    preprocessor.fit(first_X)
+    preprocessor.transformers_ = [
+        (name, scaler if name == "num" else transformer, columns)
+        for name, transformer, columns in preprocessor.transformers_
+    ]
+    del first_X
+
+    # "balanced" per shard would weight each shard by its own class mix;
+    # use the weights of the whole file instead
+    if model.class_weight == "balanced":
+        model.set_params(class_weight={
+            label: float(train_rows / (2 * count)) for label, count in enumerate(class_counts)
+        })
+
+    # No more shards than trees. Shards close on a chunk boundary, so pass 2
+    # reads quarter-shard chunks to keep them close to shard_rows.
+    shard_rows = max(shard_rows, math.ceil(train_rows / n_estimators))
+    chunksize = min(chunksize, max(shard_rows // 4, 1))
+
+    # ---- Pass 2: grow the forest shard by shard ----
+    rewind(source)
+    model.set_params(warm_start=True, n_estimators=0)
+    pending_X, pending_y = [], []
+    pending_rows = 0
+    done_rows = 0
+    shards = 0
+
+    def fit_shard():
+        nonlocal pending_X, pending_y, pending_rows, done_rows, shards
+        done_rows += pending_rows
+        # Trees so far proportional to the rows seen; the last shard ends
+        # on exactly n_estimators
+        target = round(n_estimators * done_rows / train_rows)
+        if target > model.n_estimators:
+            X_shard = preprocessor.transform(pd.concat(pending_X, ignore_index=True))
+            model.set_params(n_estimators=target)
+            model.fit(X_shard, np.concatenate(pending_y))
+            shards += 1
+        pending_X, pending_y, pending_rows = [], [], 0
+        if on_progress:
+            on_progress(done_rows, time.perf_counter() - start, done_rows / train_rows)
+
+    for X, y, held, _ in _labelled_chunks(source, fmt, chunksize, None):
+        pending_X.append(X[~held])
+        pending_y.append(y[~held])
+        pending_rows += int((~held).sum())
+
+        # A shard closes once full and holding both classes; otherwise
+        # warm_start would refit the classes
+        if pending_rows >= shard_rows and len(np.unique(np.concatenate(pending_y))) == 2:
+            fit_shard()
+
+    if pending_rows:
+        if len(np.unique(np.concatenate(pending_y))) == 2:
+            fit_shard()
+        else:
+            # A single-class tail is too small to grow trees on; skip it
+            done_rows += pending_rows
+
+    model.set_params(warm_start=False, n_estimators=len(model.estimators_))
+
+    X_test = pd.concat(holdout_X, ignore_index=True)
+    y_test = np.concatenate(holdout_y)
+    validation = (pd.concat(validation_X, ignore_index=True), np.concatenate(validation_y))
+    report = _report(pipeline, X_test, y_test, validation,
+                     train_rows + len(y_test) + len(validation[1]), start,
+                     bad_rows.report(), bad_rows.rejected, shards)
+
+    return pipeline, report
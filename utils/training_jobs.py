@@ -0,0 +1,233 @@
+import glob
+import json
+import multiprocessing
+import os
+import shutil
+import threading
+import time
+import traceback
+import uuid
+import joblib
+
+from utils.columnar import read_frame
+from utils.compression import (
+    compress_model, compression_summary, holdout_summary, save_compressed
+)
+from utils.file_io import read_json, write_atomic, write_json
+from utils.flat_forest import flat_path, save_flat_forest
+from utils.schema import REQUIRED_COLUMNS
+from utils.training import train_in_memory, train_out_of_core
+
+# ==============================
+# BACKGROUND TRAINING JOBS
+# ==============================
+# Training runs in a separate (spawned) worker process, so no Streamlit
+# thread is tied up by a fit. A job belongs to the artifact it writes:
+# while one is running for MODEL_PATH, every other request for the same
+# path (this process or another server on the same disk) gets that job's
+# status instead of starting a second fit.
+#
+# Files next to the artifact:
+#   <model>.lock      held while a job runs; contains its job id and pid
+#   <model>.job.json  status, rewritten atomically by the worker
+#   <model>.upload-*  copy of the upload the worker reads, removed at the end
+# The pickle is written to a temporary file and renamed into place after
+# the flat forest, so a reader sees either no model or a complete one.
+# A compressed copy (utils/compression.py), tuned on the validation rows,
+# is written before either.
+
+ACTIVE_STATES = ["queued", "running"]
+
+_lock = threading.Lock()
+_workers = {}
+
+
+def job_paths(model_path):
+    return f"{model_path}.lock", f"{model_path}.job.json"
+
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ==============================
+# WORKER PROCESS
+# ==============================
+def _run_job(job_id, source_path, fmt, model_path, out_of_core):
+
+    lock_path, status_path = job_paths(model_path)
+    status = read_json(status_path)
+    status.update({"state": "running", "pid": os.getpid(), "phase": "training"})
+    write_json(status, status_path)
+
+    def on_progress(rows, elapsed, fraction):
+        status.update({"rows": rows, "seconds": elapsed, "fraction": fraction})
+        write_json(status, status_path)
+
+    try:
+        if out_of_core:
+            pipeline, report = train_out_of_core(source_path, fmt, on_progress=on_progress)
+        else:
+            df = read_frame(source_path, fmt, REQUIRED_COLUMNS + ["churn"])
+            pipeline, report = train_in_memory(df)
+            del df
+
+        status.update({"phase": "compressing", "fraction": 1.0})
+        write_json(status, status_path)
+
+        os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+        compressed, table = compress_model(pipeline, *report["validation"])
+        save_compressed(compressed, model_path)
+
+        status.update({"phase": "saving"})
+        write_json(status, status_path)
+
+        save_flat_forest(pipeline, flat_path(model_path))
+        write_atomic(lambda p: joblib.dump(pipeline, p), model_path)
+
+        status.update({
+            "state": "done",
+            "phase": "done",
+            "rows": report["rows"],
+            "rows_rejected": report["rows_rejected"],
+            "auc": report["auc"],
+            "seconds": report["seconds"],
+            "compressed": holdout_summary(
+                compression_summary(table), pipeline, compressed, *report["holdout"]
+            )
+        })
+    except Exception as error:
+        status.update({
+            "state": "failed",
+            "error": f"{type(error).__name__}: {error}",
+            "traceback": traceback.format_exc()
+        })
+    finally:
+        status["finished_at"] = time.time()
+        write_json(status, status_path)
+        if os.path.exists(source_path):
+            os.remove(source_path)
+        if (read_json(lock_path) or {}).get("job_id") == job_id:
+            os.remove(lock_path)
+
+
+# ==============================
+# JOB API
+# ==============================
+def _acquire(lock_path, job_id):
+
+    # Creates the lock file, or returns False when another job holds it
+    try:
+        fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        return False
+    with os.fdopen(fd, "w") as f:
+        json.dump({"job_id": job_id, "pid": os.getpid()}, f)
+    return True
+
+
+def _starting(job_id):
+    # Status of a job whose worker has not written its own yet
+    return {"job_id": job_id, "state": "queued", "phase": "starting"}
+
+
+def job_status(model_path):
+
+    # Latest status of the job for model_path (None if never trained here).
+    # A job whose worker died without finishing is reported as failed.
+    model_path = os.path.abspath(model_path)
+    lock_path, status_path = job_paths(model_path)
+    status = read_json(status_path)
+    if status is None or status["state"] not in ACTIVE_STATES:
+        return status
+
+    worker = _workers.get(model_path)
+    if worker is not None and worker[0] == status["job_id"]:
+        alive = worker[1].is_alive()
+    else:
+        alive = _pid_alive(status.get("pid") or (read_json(lock_path) or {}).get("pid", -1))
+
+    if not alive:
+        # The worker may have finished between the two reads
+        status = read_json(status_path)
+        if status["state"] in ACTIVE_STATES:
+            status.update({"state": "failed", "error": "Training worker exited unexpectedly"})
+    return status
+
+
+def start_training(source, fmt, model_path, out_of_core=False):
+
+    # Starts a training job for model_path, or returns the status of the one
+    # already running. source is a path or a file-like object; it is copied
+    # next to the artifact for the worker to read.
+    model_path = os.path.abspath(model_path)
+    lock_path, status_path = job_paths(model_path)
+    os.makedirs(os.path.dirname(model_path), exist_ok=True)
+
+    with _lock:
+        job_id = uuid.uuid4().hex[:12]
+
+        if not _acquire(lock_path, job_id):
+            lock = read_json(lock_path)
+            status = job_status(model_path)
+            if lock is not None:
+                if status is not None and status["job_id"] == lock["job_id"]:
+                    if status["state"] in ACTIVE_STATES:
+                        return status
+                elif _pid_alive(lock["pid"]):
+                    # Another process is still copying the upload
+                    return _starting(lock["job_id"])
+
+            # Stale lock: its job finished or its process is gone. A killed
+            # worker also leaves its copy of the upload behind.
+            for path in glob.glob(f"{glob.escape(model_path)}.upload-*"):
+                os.remove(path)
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            if not _acquire(lock_path, job_id):
+                # Another session took the lock first; its status file may
+                # not exist yet, and its lock may still be empty
+                lock = read_json(lock_path)
+                return _starting(lock["job_id"] if lock is not None else None)
+
+        source_path = f"{model_path}.upload-{job_id}.{fmt}"
+        if hasattr(source, "read"):
+            source.seek(0)
+            with open(source_path, "wb") as f:
+                shutil.copyfileobj(source, f)
+            source.seek(0)
+        else:
+            shutil.copyfile(source, source_path)
+
+        status = {
+            "job_id": job_id,
+            "state": "queued",
+            "phase": "starting",
+            "out_of_core": out_of_core,
+            "rows": 0,
+            "fraction": 0.0,
+            "seconds": 0.0,
+            "pid": None,
+            "started_at": time.time(),
+            "finished_at": None
+        }
+        write_json(status, status_path)
+
+        # spawn: a fresh interpreter, not a fork of the Streamlit server
+        worker = multiprocessing.get_context("spawn").Process(
+            target=_run_job,
+            args=(job_id, source_path, fmt, model_path, out_of_core),
+            daemon=False
+        )
+        worker.start()
+        _workers[model_path] = (job_id, worker)
+
+        return status